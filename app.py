@@ -4,7 +4,6 @@ app.py — Omega-Summarizer: Main Streamlit entry point.
 
 import os
 import sys
-import tempfile
 from datetime import datetime
 
 import streamlit as st
@@ -14,9 +13,15 @@ from dotenv import load_dotenv
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from omega_summarizer.css import CUSTOM_CSS
-from omega_summarizer.utils import load_history, save_history, add_log
+from omega_summarizer.utils import add_log
+from config import get_config
+from omega_summarizer.history import get_history_store
+from canonical import canonical_url_key, source_identity
 from omega_summarizer.agent import run_agent
-from omega_summarizer.ui import render_header, render_feature_cards, render_sidebar, render_execution_log, render_results
+from omega_summarizer.ui import render_header, render_feature_cards, render_sidebar, render_execution_log, render_results, make_stream_renderer
+from tools import stream_tokens, audio_size_limit_mb
+from audio import register_audio
+from tracing import start_trace, serve_metrics
 
 load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env"))
 
@@ -29,7 +34,11 @@ st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 if "execution_log" not in st.session_state: st.session_state.execution_log = []
 if "summary_result" not in st.session_state: st.session_state.summary_result = None
 if "processing" not in st.session_state: st.session_state.processing = False
-if "summary_history" not in st.session_state: st.session_state.summary_history = load_history()
+
+# Optional scrape target for the stage histograms (started once per process)
+telemetry = get_config().telemetry
+if telemetry.metrics_port:
+    serve_metrics(telemetry.metrics_host, telemetry.metrics_port)
 
 # ═════════════════════════════════════════════════════════
 #  UI RENDERING
@@ -52,13 +61,18 @@ with col2:
 st.markdown('<p class="input-divider">— or —</p>', unsafe_allow_html=True)
 acol1, acol2 = st.columns(2)
 with acol1:
-    uploaded_file = st.file_uploader("Upload MP3 / WAV", type=["mp3", "wav"], help="Max 25 MB")
+    uploaded_file = st.file_uploader("Upload MP3 / WAV", type=["mp3", "wav"], help=f"Max {audio_size_limit_mb()} MB — long recordings are transcribed in parallel segments")
 with acol2:
     recorded_audio = st.audio_input("Record Voice")
 
 # ═════════════════════════════════════════════════════════
 #  INPUT PROCESSING
 # ═════════════════════════════════════════════════════════
+def record_history(title: str, summary: str, source: str):
+    store = get_history_store()
+    if store is not None:
+        store.append(title, summary, source)
+
 def process_input():
     st.session_state.execution_log = []
     st.session_state.summary_result = None
@@ -68,21 +82,16 @@ def process_input():
         source_name = "Uploaded File" if uploaded_file else "Voice Recording"
         add_log("system", f"Audio detected: {source_name}", "working")
         
-        ext = ".wav" if recorded_audio else os.path.splitext(uploaded_file.name)[1]
-        with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
-            tmp.write(audio_source.getbuffer())
-            tmp_path = tmp.name
-        
-        user_msg = f"Please summarize this audio input from {source_name} located at: {tmp_path}"
-        result = run_agent(user_msg, orchestrator_model)
+        filename = uploaded_file.name if uploaded_file else "recording.wav"
+        # The upload's own buffer is registered in place — no temp file, no copy
+        with register_audio(audio_source.getbuffer(), filename) as handle:
+            user_msg = f"Please summarize this audio input from {source_name} located at: {handle.ref}"
+            result = run_agent(user_msg, orchestrator_model)
+            source_key = source_identity("audio_tool", {"file_path": handle.ref})
         
         if not (result.startswith("❌") or result.startswith("⚠️")):
             display_name = uploaded_file.name if uploaded_file else f"Recording_{datetime.now().strftime('%H%M')}"
-            st.session_state.summary_history.append({"title": f"🎤 {display_name}", "summary": result})
-            save_history(st.session_state.summary_history)
-        
-        try: os.unlink(tmp_path)
-        except OSError: pass
+            record_history(f"🎤 {display_name}", result, source_key or "")
 
         st.session_state.summary_result = result
         return
@@ -94,15 +103,20 @@ def process_input():
         
         if not (result.startswith("❌") or result.startswith("⚠️")):
             url_display = url_input.strip().split("//")[-1][:30]
-            st.session_state.summary_history.append({"title": f"🔗 {url_display}", "summary": result})
-            save_history(st.session_state.summary_history)
+            record_history(f"🔗 {url_display}", result, canonical_url_key(url_input) or "")
         return
 
     st.session_state.summary_result = "⚠️ Please enter a URL or provide audio to get started."
 
 if summarize_btn:
-    with st.spinner("Processing…"):
+    # Gemini tokens are rendered here as they arrive; the final result replaces them
+    stream_area = st.empty()
+    # One trace per click: its spans become the stage timings under the execution log
+    with st.spinner("Processing…"), stream_tokens(make_stream_renderer(stream_area)), start_trace() as trace:
         process_input()
+    stream_area.empty()
+    st.session_state.request_id = trace.request_id
+    st.session_state.stage_timings = trace.timings()
 
 render_execution_log()
 render_results()
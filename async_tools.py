@@ -0,0 +1,503 @@
+"""
+async_tools.py — Native asyncio counterparts of the agentic tools.
+Lets a single worker keep hundreds of I/O-bound summarizations in flight.
+
+Features:
+- Native async clients where the SDK has one (Gemini `generate_content_async`, `AsyncGroq`);
+  Gemini calls move to the executor when its base URL is overridden (REST transport)
+- A shared, bounded executor for blocking calls (Firecrawl, Trafilatura, YouTube transcripts)
+- `asyncio.sleep`-based exponential backoff that never blocks the event loop
+- Same caching, near-duplicate reuse, chunking, token streaming and error formatting as the synchronous tools
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from functools import partial
+
+
+import tools
+from clients import get_clients
+from config import get_config
+from constants import (
+    ASYNC_EXECUTOR_WORKERS,
+    WHISPER_MODEL,
+    WHISPER_RESPONSE_FORMAT,
+)
+from dedup import get_near_duplicate_index, dedup_scope
+from retry import async_retry_with_backoff, request_deadline
+from tracing import span, traced
+from audio import stitch_transcripts
+from prompts import YOUTUBE_ANALYSIS_PROMPT, build_summarize_prompt, build_chunk_prompt
+from utils import (
+    validate_audio_file,
+    is_error_response,
+    estimate_tokens,
+    split_into_chunks,
+)
+from canonical import extract_video_id
+from exceptions import (
+    APIKeyMissingError,
+    ContentExtractionError,
+    ScrapingError,
+    TranscriptError,
+    AudioProcessingError,
+    EmptyTranscriptionError,
+    SummarizationError,
+)
+
+
+# ═════════════════════════════════════════════════════════
+#  MANAGED EXECUTOR — For SDKs without async clients
+# ═════════════════════════════════════════════════════════
+_executor: ThreadPoolExecutor | None = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the shared executor used for blocking SDK calls."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=ASYNC_EXECUTOR_WORKERS, thread_name_prefix="omega-io"
+        )
+    return _executor
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking callable on the shared executor without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    call = partial(copy_context().run, func, *args, **kwargs)
+    return await loop.run_in_executor(get_executor(), call)
+
+
+# ═════════════════════════════════════════════════════════
+#  API CLIENT INITIALIZATION
+# ═════════════════════════════════════════════════════════
+async def lazy_attribute_async(name: str):
+    """
+    Return a lazily initialized tools attribute (e.g. "gemini_model"). The first
+    access configures an SDK, imports a module or discovers the Gemini model over
+    the network, so it runs on the executor; later accesses return the cached value.
+    """
+    if name in vars(tools):
+        return getattr(tools, name)
+    return await run_blocking(getattr, tools, name)
+
+
+def get_async_groq_client() -> "AsyncGroq | None":
+    """Return the shared AsyncGroq client for the running event loop, or None without a key."""
+    return get_clients().async_groq()
+
+
+async def gemini_generate_async(model, prompt: str, stream: bool = False):
+    """
+    Call Gemini without blocking the event loop. The SDK's REST transport
+    (used when OMEGA_GEMINI_BASE_URL is set) has no async client, so there
+    the blocking call runs on the shared executor instead.
+    """
+    if not get_config().endpoints.gemini_base_url:
+        return await model.generate_content_async(prompt, stream=stream)
+    response = await run_blocking(model.generate_content, prompt, stream=stream)
+    return iterate_blocking(response) if stream else response
+
+
+async def iterate_blocking(iterable):
+    """Async iterator over a blocking iterator, one executor hop per item."""
+    iterator, done = iter(iterable), object()
+    while (item := await run_blocking(next, iterator, done)) is not done:
+        yield item
+
+
+# ═════════════════════════════════════════════════════════
+#  HELPER — Async Gemini summarization with retry
+# ═════════════════════════════════════════════════════════
+@traced("map")
+async def condense_in_chunks_async(
+    text: str, source_type: str, chunk_size_tokens: int, max_workers: int, max_chunks: int | None = None
+) -> str:
+    """Async map step of chunked summarization (see tools.condense_in_chunks)."""
+    model = await lazy_attribute_async("gemini_model")
+    chunks = split_into_chunks(text, chunk_size_tokens)
+    if max_chunks is not None and len(chunks) > max_chunks:
+        tools.report_partial_input(f"dropping the last {len(chunks) - max_chunks} of {len(chunks)} chunks", max_chunks)
+        chunks = chunks[:max_chunks]
+    total = len(chunks)
+    semaphore = asyncio.Semaphore(max(1, max_workers))
+
+    @traced("gemini.chunk", log=False)
+    async def condense(index: int, chunk: str) -> str:
+        prompt = build_chunk_prompt(chunk, index + 1, total, source_type)
+        async with semaphore:
+            response = await async_retry_with_backoff(
+                lambda: gemini_generate_async(model, prompt),
+                max_retries=2,
+                base_delay=1.0,
+                provider="gemini",
+                quota=tools.gemini_quota(model, prompt),
+            )
+        return response.text.strip()
+
+    notes = await asyncio.gather(*(condense(i, c) for i, c in enumerate(chunks)))
+    return "\n\n".join(
+        f"### Part {index + 1} of {total}\n{note}" for index, note in enumerate(notes)
+    )
+
+
+@traced("gemini")
+async def generate_final_summary_async(model, prompt: str) -> str:
+    """Async counterpart of tools.generate_final_summary (streams to the active token sink)."""
+    sink = tools.current_token_sink()
+    if sink is None:
+        response = await async_retry_with_backoff(
+            lambda: gemini_generate_async(model, prompt),
+            max_retries=2,
+            base_delay=1.0,
+            provider="gemini",
+            quota=tools.gemini_quota(model, prompt),
+        )
+        return response.text
+
+    stream = await async_retry_with_backoff(
+        lambda: gemini_generate_async(model, prompt, stream=True),
+        max_retries=2,
+        base_delay=1.0,
+        provider="gemini",
+        quota=tools.gemini_quota(model, prompt),
+    )
+    parts = []
+    async for chunk in stream:
+        text = chunk.text
+        if text:
+            parts.append(text)
+            sink(text)
+    return "".join(parts)
+
+
+async def summarize_with_gemini_async(text: str, source_type: str = "content", extraction_method: str | None = None) -> str:
+    """Async counterpart of tools.summarize_with_gemini."""
+    model = await lazy_attribute_async("gemini_model")
+    if not model:
+        return APIKeyMissingError("GOOGLE_API_KEY").to_display()
+
+    index = get_near_duplicate_index()
+    signature = await run_blocking(index.signature, text) if index else None
+    scope = dedup_scope(source_type, model.model_name)
+    if signature is not None:
+        match = await run_blocking(index.lookup, signature, scope)
+        if match is not None:
+            return match.summary
+
+    text = await run_blocking(tools.compress_for_prompt, text)
+    processing = get_config().processing
+    if processing.chunking_enabled:
+        text = await run_blocking(tools.fit_chunked_input, text)
+        try:
+            while estimate_tokens(text) > processing.chunking_threshold_tokens:
+                condensed = await condense_in_chunks_async(
+                    text,
+                    source_type,
+                    processing.chunk_size_tokens,
+                    processing.max_chunk_workers,
+                    processing.max_chunks,
+                )
+                if len(condensed) >= len(text):
+                    break
+                text = condensed
+        except Exception as e:
+            return SummarizationError(str(e)).to_display()
+
+    prompt = build_summarize_prompt(
+        content=text,
+        source_type=source_type,
+        extraction_method=extraction_method,
+    )
+
+    try:
+        summary = await generate_final_summary_async(model, prompt)
+    except Exception as e:
+        return SummarizationError(str(e)).to_display()
+
+    if signature is not None and not is_error_response(summary):
+        await run_blocking(index.add, signature, scope, summary)
+    return summary
+
+
+# ═════════════════════════════════════════════════════════
+#  TOOL 1 — Async Article Scraper
+# ═════════════════════════════════════════════════════════
+@traced("firecrawl", log=False)
+async def fetch_with_firecrawl_async(url: str, max_retries: int = 2) -> str | None:
+    """Async counterpart of tools.fetch_with_firecrawl."""
+    firecrawl = await lazy_attribute_async("firecrawl")
+    markdown = await async_retry_with_backoff(
+        lambda: run_blocking(tools.scrape_markdown, firecrawl, url),
+        max_retries=max_retries,
+        base_delay=1.5,
+        provider="firecrawl",
+    )
+    return markdown or None
+
+
+@traced("trafilatura", log=False)
+async def fetch_with_trafilatura_async(url: str, max_retries: int = 2) -> str | None:
+    """Async counterpart of tools.fetch_with_trafilatura."""
+    trafilatura = await lazy_attribute_async("trafilatura")
+    downloaded = await async_retry_with_backoff(
+        lambda: run_blocking(trafilatura.fetch_url, url),
+        max_retries=max_retries,
+        base_delay=1.0,
+        provider="trafilatura",
+    )
+    if downloaded:
+        return await run_blocking(trafilatura.extract, downloaded)
+    return None
+
+
+@traced("extract")
+async def extract_article_sequential_async(url: str) -> tuple[str | None, str]:
+    """Async counterpart of tools.extract_article_sequential."""
+    content = None
+    if await lazy_attribute_async("firecrawl"):
+        try:
+            content = await fetch_with_firecrawl_async(url)
+        except Exception:
+            pass  # Fall through to Trafilatura
+    if content:
+        return content, "Firecrawl"
+
+    try:
+        return await fetch_with_trafilatura_async(url), "Trafilatura"
+    except Exception as e:
+        raise ScrapingError(url, f"Both Firecrawl and Trafilatura failed: {str(e)}")
+
+
+@traced("extract")
+async def extract_article_hedged_async(url: str, hedge_delay: float, min_chars: int) -> tuple[str | None, str]:
+    """
+    Async counterpart of tools.extract_article_hedged.
+    The losing extractor's task is cancelled, which also cancels its backoff
+    sleeps (each extractor keeps its usual retries until then).
+    """
+    queue = []
+    if await lazy_attribute_async("firecrawl"):
+        queue.append(("Firecrawl", fetch_with_firecrawl_async))
+    queue.append(("Trafilatura", fetch_with_trafilatura_async))
+
+    names = {}
+    pending = set()
+    best_content, best_method = None, queue[-1][0]
+    last_error = None
+
+    def launch():
+        name, fetch = queue.pop(0)
+        task = asyncio.ensure_future(fetch(url))
+        names[task] = name
+        pending.add(task)
+
+    try:
+        while pending or queue:
+            if queue and not pending:
+                launch()
+                continue
+
+            done, pending = await asyncio.wait(
+                pending, timeout=hedge_delay if queue else None, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                launch()  # Hedge delay elapsed without a result
+                continue
+
+            for task in done:
+                try:
+                    content = task.result()
+                except Exception as e:
+                    last_error = e
+                    continue
+                if content and len(content) >= min_chars:
+                    return content, names[task]
+                if content and len(content) > len(best_content or ""):
+                    best_content, best_method = content, names[task]
+    finally:
+        for loser in pending:
+            loser.cancel()
+
+    if best_content or last_error is None:
+        return best_content, best_method
+    raise ScrapingError(url, f"Both Firecrawl and Trafilatura failed: {str(last_error)}")
+
+
+async def scrape_article_async(url: str) -> str:
+    """Async counterpart of tools.scrape_article."""
+    processing = get_config().processing
+    try:
+        if processing.extraction_mode == "hedged":
+            content, method = await extract_article_hedged_async(
+                url, processing.hedge_delay_seconds, processing.min_content_chars
+            )
+        else:
+            content, method = await extract_article_sequential_async(url)
+    except ScrapingError as e:
+        return e.to_display()
+
+    content = await run_blocking(tools.clean_article, content) if content else content
+    if not content:
+        return ContentExtractionError(
+            url, "The page might be protected or have no readable text."
+        ).to_display()
+
+    if not processing.chunking_enabled:
+        content = await run_blocking(tools.fit_article_length, content)
+
+    return await summarize_with_gemini_async(
+        content,
+        source_type="web article",
+        extraction_method=method,
+    )
+
+
+# ═════════════════════════════════════════════════════════
+#  TOOL 2 — Async YouTube Transcript Extractor
+# ═════════════════════════════════════════════════════════
+async def get_youtube_transcript_async(url: str) -> str:
+    """Async counterpart of tools.get_youtube_transcript."""
+    video_id = extract_video_id(url)
+    if not video_id:
+        return "❌ Could not extract a valid video ID from the URL. Please provide a full YouTube link."
+
+    try:
+        from youtube_transcript_api import YouTubeTranscriptApi
+
+        with span("transcript"):
+            transcript_list = await async_retry_with_backoff(
+                lambda: run_blocking(YouTubeTranscriptApi.get_transcript, video_id),
+                max_retries=2,
+                base_delay=1.0,
+                provider="youtube",
+            )
+        full_text = await run_blocking(tools.join_captions, [entry["text"] for entry in transcript_list])
+
+        if full_text.strip():
+            return await summarize_with_gemini_async(full_text, source_type="YouTube video transcript")
+    except Exception:
+        pass  # Fall through to Gemini fallback
+
+    try:
+        model = await lazy_attribute_async("gemini_model")
+        if not model:
+            return APIKeyMissingError("GOOGLE_API_KEY").to_display()
+
+        prompt = YOUTUBE_ANALYSIS_PROMPT.format(url=url)
+        with span("gemini.video"):
+            response = await async_retry_with_backoff(
+                lambda: gemini_generate_async(model, prompt),
+                max_retries=2,
+                base_delay=1.5,
+                provider="gemini",
+                quota=tools.gemini_quota(model, prompt),
+            )
+        return await summarize_with_gemini_async(response.text, source_type="YouTube video (AI-analyzed)")
+    except Exception as e:
+        return TranscriptError(
+            video_id,
+            f"Could not retrieve transcript or analyze video: {str(e)}. "
+            "Check that the video is public and has captions enabled."
+        ).to_display()
+
+
+# ═════════════════════════════════════════════════════════
+#  TOOL 3 — Async Audio Transcriber (AsyncGroq Whisper)
+# ═════════════════════════════════════════════════════════
+@traced("whisper.segment", log=False)
+async def transcribe_segment_async(client, segment) -> str:
+    """Async counterpart of tools.transcribe_segment."""
+    transcription = await async_retry_with_backoff(
+        lambda: client.audio.transcriptions.create(
+            file=(segment.filename, segment.open()),
+            model=WHISPER_MODEL,
+            response_format=WHISPER_RESPONSE_FORMAT,
+        ),
+        max_retries=2,
+        base_delay=1.5,
+        provider="groq",
+        quota=(WHISPER_MODEL, 0),
+    )
+    return str(transcription)
+
+
+async def transcribe_audio_async(file_path: str) -> str:
+    """Async counterpart of tools.transcribe_audio."""
+    client = get_async_groq_client()
+    if not client:
+        return APIKeyMissingError("GROQ_API_KEY").to_display()
+
+    is_valid, error_msg = validate_audio_file(file_path, tools.audio_size_limit_mb())
+    if not is_valid:
+        return f"❌ {error_msg}"
+
+    try:
+        segments = await run_blocking(tools.load_audio_segments, file_path)
+        semaphore = asyncio.Semaphore(max(1, get_config().processing.max_transcription_workers))
+
+        async def transcribe(segment) -> str:
+            async with semaphore:
+                return await transcribe_segment_async(client, segment)
+
+        with span("whisper"):
+            transcripts = await asyncio.gather(*(transcribe(segment) for segment in segments))
+        transcript_text = stitch_transcripts(transcripts)
+        if not transcript_text.strip():
+            return EmptyTranscriptionError().to_display()
+
+        return await summarize_with_gemini_async(transcript_text, source_type="audio recording")
+    except Exception as e:
+        return AudioProcessingError(
+            reason=str(e),
+            suggestions=tools.AUDIO_ERROR_SUGGESTIONS,
+        ).to_display()
+
+
+# ═════════════════════════════════════════════════════════
+#  DISPATCHER — Maps tool names to coroutines
+# ═════════════════════════════════════════════════════════
+ASYNC_TOOL_DISPATCH = {
+    "article_tool": lambda args: scrape_article_async(args["url"]),
+    "youtube_tool": lambda args: get_youtube_transcript_async(args["url"]),
+    "audio_tool":   lambda args: transcribe_audio_async(args["file_path"]),
+}
+
+
+async def run_tool_async(tool_name: str, arguments: dict) -> str:
+    """Run a tool's coroutine inside the configured per-request deadline."""
+    with request_deadline(get_config().retry.request_deadline_seconds), span(tool_name) as current:
+        return current.check(await ASYNC_TOOL_DISPATCH[tool_name](arguments))
+
+
+async def execute_tool_async(tool_name: str, arguments: dict) -> str:
+    """Async counterpart of tools.execute_tool, sharing the same summary cache and in-flight calls."""
+    if tool_name not in ASYNC_TOOL_DISPATCH:
+        return f"❌ Unknown tool: {tool_name}"
+
+    # Source identity may hash an audio file, so resolve it off the event loop
+    entry = await run_blocking(tools.resolve_cache_entry, tool_name, arguments)
+    if entry is None:
+        return await run_tool_async(tool_name, arguments)
+
+    cache, key, source = entry
+    if cache is not None:
+        cached = await run_blocking(cache.get, key)
+        if cached is not None:
+            return cached
+
+    async def run_and_store() -> str:
+        result = await run_tool_async(tool_name, arguments)
+        if cache is not None and not is_error_response(result):
+            await run_blocking(cache.put, key, result, source)
+        return result
+
+    if not get_config().processing.coalescing_enabled:
+        return await run_and_store()
+    # Shares the synchronous registry, so threads and coroutines coalesce with each other
+    result, _ = await tools.get_single_flight().do_async(
+        key, run_and_store, on_join=tools.coalesced(tool_name, source)
+    )
+    return result
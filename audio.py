@@ -0,0 +1,509 @@
+"""
+audio.py — Audio segmentation for the Omega-Summarizer.
+Splits long recordings into overlapping segments that each fit in one
+Groq Whisper request, and stitches the segment transcripts back together.
+
+Features:
+- WAV split at sample-frame boundaries (stdlib `wave`), MP3 at MPEG frame boundaries
+- Cuts placed at the quietest point near each target boundary
+- Overlapping segments so words at a cut are never lost
+- Transcript stitching that drops the words repeated by the overlap
+- In-memory audio handles, so uploads reach Whisper without temp-file round trips
+"""
+
+import hashlib
+import io
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+import threading
+import uuid
+import wave
+from array import array
+from dataclasses import dataclass
+
+from constants import (
+    AUDIO_HANDLE_SCHEME,
+    AUDIO_SPOOL_THRESHOLD_MB,
+    AUDIO_SEGMENT_SECONDS,
+    AUDIO_SEGMENT_MAX_MB,
+    AUDIO_SEGMENT_OVERLAP_SECONDS,
+    AUDIO_SILENCE_SEARCH_SECONDS,
+)
+
+
+# ═════════════════════════════════════════════════════════
+#  BUFFER READER — File-like view over memory, without copying
+# ═════════════════════════════════════════════════════════
+class BufferReader(io.RawIOBase):
+    """Seekable read-only stream over one or more buffers read back to back."""
+
+    def __init__(self, *buffers):
+        self._parts = [part for part in (memoryview(b).cast("B") for b in buffers) if len(part)]
+        self._size = sum(len(part) for part in self._parts)
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: self._size}[whence]
+        self._position = max(0, base + offset)
+        return self._position
+
+    def readinto(self, target) -> int:
+        target = memoryview(target).cast("B")
+        written, skip = 0, self._position
+        for part in self._parts:
+            if skip >= len(part):
+                skip -= len(part)
+                continue
+            count = min(len(part) - skip, len(target) - written)
+            target[written:written + count] = part[skip:skip + count]
+            written += count
+            skip = 0
+            if written == len(target):
+                break
+        self._position += written
+        return written
+
+
+@dataclass
+class AudioSegment:
+    """One slice of a recording in the source format: `header` + a view into the source."""
+
+    index: int
+    start_seconds: float
+    end_seconds: float
+    data: bytes | memoryview
+    filename: str
+    header: bytes = b""
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.end_seconds - self.start_seconds
+
+    @property
+    def size(self) -> int:
+        return len(self.header) + len(self.data)
+
+    def open(self) -> BufferReader:
+        """Return a file-like reader for uploading the segment."""
+        return BufferReader(self.header, self.data)
+
+
+# ═════════════════════════════════════════════════════════
+#  CUT PLANNING — Shared by every format
+# ═════════════════════════════════════════════════════════
+def plan_cuts(total: int, span: int, overlap: int, search: int, quietest) -> list[tuple[int, int]]:
+    """
+    Split units [0, total) into (start, end) ranges of at most `span` units.
+    Each range ends at quietest(lo, hi), a unit in the last `search` units
+    before the span limit, and the next range starts `overlap` units earlier.
+    """
+    span = max(1, span)
+    overlap = min(overlap, span // 4)
+    search = min(search, span // 2)
+
+    ranges = []
+    start = 0
+    while total - start > span:
+        target = start + span
+        cut = quietest(target - search, target)
+        ranges.append((start, cut))
+        start = cut - overlap
+    ranges.append((start, total))
+    return ranges
+
+
+# ═════════════════════════════════════════════════════════
+#  WAV — Cut at sample-frame boundaries
+# ═════════════════════════════════════════════════════════
+SILENCE_WINDOW_SECONDS = 0.05
+
+
+def _pcm_samples(frames, sample_width: int) -> array | None:
+    """Decode little-endian PCM frames into signed samples (8/16-bit only)."""
+    if sample_width == 2:
+        samples = array("h")
+        samples.frombytes(frames)
+        if sys.byteorder == "big":
+            samples.byteswap()
+        return samples
+    if sample_width == 1:
+        return array("b", bytes(b ^ 0x80 for b in frames))  # Unsigned → signed
+    return None
+
+
+def wav_data_offset(data) -> int:
+    """Byte offset of the PCM samples (the `data` chunk payload) in a RIFF/WAVE file."""
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id = bytes(data[offset:offset + 4])
+        chunk_size = int.from_bytes(data[offset + 4:offset + 8], "little")
+        if chunk_id == b"data":
+            return offset + 8
+        offset += 8 + chunk_size + (chunk_size & 1)
+    raise wave.Error("WAV file has no data chunk")
+
+
+def wav_header(params, nframes: int) -> bytes:
+    """Canonical 44-byte PCM WAV header for `nframes` frames with the given params."""
+    frame_size = params.nchannels * params.sampwidth
+    data_size = nframes * frame_size
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, params.nchannels, params.framerate,
+        params.framerate * frame_size, frame_size, params.sampwidth * 8,
+        b"data", data_size,
+    )
+
+
+def quietest_wav_frame(pcm, params, lo: int, hi: int) -> int:
+    """Return the frame in [lo, hi] at the centre of the lowest-energy window."""
+    channels, width = params.nchannels, params.sampwidth
+    window = max(1, int(params.framerate * SILENCE_WINDOW_SECONDS))
+    frame_size = channels * width
+    samples = _pcm_samples(pcm[lo * frame_size:hi * frame_size], width)
+    if samples is None or len(samples) < window * channels:
+        return hi
+
+    best_frame, best_energy = hi, None
+    step = window * channels
+    for offset in range(0, len(samples) - step + 1, step):
+        energy = sum(map(abs, samples[offset:offset + step]))
+        if best_energy is None or energy <= best_energy:  # Ties favour the later cut
+            best_energy = energy
+            best_frame = lo + offset // channels + window // 2
+    return min(best_frame, hi)
+
+
+def split_wav(data, filename: str, segment_seconds: float, overlap_seconds: float,
+              max_bytes: int, silence_search_seconds: float = AUDIO_SILENCE_SEARCH_SECONDS) -> list[AudioSegment]:
+    """
+    Split a PCM WAV file into overlapping WAV segments.
+    Each segment is a fresh header plus a view into the source samples — no PCM is copied.
+    """
+    with wave.open(BufferReader(data), "rb") as reader:
+        params = reader.getparams()
+    rate, frame_size = params.framerate, params.nchannels * params.sampwidth
+    pcm = memoryview(data).cast("B")[wav_data_offset(data):]
+    nframes = min(params.nframes, len(pcm) // frame_size)
+
+    span = min(int(segment_seconds * rate), max(1, (max_bytes - 44) // frame_size))
+    ranges = plan_cuts(
+        nframes,
+        span,
+        int(overlap_seconds * rate),
+        int(silence_search_seconds * rate),
+        lambda lo, hi: quietest_wav_frame(pcm, params, lo, hi),
+    )
+    if len(ranges) == 1:
+        return [AudioSegment(0, 0.0, nframes / rate, data, filename)]
+
+    stem, ext = os.path.splitext(filename)
+    return [
+        AudioSegment(
+            index,
+            start / rate,
+            end / rate,
+            pcm[start * frame_size:end * frame_size],
+            f"{stem}.part{index:03d}{ext}",
+            header=wav_header(params, end - start),
+        )
+        for index, (start, end) in enumerate(ranges)
+    ]
+
+
+# ═════════════════════════════════════════════════════════
+#  MP3 — Cut at MPEG audio frame boundaries
+# ═════════════════════════════════════════════════════════
+_MP3_BITRATES = {  # kbps by (MPEG-1?, layer)
+    (True, 1):  [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (True, 2):  [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (True, 3):  [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (False, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (False, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (False, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_MP3_SAMPLE_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+
+
+@dataclass
+class Mp3Frame:
+    offset: int
+    length: int
+    samples: int
+    sample_rate: int
+
+
+def _id3v2_size(data: bytes) -> int:
+    """Length of a leading ID3v2 tag, or 0."""
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def parse_mp3_header(header: bytes) -> tuple[int, int, int] | None:
+    """Decode a 4-byte frame header into (frame_length, samples, sample_rate)."""
+    b0, b1, b2 = header[0], header[1], header[2]
+    if b0 != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+    version, layer_bits = (b1 >> 3) & 0x03, (b1 >> 1) & 0x03
+    bitrate_index, rate_index, padding = b2 >> 4, (b2 >> 2) & 0x03, (b2 >> 1) & 0x01
+    if version == 1 or layer_bits == 0 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    mpeg1 = version == 3
+    layer = 4 - layer_bits
+    bitrate = _MP3_BITRATES[(mpeg1, layer)][bitrate_index] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+    if layer == 1:
+        return (12 * bitrate // sample_rate + padding) * 4, 384, sample_rate
+    samples = 1152 if (layer == 2 or mpeg1) else 576
+    return samples // 8 * bitrate // sample_rate + padding, samples, sample_rate
+
+
+def parse_mp3_frames(data: bytes) -> list[Mp3Frame]:
+    """Walk the MPEG frames of an MP3 file, resynchronising over junk bytes."""
+    frames = []
+    position, end = _id3v2_size(data), len(data)
+    while position + 4 <= end:
+        parsed = parse_mp3_header(data[position:position + 4])
+        if parsed is None or parsed[0] < 4 or position + parsed[0] > end:
+            position += 1
+            continue
+        length, samples, sample_rate = parsed
+        frames.append(Mp3Frame(position, length, samples, sample_rate))
+        position += length
+    return frames
+
+
+def split_mp3(data: bytes, filename: str, segment_seconds: float, overlap_seconds: float,
+              max_bytes: int, silence_search_seconds: float = AUDIO_SILENCE_SEARCH_SECONDS) -> list[AudioSegment]:
+    """
+    Split an MP3 file into overlapping MP3 segments.
+    Without decoding, the smallest frame (lowest VBR bitrate) is the best proxy for silence.
+    """
+    frames = parse_mp3_frames(data)
+    if not frames:
+        return [AudioSegment(0, 0.0, 0.0, data, filename)]
+
+    frame_seconds = frames[0].samples / frames[0].sample_rate
+    largest = max(frame.length for frame in frames)
+    span = min(int(segment_seconds / frame_seconds), max(1, max_bytes // largest))
+
+    def quietest(lo: int, hi: int) -> int:
+        return min(range(hi, lo - 1, -1), key=lambda i: frames[i].length)
+
+    ranges = plan_cuts(
+        len(frames),
+        span,
+        int(overlap_seconds / frame_seconds),
+        int(silence_search_seconds / frame_seconds),
+        quietest,
+    )
+    if len(ranges) == 1:
+        return [AudioSegment(0, 0.0, len(frames) * frame_seconds, data, filename)]
+
+    stem, ext = os.path.splitext(filename)
+    segments = []
+    for index, (start, end) in enumerate(ranges):
+        first, last = frames[start], frames[end - 1]
+        segments.append(AudioSegment(
+            index,
+            start * frame_seconds,
+            end * frame_seconds,
+            data[first.offset:last.offset + last.length],
+            f"{stem}.part{index:03d}{ext}",
+        ))
+    return segments
+
+
+# ═════════════════════════════════════════════════════════
+#  ENTRY POINT
+# ═════════════════════════════════════════════════════════
+def split_audio(
+    data: bytes | memoryview,
+    filename: str,
+    segment_seconds: float = AUDIO_SEGMENT_SECONDS,
+    overlap_seconds: float = AUDIO_SEGMENT_OVERLAP_SECONDS,
+    max_bytes: int = AUDIO_SEGMENT_MAX_MB * 1024 * 1024,
+) -> list[AudioSegment]:
+    """
+    Split a recording into Whisper-sized segments in its own format.
+    Short recordings, and files that cannot be parsed, come back as one segment.
+    """
+    ext = os.path.splitext(filename)[1].lower()
+    try:
+        if ext == ".wav":
+            return split_wav(data, filename, segment_seconds, overlap_seconds, max_bytes)
+        if ext == ".mp3":
+            return split_mp3(data, filename, segment_seconds, overlap_seconds, max_bytes)
+    except (wave.Error, EOFError, struct.error):
+        pass  # Not a PCM WAV we can cut; let Whisper handle the whole file
+    return [AudioSegment(0, 0.0, 0.0, data, filename)]
+
+
+# ═════════════════════════════════════════════════════════
+#  TRANSCRIPT STITCHING
+# ═════════════════════════════════════════════════════════
+STITCH_WINDOW_WORDS = 40   # Words compared on each side of a cut
+STITCH_MIN_MATCH = 3       # Shorter repeats are treated as coincidence
+STITCH_SLACK_WORDS = 4     # Words cut in half at a boundary may not match
+
+
+def _normalize_word(word: str) -> str:
+    return re.sub(r"[^\w']", "", word.lower())
+
+
+def overlap_bounds(tail: list[str], head: list[str]) -> tuple[int, int]:
+    """
+    Find the longest run of words ending near the end of `tail` that also
+    appears near the start of `head`.
+    Returns (tail_words_to_drop, head_words_to_drop), or (0, 0) without a match.
+    """
+    tail = [_normalize_word(w) for w in tail]
+    head = [_normalize_word(w) for w in head]
+    for k in range(min(len(tail), len(head)), STITCH_MIN_MATCH - 1, -1):
+        for i in range(min(STITCH_SLACK_WORDS, len(tail) - k) + 1):
+            run = tail[len(tail) - i - k:len(tail) - i]
+            for j in range(min(STITCH_SLACK_WORDS, len(head) - k) + 1):
+                if head[j:j + k] == run:
+                    return i, j + k
+    return 0, 0
+
+
+def stitch_transcripts(transcripts: list[str]) -> str:
+    """Join segment transcripts in order, removing words repeated by the overlap."""
+    if len(transcripts) == 1:
+        return transcripts[0]
+    words: list[str] = []
+    for text in transcripts:
+        incoming = text.split()
+        if words and incoming:
+            drop_tail, drop_head = overlap_bounds(words[-STITCH_WINDOW_WORDS:], incoming[:STITCH_WINDOW_WORDS])
+            if drop_tail:
+                del words[-drop_tail:]
+            incoming = incoming[drop_head:]
+        words.extend(incoming)
+    return " ".join(words)
+
+
+# ═════════════════════════════════════════════════════════
+#  IN-MEMORY AUDIO HANDLES
+# ═════════════════════════════════════════════════════════
+class AudioHandle:
+    """
+    An audio payload registered under an ID and referenced as
+    `audio://<id>/<filename>` wherever a file path is expected.
+    Small payloads are held as a view of the caller's buffer (no copy);
+    payloads above the spool threshold are written once to a temp file and
+    memory-mapped, so the caller can drop its copy.
+    """
+
+    def __init__(self, data, filename: str, spool_threshold_bytes: int):
+        self.id = uuid.uuid4().hex
+        self.filename = re.sub(r"\s+", "_", os.path.basename(filename)) or "audio"
+        self.spool_path: str | None = None
+        self._mmap: mmap.mmap | None = None
+        self._sha256: str | None = None
+
+        view = memoryview(data).cast("B")
+        if len(view) > spool_threshold_bytes:
+            fd, self.spool_path = tempfile.mkstemp(prefix="omega-audio-", suffix=os.path.splitext(self.filename)[1])
+            with os.fdopen(fd, "wb") as spool:
+                spool.write(view)
+                spool.flush()
+                self._mmap = mmap.mmap(spool.fileno(), 0, access=mmap.ACCESS_READ)
+            view = memoryview(self._mmap)
+        self._view = view
+
+    @property
+    def ref(self) -> str:
+        return f"{AUDIO_HANDLE_SCHEME}{self.id}/{self.filename}"
+
+    @property
+    def size(self) -> int:
+        return len(self._view)
+
+    def getbuffer(self) -> memoryview:
+        """Return a zero-copy view of the payload."""
+        return self._view
+
+    def open(self) -> BufferReader:
+        return BufferReader(self._view)
+
+    def sha256(self) -> str:
+        """Hex digest of the payload, computed once per handle."""
+        if self._sha256 is None:
+            self._sha256 = hashlib.sha256(self._view).hexdigest()
+        return self._sha256
+
+    def close(self) -> None:
+        """Drop the payload and remove any spool file."""
+        self._view = memoryview(b"")
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # Segment views still alive; the map is freed with them
+            self._mmap = None
+        if self.spool_path:
+            try: os.unlink(self.spool_path)
+            except OSError: pass
+            self.spool_path = None
+
+    def __enter__(self) -> "AudioHandle":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        release_audio(self)
+
+    def __repr__(self) -> str:
+        return f"AudioHandle(ref={self.ref!r}, size={self.size}, spooled={self.spool_path is not None})"
+
+
+_handles: dict[str, AudioHandle] = {}
+_handles_lock = threading.Lock()
+
+
+def register_audio(data, filename: str, spool_threshold_mb: float = AUDIO_SPOOL_THRESHOLD_MB) -> AudioHandle:
+    """Register an audio payload (bytes, bytearray or memoryview) and return its handle."""
+    handle = AudioHandle(data, filename, int(spool_threshold_mb * 1024 * 1024))
+    with _handles_lock:
+        _handles[handle.id] = handle
+    return handle
+
+
+def get_audio_handle(source) -> AudioHandle | None:
+    """Resolve an AudioHandle or an `audio://` reference; None for anything else."""
+    if isinstance(source, AudioHandle):
+        return source
+    if not isinstance(source, str) or not source.startswith(AUDIO_HANDLE_SCHEME):
+        return None
+    handle_id = source[len(AUDIO_HANDLE_SCHEME):].split("/", 1)[0]
+    with _handles_lock:
+        return _handles.get(handle_id)
+
+
+def release_audio(source) -> None:
+    """Unregister a handle and free its payload."""
+    handle = get_audio_handle(source)
+    if handle is None:
+        return
+    with _handles_lock:
+        _handles.pop(handle.id, None)
+    handle.close()
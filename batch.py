@@ -0,0 +1,290 @@
+"""
+batch.py — Headless batch summarization for the Omega-Summarizer.
+Reads URLs or audio paths from a file, summarizes them concurrently through
+tools.execute_tool and streams one NDJSON record per item.
+
+Usage:
+    python batch.py urls.txt                       # Results to stdout
+    python batch.py items.jsonl -o results.ndjson  # Results to a file
+    python batch.py items.jsonl -o results.ndjson --resume
+    python batch.py urls.txt --workers 32 --limit article_tool=16
+
+Input formats:
+- Plain text: one URL or audio file path per line (`#` starts a comment)
+- JSONL: one object per line with `url`, `file_path`, `source` or `body`,
+  and an optional `id` / `request_id`
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from dataclasses import dataclass
+from itertools import islice
+
+# ── Ensure local imports work ────────────────────────────
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from constants import BATCH_MAX_WORKERS, BATCH_PROVIDER_LIMITS
+from omega_summarizer.router import route_input
+from omega_summarizer.utils import log_sink
+from utils import is_error_response, percentile
+
+SOURCE_FIELDS = ("url", "file_path", "source", "input", "body")
+
+
+@dataclass
+class BatchItem:
+    """One unit of batch work: an identifier and the raw source text (or why it is unusable)."""
+
+    id: str
+    source: str
+    error: str | None = None
+
+
+# ═════════════════════════════════════════════════════════
+#  INPUT LOADING
+# ═════════════════════════════════════════════════════════
+def parse_batch_line(line: str, line_number: int) -> BatchItem | None:
+    """
+    Parse one input line (plain text or JSON). Returns None for blanks and comments.
+    A malformed JSON line becomes an item carrying its error, reported as a failed
+    record instead of aborting the batch.
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+
+    if not line.startswith("{"):
+        return BatchItem(id=line, source=line)
+
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError as e:
+        return BatchItem(id=f"line-{line_number}", source=line, error=f"Malformed JSON on line {line_number}: {e.msg}")
+    source = next((str(record[f]) for f in SOURCE_FIELDS if record.get(f)), "")
+    item_id = str(record.get("id") or record.get("request_id") or source or f"line-{line_number}")
+    return BatchItem(id=item_id, source=source)
+
+
+def load_batch_items(path: str) -> list[BatchItem]:
+    """Load batch items from a plain-text or JSONL file, skipping duplicate IDs."""
+    items = []
+    seen = set()
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            item = parse_batch_line(line, line_number)
+            if item and item.error:
+                print(f"⚠️ {item.error} (reported as a failed record)", file=sys.stderr)
+            if item and item.id not in seen:
+                seen.add(item.id)
+                items.append(item)
+    return items
+
+
+def load_completed_ids(output_path: str) -> set[str]:
+    """Return the IDs already summarized successfully in a previous run's output."""
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Partially written line from an interrupted run
+            if record.get("status") == "ok":
+                completed.add(record.get("id"))
+    return completed
+
+
+# ═════════════════════════════════════════════════════════
+#  EXECUTION
+# ═════════════════════════════════════════════════════════
+class BatchRunner:
+    """
+    Fans batch items out over a thread pool.
+    Each tool (provider) has its own semaphore bounding its in-flight requests.
+    """
+
+    def __init__(self, max_workers: int = BATCH_MAX_WORKERS, provider_limits: dict[str, int] | None = None):
+        self.max_workers = max_workers
+        limits = {**BATCH_PROVIDER_LIMITS, **(provider_limits or {})}
+        self._semaphores = {
+            tool: threading.BoundedSemaphore(max(1, limit)) for tool, limit in limits.items()
+        }
+
+    def process(self, item: BatchItem) -> dict:
+        """Summarize one item and return its NDJSON record, including its execution log."""
+        log = []
+        with log_sink(lambda entry: log.append({k: entry[k] for k in ("tool", "message", "status")})):
+            record = self._summarize(item)
+        record["log"] = log
+        return record
+
+    def _summarize(self, item: BatchItem) -> dict:
+        # Deferred so `--help` and input validation do not load the provider SDKs
+        from tools import execute_tool
+
+        started = time.perf_counter()
+        route = None if item.error else route_input(item.source)
+        if route is None:
+            summary = f"❌ {item.error or 'Could not determine a tool for this input.'}"
+            tool_name = None
+        else:
+            tool_name, tool_args = route
+            try:
+                with self._semaphores.get(tool_name, nullcontext()):
+                    summary = execute_tool(tool_name, tool_args)
+            except Exception as e:
+                summary = f"❌ Unexpected error: {e}"
+
+        return {
+            "id": item.id,
+            "source": item.source,
+            "tool": tool_name,
+            "status": "error" if is_error_response(summary) else "ok",
+            "summary": summary,
+            "latency_s": round(time.perf_counter() - started, 3),
+            "finished_at": time.time(),
+        }
+
+    def run(self, items: list[BatchItem], output) -> list[dict]:
+        """
+        Process all items, writing each record to output as soon as it finishes.
+        At most `max_workers` items are submitted at a time, so an interrupted
+        run (Ctrl-C) stops after the items already in flight instead of draining
+        the whole input; finished records are written before re-raising.
+        """
+        records = []
+
+        def write(future) -> None:
+            record = future.result()
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output.flush()
+            records.append(record)
+
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        remaining = iter(items)
+        pending = set()
+        try:
+            while True:
+                for item in islice(remaining, self.max_workers - len(pending)):
+                    pending.add(pool.submit(self.process, item))
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.discard(future)
+                    write(future)
+        except KeyboardInterrupt:
+            for future in pending:
+                if future.done():
+                    write(future)
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        pool.shutdown()
+        return records
+
+
+# ═════════════════════════════════════════════════════════
+#  REPORTING
+# ═════════════════════════════════════════════════════════
+def build_report(records: list[dict], skipped: int, elapsed: float) -> dict:
+    """Aggregate throughput and latency statistics for a finished run."""
+    latencies = [r["latency_s"] for r in records]
+    succeeded = sum(1 for r in records if r["status"] == "ok")
+    return {
+        "processed": len(records),
+        "succeeded": succeeded,
+        "failed": len(records) - succeeded,
+        "skipped": skipped,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_per_min": round(len(records) / elapsed * 60, 2) if elapsed > 0 else 0.0,
+        "latency_p50_s": round(percentile(latencies, 50), 3),
+        "latency_p95_s": round(percentile(latencies, 95), 3),
+        "latency_max_s": round(max(latencies), 3) if latencies else 0.0,
+    }
+
+
+def print_report(report: dict) -> None:
+    """Print the end-of-run report to stderr, keeping stdout pure NDJSON."""
+    print(f"\n{'═' * 50}", file=sys.stderr)
+    print("  Batch Report", file=sys.stderr)
+    print(f"{'═' * 50}", file=sys.stderr)
+    for key, value in report.items():
+        print(f"  {key:<20} {value}", file=sys.stderr)
+    print(f"{'═' * 50}\n", file=sys.stderr)
+
+
+# ═════════════════════════════════════════════════════════
+#  CLI
+# ═════════════════════════════════════════════════════════
+def parse_limits(values: list[str]) -> dict[str, int]:
+    """Parse repeated `tool=N` options into a provider limit mapping."""
+    limits = {}
+    for value in values:
+        tool, _, limit = value.partition("=")
+        if tool not in BATCH_PROVIDER_LIMITS or not limit.isdigit():
+            raise argparse.ArgumentTypeError(
+                f"Invalid limit {value!r}. Use one of {', '.join(BATCH_PROVIDER_LIMITS)} as tool=N."
+            )
+        limits[tool] = int(limit)
+    return limits
+
+
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value!r}")
+    return number
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Summarize many URLs or audio files headlessly.")
+    parser.add_argument("input", help="Plain-text or JSONL file of URLs / audio paths")
+    parser.add_argument("-o", "--output", help="NDJSON output file (default: stdout)")
+    parser.add_argument("--resume", action="store_true", help="Skip items already successful in --output")
+    parser.add_argument("--workers", type=positive_int, default=BATCH_MAX_WORKERS, help="Total items in flight")
+    parser.add_argument("--limit", action="append", default=[], metavar="TOOL=N", help="Per-tool concurrency limit")
+    args = parser.parse_args(argv)
+
+    if args.resume and not args.output:
+        parser.error("--resume requires --output")
+    try:
+        limits = parse_limits(args.limit)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    items = load_batch_items(args.input)
+    completed = load_completed_ids(args.output) if args.resume else set()
+    pending = [item for item in items if item.id not in completed]
+
+    runner = BatchRunner(max_workers=args.workers, provider_limits=limits)
+    started = time.perf_counter()
+    try:
+        if args.output:
+            with open(args.output, "a" if args.resume else "w", encoding="utf-8") as output:
+                records = runner.run(pending, output)
+        else:
+            records = runner.run(pending, sys.stdout)
+    except KeyboardInterrupt:
+        hint = " — rerun with --resume to continue" if args.output else ""
+        print(f"\n⚠️ Interrupted; waiting for the items in flight{hint}", file=sys.stderr)
+        return 130
+
+    report = build_report(records, skipped=len(items) - len(pending), elapsed=time.perf_counter() - started)
+    print_report(report)
+    return 0 if report["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
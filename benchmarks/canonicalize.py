@@ -0,0 +1,95 @@
+"""
+canonicalize.py — Throughput benchmark for canonical source keys.
+Times the precompiled video ID matcher against the former per-pattern
+re.search loop, and full canonical_url_key() over a mixed URL corpus.
+
+Usage:
+    python benchmarks/canonicalize.py                   # Default corpus size
+    python benchmarks/canonicalize.py --urls 50000      # Larger corpus
+    python benchmarks/canonicalize.py --json            # JSON output
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from canonical import canonical_url_key, extract_video_id
+from constants import YOUTUBE_VIDEO_ID_PATTERNS
+
+URL_TEMPLATES = [
+    "https://youtu.be/{vid}",
+    "https://www.youtube.com/watch?v={vid}&t=30",
+    "https://m.youtube.com/watch?feature=share&v={vid}",
+    "https://www.youtube.com/shorts/{vid}",
+    "https://example.com/news/story-{n}?utm_source=feed&utm_medium=rss",
+    "http://www.example.org/blog/{n}/#comments",
+    "https://news.example.net/article?id={n}&fbclid=abc",
+]
+
+
+def legacy_extract_video_id(url: str) -> str | None:
+    """The previous implementation: one re.search per pattern string."""
+    for pattern in YOUTUBE_VIDEO_ID_PATTERNS:
+        match = re.search(pattern, url)
+        if match:
+            return match.group(1)
+    return None
+
+
+def build_corpus(size: int) -> list[str]:
+    """Cycle through the templates; each group of templates shares one video and story."""
+    corpus = []
+    for n in range(size):
+        group = n // len(URL_TEMPLATES)
+        corpus.append(URL_TEMPLATES[n % len(URL_TEMPLATES)].format(vid=f"{group:011d}", n=group))
+    return corpus
+
+
+def time_per_call(func, corpus: list[str], rounds: int) -> float:
+    """Best-of-rounds nanoseconds per call."""
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter_ns()
+        for url in corpus:
+            func(url)
+        best = min(best, (time.perf_counter_ns() - started) / len(corpus))
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark canonical source key computation.")
+    parser.add_argument("--urls", type=int, default=20_000, help="URLs in the corpus")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed passes (best is reported)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    corpus = build_corpus(max(1, args.urls))
+    legacy_ns = time_per_call(legacy_extract_video_id, corpus, args.rounds)
+    compiled_ns = time_per_call(extract_video_id, corpus, args.rounds)
+    report = {
+        "urls": len(corpus),
+        "extract_video_id_legacy_ns": round(legacy_ns),
+        "extract_video_id_ns": round(compiled_ns),
+        "speedup": round(legacy_ns / compiled_ns, 2),
+        "canonical_url_key_ns": round(time_per_call(canonical_url_key, corpus, args.rounds)),
+        "distinct_keys": len({canonical_url_key(url) for url in corpus}),
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"\n{'═' * 50}")
+        for name, value in report.items():
+            print(f"  {name:<30} {value:>15}")
+        print(f"{'═' * 50}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
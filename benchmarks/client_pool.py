@@ -0,0 +1,112 @@
+"""
+client_pool.py — Per-request provider clients vs the shared client registry.
+Sends Groq chat completions to a local stand-in (standin.py) from several
+threads, once building a new Groq client per request (as run_agent used to)
+and once through clients.get_clients(), and reports latency and the number of
+connections each approach opened. Against the real API every new connection
+also pays a TLS handshake, so the gap there is larger than on localhost.
+
+Usage:
+    python benchmarks/client_pool.py                     # 200 requests, 8 threads
+    python benchmarks/client_pool.py --requests 1000 --threads 16
+    python benchmarks/client_pool.py --json              # JSON output
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from clients import ClientRegistry
+from config import get_config
+from standin import start_standin
+from utils import percentile
+
+MESSAGES = [{"role": "user", "content": "Summarize https://example.com/post"}]
+
+
+def run(make_client, requests: int, threads: int) -> list[float]:
+    """Latency in ms of each request, sent from `threads` workers."""
+    def one(_):
+        started = time.perf_counter()
+        make_client().chat.completions.create(model="llama-3.3-70b-versatile", messages=MESSAGES)
+        return (time.perf_counter() - started) * 1000
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return list(pool.map(one, range(requests)))
+
+
+def summarize(latencies: list[float], elapsed: float, connections: int) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "p50_ms": round(percentile(ordered, 50), 2),
+        "p95_ms": round(percentile(ordered, 95), 2),
+        "req_per_s": round(len(latencies) / elapsed, 1),
+        "connections": connections,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark per-request vs pooled provider clients.")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per approach")
+    parser.add_argument("--threads", type=int, default=8, help="Concurrent senders")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    from groq import Groq
+
+    server = start_standin(seed=0)
+    os.environ["GROQ_API_KEY"] = "bench"
+    get_config().endpoints.groq_base_url = server.base_url
+    registry = ClientRegistry(get_config().clients)
+
+    # Per-request clients: count connections with a fresh registry-style hook each time
+    opened = []
+
+    def fresh_client():
+        counter = ClientRegistry(get_config().clients)
+        opened.append(counter)
+        return Groq(api_key="bench", base_url=server.base_url, http_client=counter.http())
+
+    try:
+        started = time.perf_counter()
+        fresh = run(fresh_client, args.requests, args.threads)
+        fresh_elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        pooled = run(registry.groq, args.requests, args.threads)
+        pooled_elapsed = time.perf_counter() - started
+
+        report = {
+            "requests": args.requests,
+            "threads": args.threads,
+            "per_request_client": summarize(
+                fresh, fresh_elapsed, sum(c.stats()["sync"]["connections_opened"] for c in opened)
+            ),
+            "shared_registry": summarize(pooled, pooled_elapsed, registry.stats()["sync"]["connections_opened"]),
+        }
+    finally:
+        for counter in opened:
+            counter.close()
+        registry.close()
+        server.shutdown()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"\n{'═' * 64}")
+        print(f"  {'Approach':<22} {'p50 ms':>9} {'p95 ms':>9} {'req/s':>9} {'Connections':>12}")
+        for name in ("per_request_client", "shared_registry"):
+            row = report[name]
+            print(f"  {name:<22} {row['p50_ms']:>9} {row['p95_ms']:>9} {row['req_per_s']:>9} {row['connections']:>12}")
+        print(f"{'═' * 64}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+import_time.py — Cold-start import benchmark for the Omega-Summarizer.
+Imports each project module in a fresh interpreter with `-X importtime`
+and reports its total startup cost and heaviest dependencies.
+
+Usage:
+    python benchmarks/import_time.py                 # Default module set
+    python benchmarks/import_time.py tools server    # Specific modules
+    python benchmarks/import_time.py --runs 5 --json # Median of 5 runs, JSON output
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = [
+    "constants",
+    "config",
+    "utils",
+    "prompts",
+    "canonical",
+    "cache",
+    "dedup",
+    "retry",
+    "tools",
+    "async_tools",
+    "omega_summarizer.router",
+    "omega_summarizer.agent",
+    "batch",
+    "server",
+]
+
+
+# ═════════════════════════════════════════════════════════
+#  MEASUREMENT
+# ═════════════════════════════════════════════════════════
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """Map each imported module to its cumulative import time in microseconds."""
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # Header row
+        cumulative[parts[2].strip()] = int(parts[1])
+    return cumulative
+
+
+def measure_module(module: str) -> dict[str, int]:
+    """Import one module in a fresh interpreter and return its importtime table."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-W", "ignore", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+    return parse_importtime(result.stderr)
+
+
+def benchmark(modules: list[str], runs: int, top: int) -> list[dict]:
+    """Return the median startup cost and top dependencies of each module."""
+    interpreter = set(measure_module("sys"))  # Loaded by every interpreter anyway
+    report = []
+    for module in modules:
+        tables = [measure_module(module) for _ in range(runs)]
+        totals = [table.get(module, 0) for table in tables]
+        last = tables[-1]
+        heaviest = sorted(
+            ((name, us) for name, us in last.items() if name != module and name not in interpreter),
+            key=lambda item: item[1],
+            reverse=True,
+        )[:top]
+        report.append({
+            "module": module,
+            "import_ms": round(statistics.median(totals) / 1000, 1),
+            "modules_loaded": len(set(last) - interpreter),
+            "heaviest": [{"module": name, "ms": round(us / 1000, 1)} for name, us in heaviest],
+        })
+    return report
+
+
+# ═════════════════════════════════════════════════════════
+#  CLI
+# ═════════════════════════════════════════════════════════
+def print_table(report: list[dict]) -> None:
+    print(f"\n{'═' * 72}")
+    print(f"  {'Module':<26} {'Import (ms)':>12} {'Loaded':>8}   Heaviest dependency")
+    print(f"{'═' * 72}")
+    for row in report:
+        heaviest = row["heaviest"][0] if row["heaviest"] else None
+        detail = f"{heaviest['module']} ({heaviest['ms']} ms)" if heaviest else "—"
+        print(f"  {row['module']:<26} {row['import_ms']:>12} {row['modules_loaded']:>8}   {detail}")
+    print(f"{'═' * 72}\n")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure cold-start import cost per module.")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters per module (median is reported)")
+    parser.add_argument("--top", type=int, default=5, help="Heaviest dependencies to list per module")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = benchmark(args.modules, max(1, args.runs), args.top)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_table(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
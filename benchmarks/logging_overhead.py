@@ -0,0 +1,98 @@
+"""
+logging_overhead.py — Caller-side cost of one log call.
+Times the synchronous console/file handlers of logger.setup_logger against
+the queue-backed JSON-lines handler, measured on the calling thread only
+(what a request pays), plus the time the JSON listener needs to drain.
+
+Usage:
+    python benchmarks/logging_overhead.py                  # 20k records per handler
+    python benchmarks/logging_overhead.py --records 100000
+    python benchmarks/logging_overhead.py --json           # JSON output
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import logger as omega_logger
+from config import LoggingConfig
+from tracing import span, start_trace
+
+
+def time_calls(log: logging.Logger, records: int) -> float:
+    """Mean microseconds per call inside a traced request."""
+    with start_trace():
+        started = time.perf_counter_ns()
+        for i in range(records):
+            log.info("Fetched %s in %d ms", "https://example.com/post", i)
+        return (time.perf_counter_ns() - started) / records / 1000
+
+
+def sync_logger(name: str, handler: logging.Handler) -> logging.Logger:
+    log = logging.getLogger(name)
+    log.handlers[:] = [handler]
+    handler.setFormatter(logging.Formatter("%(asctime)s │ %(levelname)-8s │ %(name)s │ %(message)s"))
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    return log
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the caller-side cost of logging.")
+    parser.add_argument("--records", type=int, default=20_000, help="Log calls per handler")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+    records = max(1, args.records)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.devnull, "w") as devnull:
+            stream_us = time_calls(sync_logger("bench.stream", logging.StreamHandler(devnull)), records)
+        file_handler = logging.FileHandler(os.path.join(tmp, "sync.log"), encoding="utf-8")
+        file_us = time_calls(sync_logger("bench.file", file_handler), records)
+        file_handler.close()
+
+        queued = logging.getLogger("bench.queued")
+        queued.propagate = False
+        omega_logger.setup_json_logging(queued, LoggingConfig(json_lines=True, path=os.path.join(tmp, "omega.jsonl")))
+        queued_us = time_calls(queued, records)
+        dropped = omega_logger.dropped_records()
+        started = time.perf_counter()
+        omega_logger.shutdown_json_logging()
+        drain_ms = (time.perf_counter() - started) * 1000
+
+        with start_trace():
+            started = time.perf_counter_ns()
+            for _ in range(records):
+                with span("bench", log=False):
+                    pass
+            span_us = (time.perf_counter_ns() - started) / records / 1000
+
+    report = {
+        "records": records,
+        "stream_handler_us": round(stream_us, 2),
+        "file_handler_us": round(file_us, 2),
+        "queued_json_us": round(queued_us, 2),
+        "queued_json_dropped": dropped,
+        "queued_json_drain_ms": round(drain_ms, 1),
+        "span_us": round(span_us, 2),
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"\n{'═' * 50}")
+        for name, value in report.items():
+            print(f"  {name:<30} {value:>15}")
+        print(f"{'═' * 50}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,604 @@
+"""
+pipeline.py — Offline end-to-end benchmark for the Omega-Summarizer.
+Swaps in-process stubs for Gemini, Groq (chat and Whisper), Firecrawl,
+Trafilatura and the YouTube transcript API, then drives execute_tool()
+and run_agent() at several concurrency levels and input sizes. No network
+calls are made and no API keys are needed.
+
+Reports, per scenario × input size × concurrency, the p50/p95/p99 latency
+of the whole request and of each pipeline stage, throughput, and peak
+traced memory (of the batch, and of each stage in a serial pass) as JSON.
+
+Usage:
+    python benchmarks/pipeline.py                                  # Default matrix, table output
+    python benchmarks/pipeline.py --json -o baseline.json          # Machine-readable report
+    python benchmarks/pipeline.py --sizes 20000 --concurrency 1,16 --requests 64
+    python benchmarks/pipeline.py --latency gemini=800 --latency firecrawl=300
+    python benchmarks/pipeline.py --baseline baseline.json         # Exit 1 on p95 regressions
+"""
+
+import argparse
+import io
+import json
+import math
+import os
+import platform
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import types
+import wave
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+# Every request must exercise the full pipeline: no summary cache, no
+# near-duplicate reuse, no quota throttling of the stub providers, and
+# nothing written next to the real cache files.
+_SCRATCH = tempfile.mkdtemp(prefix="omega-bench-")
+os.environ.update({
+    "OMEGA_CACHE_ENABLED": "false",
+    "OMEGA_DEDUP_ENABLED": "false",
+    "OMEGA_RATE_LIMIT_ENABLED": "false",
+    "OMEGA_CACHE_PATH": os.path.join(_SCRATCH, "summary_cache.db"),
+    "OMEGA_HISTORY_PATH": os.path.join(_SCRATCH, "summary_history.db"),
+    "GOOGLE_API_KEY": "bench",
+    "GROQ_API_KEY": "bench",
+    "FIRE_CRAWL_KEY": "bench",
+})
+
+# Distinct payloads per input size; generated once, before any timing
+PAYLOAD_VARIANTS = 8
+
+# `burst` asks for one shared article in every request, as when a link is pasted
+# by many users at once; concurrent requests coalesce onto a single pipeline run.
+SCENARIOS = ["article", "youtube", "audio", "agent_rules", "agent_llm", "burst"]
+
+# Stand-in provider latencies in milliseconds: base + per 1k prompt tokens.
+# Scaled down from production so the default matrix finishes in seconds.
+DEFAULT_LATENCIES = {
+    "gemini": 40.0,
+    "gemini_per_1k_tokens": 2.0,
+    "groq_chat": 15.0,
+    "whisper": 50.0,
+    "firecrawl": 30.0,
+    "trafilatura": 45.0,
+    "youtube": 20.0,
+}
+
+
+# ═════════════════════════════════════════════════════════
+#  STAGE RECORDER
+# ═════════════════════════════════════════════════════════
+class StageRecorder:
+    """Thread-safe collection of per-stage durations (and serial-pass memory peaks)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.durations: dict[str, list[float]] = {}
+        self.memory: dict[str, int] = {}
+        self._memory_frames: list[list[int]] | None = None
+
+    def reset(self, track_memory: bool = False) -> None:
+        with self._lock:
+            self.durations = {}
+            self.memory = {}
+        self._memory_frames = [] if track_memory else None
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.durations.setdefault(stage, []).append(seconds)
+
+    def wrap(self, stage: str, func):
+        """Time every call of func as `stage`; in a serial memory pass, also its peak."""
+        recorder = self
+
+        def timed(*args, **kwargs):
+            frames = recorder._memory_frames
+            if frames is not None:
+                frames.append(recorder._enter_memory())
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                recorder.record(stage, time.perf_counter() - started)
+                if frames is not None:
+                    recorder._exit_memory(stage, frames.pop())
+
+        timed.__wrapped__ = func
+        return timed
+
+    # tracemalloc has one process-wide peak, so nested stages save the
+    # caller's peak before resetting it and hand their own peak back on exit.
+    def _enter_memory(self) -> list[int]:
+        current, peak = tracemalloc.get_traced_memory()
+        if self._memory_frames:
+            parent = self._memory_frames[-1]
+            parent[1] = max(parent[1], peak)
+        tracemalloc.reset_peak()
+        return [current, current]
+
+    def _exit_memory(self, stage: str, frame: list[int]) -> None:
+        start, peak = frame[0], max(frame[1], tracemalloc.get_traced_memory()[1])
+        self.memory[stage] = max(self.memory.get(stage, 0), peak - start)
+        if self._memory_frames:
+            parent = self._memory_frames[-1]
+            parent[1] = max(parent[1], peak)
+
+
+RECORDER = StageRecorder()
+
+
+# ═════════════════════════════════════════════════════════
+#  STUB PROVIDERS
+# ═════════════════════════════════════════════════════════
+@dataclass
+class Latency:
+    """Log-normal latency around a median, plus a per-1k-token component."""
+
+    median_ms: float
+    per_1k_tokens_ms: float = 0.0
+    jitter: float = 0.25
+    rng: random.Random = field(default_factory=lambda: random.Random(0))
+
+    def sleep(self, tokens: int = 0) -> None:
+        base = self.median_ms * (self.rng.lognormvariate(0.0, self.jitter) if self.jitter else 1.0)
+        time.sleep(max(0.0, base + self.per_1k_tokens_ms * tokens / 1000) / 1000)
+
+
+def variant(key: str) -> int:
+    return zlib.crc32(key.encode()) % PAYLOAD_VARIANTS
+
+
+@lru_cache(maxsize=None)
+def synthetic_words(chars: int, seed: int) -> str:
+    """Zipf-ish prose of about `chars` characters; each seed gives a different text."""
+    rng = random.Random(seed)
+    vocabulary = [f"term{i}" for i in range(3000)]
+    weights = [1.0 / (rank + 1) for rank in range(len(vocabulary))]
+    sentences, length = [], 0
+    while length < chars:
+        sentence = " ".join(rng.choices(vocabulary, weights, k=rng.randint(8, 24))).capitalize() + "."
+        sentences.append(sentence)
+        length += len(sentence) + 1
+    return " ".join(sentences)
+
+
+@lru_cache(maxsize=None)
+def synthetic_markdown(chars: int, seed: int) -> str:
+    """Article markdown with the navigation, images and footers Firecrawl returns."""
+    body = synthetic_words(chars, seed)
+    paragraphs = [body[i:i + 600] for i in range(0, len(body), 600)]
+    chrome = [
+        "- [Home](/)", "- [News](/news)", "- [About](/about)",
+        "![banner](https://cdn.example.com/banner.png)",
+        "We use cookies to improve your experience.",
+    ]
+    footer = ["© 2024 Example Media. All rights reserved.", "[Privacy](/privacy) | [Terms](/terms) | [Contact](/contact)"]
+    return "\n".join(chrome + [f"# Story {seed}", ""] + [p + "\n" for p in paragraphs] + footer)
+
+
+@lru_cache(maxsize=None)
+def synthetic_captions(chars: int, seed: int) -> tuple[dict, ...]:
+    """Auto-generated captions: short lines, each rolling over the previous one."""
+    words = synthetic_words(chars, seed).split()
+    step = 7
+    return tuple(
+        {"text": " ".join(words[max(0, i - 3):i + step]), "start": i / 3.0, "duration": 2.0}
+        for i in range(0, len(words), step)
+    )
+
+
+SUMMARY_TEMPLATE = (
+    "## 🎯 Quick Take\n{lead}\n\n"
+    "## 💡 Key Insights\n- **Finding**: {body}\n\n"
+    "## 🚀 Action Steps\n- **Apply**: Act on the finding.\n"
+)
+
+
+class StubResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubGeminiModel:
+    """Stands in for google.generativeai.GenerativeModel."""
+
+    model_name = "models/stub-gemini"
+
+    def __init__(self, latency: Latency, summary_chars: int):
+        self.latency = latency
+        self.summary_chars = summary_chars
+
+    def generate_content(self, prompt: str, stream: bool = False):
+        started = time.perf_counter()
+        self.latency.sleep(len(prompt) // 4)
+        body = ("insight " * (self.summary_chars // 8 + 1))[:self.summary_chars]
+        text = SUMMARY_TEMPLATE.format(lead=prompt[:120].replace("\n", " "), body=body)
+        RECORDER.record("provider.gemini", time.perf_counter() - started)
+        if stream:
+            return [StubResponse(text[i:i + 256]) for i in range(0, len(text), 256)]
+        return StubResponse(text)
+
+
+class StubFirecrawl:
+    """Stands in for clients.FirecrawlClient."""
+
+    def __init__(self, latency: Latency, chars: int):
+        self.latency, self.chars = latency, chars
+
+    def scrape(self, url: str, formats=None):
+        started = time.perf_counter()
+        self.latency.sleep()
+        markdown = synthetic_markdown(self.chars, variant(url))
+        RECORDER.record("provider.firecrawl", time.perf_counter() - started)
+        return types.SimpleNamespace(markdown=markdown)
+
+
+class StubTrafilatura:
+    """Stands in for the trafilatura module."""
+
+    def __init__(self, latency: Latency, chars: int):
+        self.latency, self.chars = latency, chars
+
+    def fetch_url(self, url: str):
+        started = time.perf_counter()
+        self.latency.sleep()
+        RECORDER.record("provider.trafilatura", time.perf_counter() - started)
+        return url
+
+    def extract(self, downloaded: str):
+        return synthetic_words(self.chars, variant(downloaded))
+
+
+class StubTranscriptApi:
+    """Stands in for youtube_transcript_api.YouTubeTranscriptApi."""
+
+    latency = Latency(DEFAULT_LATENCIES["youtube"])
+    chars = 20_000
+
+    @classmethod
+    def get_transcript(cls, video_id: str):
+        started = time.perf_counter()
+        cls.latency.sleep()
+        entries = [dict(entry) for entry in synthetic_captions(cls.chars, variant(video_id))]
+        RECORDER.record("provider.youtube", time.perf_counter() - started)
+        return entries
+
+
+class StubWhisper:
+    def __init__(self, latency: Latency, chars: int):
+        self.latency, self.chars = latency, chars
+
+    def create(self, file, model, response_format):
+        started = time.perf_counter()
+        self.latency.sleep()
+        RECORDER.record("provider.whisper", time.perf_counter() - started)
+        return synthetic_words(self.chars, variant(file[0]))
+
+
+def stub_tool_call(tool_name: str, arguments: dict):
+    function = types.SimpleNamespace(name=tool_name, arguments=json.dumps(arguments))
+    return types.SimpleNamespace(id="call_bench", type="function", function=function)
+
+
+class StubGroqChat:
+    """Calls the tool matching the first URL in the prompt, then confirms."""
+
+    def __init__(self, latency: Latency):
+        self.latency = latency
+
+    def create(self, model, messages, tools=None, tool_choice=None, max_tokens=None):
+        started = time.perf_counter()
+        self.latency.sleep(sum(len(str(m)) for m in messages) // 4)
+        last = messages[-1]
+        if isinstance(last, dict) and last.get("role") == "tool":
+            message = types.SimpleNamespace(role="assistant", content="Done.", tool_calls=None)
+            finish = "stop"
+        else:
+            url = re.search(r"https?://\S+", messages[-1]["content"]).group(0)
+            tool = "youtube_tool" if "youtu" in url else "article_tool"
+            message = types.SimpleNamespace(role="assistant", content=None, tool_calls=[stub_tool_call(tool, {"url": url})])
+            finish = "tool_calls"
+        RECORDER.record("provider.groq", time.perf_counter() - started)
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(finish_reason=finish, message=message)])
+
+
+class StubGroq:
+    """Stands in for groq.Groq (chat completions and Whisper transcriptions)."""
+
+    chat_latency = Latency(DEFAULT_LATENCIES["groq_chat"])
+    whisper = StubWhisper(Latency(DEFAULT_LATENCIES["whisper"]), 20_000)
+
+    def __init__(self, api_key: str | None = None, **kwargs):
+        self.chat = types.SimpleNamespace(completions=StubGroqChat(self.chat_latency))
+        self.audio = types.SimpleNamespace(transcriptions=self.whisper)
+
+
+def install_stubs(latencies: dict[str, float], jitter: float, input_chars: int, summary_chars: int) -> None:
+    """Point tools.py and the SDK imports at the stubs for one input size."""
+    import tools
+
+    def latency(name: str, per_1k: str | None = None) -> Latency:
+        return Latency(latencies[name], latencies.get(per_1k, 0.0) if per_1k else 0.0, jitter)
+
+    tools.gemini_model = StubGeminiModel(latency("gemini", "gemini_per_1k_tokens"), summary_chars)
+    tools.firecrawl = StubFirecrawl(latency("firecrawl"), input_chars)
+    tools.trafilatura = StubTrafilatura(latency("trafilatura"), input_chars)
+    StubGroq.chat_latency = latency("groq_chat")
+    StubGroq.whisper = StubWhisper(latency("whisper"), input_chars)
+    tools.groq_client = StubGroq()
+    StubTranscriptApi.latency = latency("youtube")
+    StubTranscriptApi.chars = input_chars
+
+    # get_youtube_transcript imports the SDK inside the call
+    sys.modules["youtube_transcript_api"] = types.SimpleNamespace(YouTubeTranscriptApi=StubTranscriptApi)
+
+    for seed in range(PAYLOAD_VARIANTS):
+        synthetic_markdown(input_chars, seed)
+        synthetic_captions(input_chars, seed)
+
+
+def instrument_stages() -> None:
+    """Wrap the pipeline stages of tools.py and the agent with the recorder."""
+    import tools
+    from omega_summarizer import agent
+
+    stages = {
+        (tools, "extract_article_hedged"): "extract",
+        (tools, "extract_article_sequential"): "extract",
+        (tools, "clean_article"): "cleanup",
+        (tools, "join_captions"): "cleanup",
+        (tools, "transcribe_segments"): "transcribe",
+        (tools, "compress_for_prompt"): "compress",
+        (tools, "condense_in_chunks"): "map",
+        (tools, "generate_final_summary"): "summarize",
+        (agent, "plan_route"): "route",
+    }
+    for (module, name), stage in stages.items():
+        func = getattr(module, name)
+        setattr(module, name, RECORDER.wrap(stage, getattr(func, "__wrapped__", func)))
+
+
+# ═════════════════════════════════════════════════════════
+#  SCENARIOS
+# ═════════════════════════════════════════════════════════
+def silent_wav(seconds: float = 1.0, rate: int = 16_000) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(bytes(int(seconds * rate) * 2))
+    return buffer.getvalue()
+
+
+def make_request(scenario: str, index: int, audio_ref: str):
+    """Return a zero-argument callable running request `index` of a scenario."""
+    from tools import execute_tool
+    from omega_summarizer.agent import run_agent
+
+    url = f"https://news.example.com/story-{index}"
+    video = f"https://youtu.be/{index:011d}"
+    return {
+        "article": lambda: execute_tool("article_tool", {"url": url}),
+        "youtube": lambda: execute_tool("youtube_tool", {"url": video}),
+        "audio": lambda: execute_tool("audio_tool", {"file_path": audio_ref}),
+        "agent_rules": lambda: run_agent(url, "llama-3.3-70b-versatile", policy="rules"),
+        "agent_llm": lambda: run_agent(f"Please summarize {url}", "llama-3.3-70b-versatile", policy="llm"),
+        "burst": lambda: execute_tool("article_tool", {"url": f"https://news.example.com/shared?utm_source=chat-{index}"}),
+    }[scenario]
+
+
+def run_request(request) -> tuple[float, bool]:
+    """Run one request with logs discarded; returns (seconds, succeeded)."""
+    from omega_summarizer.utils import log_sink
+
+    started = time.perf_counter()
+    with log_sink(lambda entry: None):
+        result = RECORDER.wrap("request", request)()
+    return time.perf_counter() - started, not str(result).startswith("❌")
+
+
+def run_batch(scenario: str, concurrency: int, requests: int, audio_ref: str) -> tuple[float, int]:
+    """Run `requests` requests on `concurrency` threads; returns (wall seconds, errors)."""
+    batch = [make_request(scenario, index, audio_ref) for index in range(requests)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(run_request, batch))
+    return time.perf_counter() - started, sum(1 for _, ok in outcomes if not ok)
+
+
+# ═════════════════════════════════════════════════════════
+#  STATISTICS
+# ═════════════════════════════════════════════════════════
+def percentile(values: list[float], q: float) -> float:
+    """Linearly interpolated percentile (q in 0–100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize_latencies(seconds: list[float]) -> dict:
+    ms = [value * 1000 for value in seconds]
+    return {
+        "count": len(ms),
+        "p50_ms": round(percentile(ms, 50), 2),
+        "p95_ms": round(percentile(ms, 95), 2),
+        "p99_ms": round(percentile(ms, 99), 2),
+        "max_ms": round(max(ms, default=0.0), 2),
+    }
+
+
+def measure_cell(scenario: str, input_chars: int, concurrency: int, requests: int, audio_ref: str) -> dict:
+    """Timed pass, then a traced pass for batch and per-stage memory peaks."""
+    RECORDER.reset()
+    wall, errors = run_batch(scenario, concurrency, requests, audio_ref)
+    durations = RECORDER.durations
+    request_latency = durations.pop("request", [])
+
+    # Serial pass: per-stage peaks are only attributable one request at a time
+    tracemalloc.start()
+    RECORDER.reset(track_memory=True)
+    run_batch(scenario, 1, 1, audio_ref)
+    stage_memory = RECORDER.memory
+    RECORDER.reset()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    run_batch(scenario, concurrency, min(requests, concurrency * 2), audio_ref)
+    batch_peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+
+    stages = {}
+    for stage, values in sorted(durations.items()):
+        stages[stage] = summarize_latencies(values)
+        if stage in stage_memory:
+            stages[stage]["peak_memory_kb"] = round(stage_memory[stage] / 1024, 1)
+    return {
+        "scenario": scenario,
+        "input_chars": input_chars,
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(requests / wall, 2) if wall else 0.0,
+        "latency": summarize_latencies(request_latency),
+        "peak_memory_mb": round(batch_peak / 2**20, 2),
+        "request_peak_memory_kb": round(stage_memory.get("request", 0) / 1024, 1),
+        "stages": stages,
+    }
+
+
+def cell_key(cell: dict) -> tuple:
+    return cell["scenario"], cell["input_chars"], cell["concurrency"]
+
+
+def find_regressions(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Cells whose p95 latency grew by more than `tolerance` over the baseline."""
+    previous = {cell_key(cell): cell for cell in baseline.get("results", [])}
+    regressions = []
+    for cell in report["results"]:
+        before = previous.get(cell_key(cell))
+        if not before or not before["latency"]["p95_ms"]:
+            continue
+        ratio = cell["latency"]["p95_ms"] / before["latency"]["p95_ms"]
+        if ratio > 1 + tolerance:
+            regressions.append(
+                f"{cell['scenario']} @ {cell['input_chars']:,} chars × {cell['concurrency']}: "
+                f"p95 {before['latency']['p95_ms']} → {cell['latency']['p95_ms']} ms ({ratio:.2f}×)"
+            )
+    return regressions
+
+
+# ═════════════════════════════════════════════════════════
+#  CLI
+# ═════════════════════════════════════════════════════════
+def parse_int_list(value: str) -> list[int]:
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def parse_latencies(overrides: list[str]) -> dict[str, float]:
+    latencies = dict(DEFAULT_LATENCIES)
+    for override in overrides:
+        name, _, value = override.partition("=")
+        if name not in latencies or not value:
+            raise SystemExit(f"Unknown latency override {override!r}. Known: {', '.join(latencies)}")
+        latencies[name] = float(value)
+    return latencies
+
+
+def print_table(report: dict) -> None:
+    print(f"\n{'═' * 96}")
+    print(f"  {'Scenario':<12} {'Chars':>8} {'Conc':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>8} {'Peak MB':>8}  Slowest stage (p95)")
+    print(f"{'═' * 96}")
+    for cell in report["results"]:
+        latency = cell["latency"]
+        stages = {name: s for name, s in cell["stages"].items() if not name.startswith("provider.")}
+        slowest = max(stages.items(), key=lambda item: item[1]["p95_ms"], default=("—", {"p95_ms": 0}))
+        errors = f"  ({cell['errors']} errors)" if cell["errors"] else ""
+        print(
+            f"  {cell['scenario']:<12} {cell['input_chars']:>8,} {cell['concurrency']:>5} "
+            f"{latency['p50_ms']:>9} {latency['p95_ms']:>9} {latency['p99_ms']:>9} "
+            f"{cell['throughput_rps']:>8} {cell['peak_memory_mb']:>8}  {slowest[0]} {slowest[1]['p95_ms']}{errors}"
+        )
+    print(f"{'═' * 96}\n")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline end-to-end pipeline benchmark with stub providers.")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"Comma-separated subset of {', '.join(SCENARIOS)}")
+    parser.add_argument("--sizes", default="5000,50000", help="Input sizes in characters")
+    parser.add_argument("--concurrency", default="1,8", help="Concurrency levels")
+    parser.add_argument("--requests", type=int, default=16, help="Requests per cell")
+    parser.add_argument("--summary-chars", type=int, default=1500, help="Size of each stub Gemini response")
+    parser.add_argument("--latency", action="append", default=[], metavar="NAME=MS", help="Override a stub latency")
+    parser.add_argument("--jitter", type=float, default=0.25, help="Log-normal sigma of stub latencies (0 = fixed)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("-o", "--output", help="Also write the JSON report to this file")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare p95 latencies against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed p95 growth over the baseline")
+    args = parser.parse_args(argv)
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+    latencies = parse_latencies(args.latency)
+
+    from audio import register_audio
+    from constants import APP_VERSION
+
+    instrument_stages()
+    handle = register_audio(silent_wav(), "bench.wav")
+    results = []
+    for input_chars in parse_int_list(args.sizes):
+        install_stubs(latencies, args.jitter, input_chars, args.summary_chars)
+        for scenario in scenarios:
+            for concurrency in parse_int_list(args.concurrency):
+                results.append(measure_cell(scenario, input_chars, concurrency, args.requests, handle.ref))
+
+    report = {
+        "version": APP_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {
+            "requests": args.requests,
+            "summary_chars": args.summary_chars,
+            "jitter": args.jitter,
+            "latencies_ms": latencies,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_table(report)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = find_regressions(report, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"⚠️  Regression: {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
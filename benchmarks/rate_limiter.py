@@ -0,0 +1,93 @@
+"""
+rate_limiter.py — Throughput of processes sharing one provider quota.
+Several worker processes call ratelimit.throttle() as fast as they can
+against one synthetic quota stored in a scratch database. The limiter should
+hold their combined rate at the quota: the initial burst (one minute's
+budget) plus the refill rate for the rest of the run — never above, and not
+far below.
+
+Usage:
+    python benchmarks/rate_limiter.py                       # 4 processes, 600 RPM, 10 s
+    python benchmarks/rate_limiter.py --processes 8 --rpm 1200 --seconds 20
+    python benchmarks/rate_limiter.py --json                # JSON output
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+
+def worker(deadline: float, results) -> None:
+    """Take slots until the deadline; report the calls made and time spent reserving."""
+    import ratelimit
+
+    limiter = ratelimit.get_rate_limiter()
+    calls, reserve_ns = 0, 0
+    while True:
+        started = time.perf_counter_ns()
+        wait = limiter.acquire("bench", "model")
+        reserve_ns += time.perf_counter_ns() - started
+        if time.time() + wait >= deadline:
+            break
+        time.sleep(wait)
+        calls += 1
+    results.put((calls, reserve_ns))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark processes sharing one rate-limit budget.")
+    parser.add_argument("--processes", type=int, default=4, help="Worker processes")
+    parser.add_argument("--rpm", type=int, default=600, help="Shared requests-per-minute quota")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Run duration")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+    processes = max(1, args.processes)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Inherited by the workers before they first read the configuration
+        os.environ.update({
+            "OMEGA_RATE_LIMIT_ENABLED": "true",
+            "OMEGA_RATE_LIMIT_PATH": os.path.join(tmp, "rate_limits.db"),
+            "OMEGA_RATE_LIMITS": f"bench:*={args.rpm}",
+            "OMEGA_RATE_LIMIT_MAX_WAIT": str(args.seconds + 60),
+        })
+        results = multiprocessing.Queue()
+        deadline = time.time() + args.seconds
+        workers = [multiprocessing.Process(target=worker, args=(deadline, results)) for _ in range(processes)]
+        for process in workers:
+            process.start()
+        outcomes = [results.get() for _ in workers]
+        for process in workers:
+            process.join()
+
+    calls = sum(c for c, _ in outcomes)
+    ceiling = args.rpm + args.rpm / 60 * args.seconds  # Full bucket plus refill
+    report = {
+        "processes": processes,
+        "rpm": args.rpm,
+        "seconds": args.seconds,
+        "calls": calls,
+        "quota_ceiling": int(ceiling),
+        "utilization": round(calls / ceiling, 3),
+        "reserve_us": round(sum(ns for _, ns in outcomes) / max(1, calls + processes) / 1000, 1),
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"\n{'═' * 50}")
+        for name, value in report.items():
+            print(f"  {name:<30} {value:>15}")
+        print(f"{'═' * 50}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
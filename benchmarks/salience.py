@@ -0,0 +1,104 @@
+"""
+salience.py — Speed benchmark for salience pre-compression.
+Runs salient_extract() on synthetic articles and caption-style transcripts
+(200k characters by default) and reports the time per stage and the
+prompt tokens saved.
+
+Usage:
+    python benchmarks/salience.py                      # 200k characters, ratio 0.5
+    python benchmarks/salience.py --chars 500000       # Larger input
+    python benchmarks/salience.py --ratio 0.3 --json   # Keep 30%, JSON output
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from salience import is_available, salient_extract, sentence_vectors, split_sentences, textrank_scores
+from utils import estimate_tokens
+
+
+def synthetic_text(chars: int, punctuated: bool, seed: int = 0) -> str:
+    """Zipf-ish prose (articles) or one unpunctuated run (captions) of about `chars` characters."""
+    rng = random.Random(seed)
+    vocabulary = [f"w{i}" for i in range(5000)]
+    weights = [1.0 / (rank + 1) for rank in range(len(vocabulary))]
+    words, length = [], 0
+    while length < chars:
+        batch = rng.choices(vocabulary, weights, k=rng.randint(8, 30))
+        sentence = " ".join(batch) + ("." if punctuated else "")
+        words.append(sentence)
+        length += len(sentence) + 1
+    if not punctuated:
+        return " ".join(words)
+    paragraphs = [" ".join(words[i:i + 6]) for i in range(0, len(words), 6)]
+    return "\n\n".join(paragraphs)
+
+
+def measure(text: str, ratio: float, runs: int) -> dict:
+    budget = int(estimate_tokens(text) * ratio)
+    timings = {"split_ms": [], "vectorize_ms": [], "textrank_ms": [], "total_ms": []}
+    output = text
+    for _ in range(runs):
+        started = time.perf_counter()
+        sentences, _ = split_sentences(text)
+        split_done = time.perf_counter()
+        vectors = sentence_vectors(sentences)
+        vectors_done = time.perf_counter()
+        textrank_scores(vectors)
+        rank_done = time.perf_counter()
+        output = salient_extract(text, budget)
+        finished = time.perf_counter()
+        timings["split_ms"].append((split_done - started) * 1000)
+        timings["vectorize_ms"].append((vectors_done - split_done) * 1000)
+        timings["textrank_ms"].append((rank_done - vectors_done) * 1000)
+        timings["total_ms"].append((finished - rank_done) * 1000)
+
+    return {
+        "chars": len(text),
+        "sentences": len(split_sentences(text)[0]),
+        **{name: round(statistics.median(values), 1) for name, values in timings.items()},
+        "tokens_in": estimate_tokens(text),
+        "tokens_out": estimate_tokens(output),
+        "tokens_saved_pct": round(100 * (1 - estimate_tokens(output) / estimate_tokens(text)), 1),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark salience pre-compression.")
+    parser.add_argument("--chars", type=int, default=200_000, help="Input size in characters")
+    parser.add_argument("--ratio", type=float, default=0.5, help="Fraction of tokens to keep")
+    parser.add_argument("--runs", type=int, default=3, help="Timed runs (median is reported)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    if not is_available():
+        print("NumPy is not installed — salience pre-compression is unavailable.", file=sys.stderr)
+        return 1
+
+    report = {
+        "article": measure(synthetic_text(args.chars, punctuated=True), args.ratio, args.runs),
+        "transcript": measure(synthetic_text(args.chars, punctuated=False), args.ratio, args.runs),
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"\n{'═' * 60}")
+    print(f"  {'Metric':<20} {'Article':>16} {'Transcript':>16}")
+    print(f"{'═' * 60}")
+    for metric in report["article"]:
+        print(f"  {metric:<20} {report['article'][metric]:>16} {report['transcript'][metric]:>16}")
+    print(f"{'═' * 60}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
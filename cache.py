@@ -0,0 +1,248 @@
+"""
+cache.py — Persistent summary cache for the Omega-Summarizer.
+Stores finished summaries in SQLite so repeated requests for the same
+source skip scraping, transcription and Gemini entirely.
+
+Features:
+- Content-addressed keys: canonical source key + prompt template version + Gemini model
+  + fingerprint of the processing settings that shape the summary
+- LRU eviction bounded by entry count and total size
+- TTL expiry of stale summaries
+- Hit/miss counters for monitoring
+- On-disk TTL cache of the Gemini model discovered via list_models()
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from config import CacheConfig, ProcessingConfig, get_config
+from prompts import PROMPT_TEMPLATE_VERSION
+from utils import is_error_response
+
+
+# ═════════════════════════════════════════════════════════
+#  CACHE KEYS
+# ═════════════════════════════════════════════════════════
+# Settings that change what reaches Gemini (and so the summary); limits such as
+# worker counts or extraction mode only change how fast we get there.
+_FINGERPRINT_FIELDS = (
+    "max_article_length",
+    "chunking_enabled",
+    "chunking_threshold_tokens",
+    "chunk_size_tokens",
+    "max_chunks",
+    "audio_segmentation_enabled",
+    "audio_segment_seconds",
+    "cleanup_enabled",
+    "salience_enabled",
+    "salience_keep_ratio",
+    "salience_min_tokens",
+)
+
+
+def processing_fingerprint(processing: ProcessingConfig | None = None) -> str:
+    """Serialize the processing settings that shape a summary (defaults to the active config)."""
+    processing = processing or get_config().processing
+    return json.dumps({name: getattr(processing, name) for name in _FINGERPRINT_FIELDS}, sort_keys=True)
+
+
+def make_cache_key(source: str, model_name: str, processing: ProcessingConfig | None = None) -> str:
+    """Build the content-addressed key for a source summarized by a given model and settings."""
+    raw = f"{source}\0{PROMPT_TEMPLATE_VERSION}\0{model_name}\0{processing_fingerprint(processing)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+# ═════════════════════════════════════════════════════════
+#  SQLITE-BACKED CACHE
+# ═════════════════════════════════════════════════════════
+class SummaryCache:
+    """
+    SQLite store of finished summaries with LRU/TTL eviction.
+    A single connection is shared by all threads and guarded by a lock.
+    """
+
+    def __init__(self, config: CacheConfig):
+        self.config = config
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(config.path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(config.path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS summaries ("
+            "  key TEXT PRIMARY KEY,"
+            "  source TEXT NOT NULL,"
+            "  summary TEXT NOT NULL,"
+            "  size INTEGER NOT NULL,"
+            "  created_at REAL NOT NULL,"
+            "  accessed_at REAL NOT NULL"
+            ")"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_summaries_accessed ON summaries (accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> str | None:
+        """Return a cached summary, or None on a miss or expired entry."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary, created_at FROM summaries WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            summary, created_at = row
+            if now - created_at > self.config.ttl_seconds:
+                self._conn.execute("DELETE FROM summaries WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE summaries SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+            return summary
+
+    def put(self, key: str, summary: str, source: str = "") -> None:
+        """Store a summary and evict least-recently-used entries over the caps."""
+        if is_error_response(summary):
+            return
+
+        now = time.time()
+        size = len(summary.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summaries "
+                "(key, source, summary, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, source, summary, size, now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then LRU entries until both caps are met."""
+        self._conn.execute(
+            "DELETE FROM summaries WHERE created_at < ?",
+            (now - self.config.ttl_seconds,),
+        )
+
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM summaries"
+        ).fetchone()
+        if count <= self.config.max_entries and total <= self.config.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT key, size FROM summaries ORDER BY accessed_at ASC"
+        ).fetchall()
+        doomed = []
+        for key, size in rows:
+            if count <= self.config.max_entries and total <= self.config.max_bytes:
+                break
+            doomed.append((key,))
+            count -= 1
+            total -= size
+        self._conn.executemany("DELETE FROM summaries WHERE key = ?", doomed)
+
+    def clear(self) -> None:
+        """Remove every cached summary and reset the counters."""
+        with self._lock:
+            self._conn.execute("DELETE FROM summaries")
+            self._conn.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the current size of the store."""
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM summaries"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": count,
+            "size_bytes": total,
+        }
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __repr__(self) -> str:
+        return f"SummaryCache(path={self.config.path!r}, hits={self.hits}, misses={self.misses})"
+
+
+# ═════════════════════════════════════════════════════════
+#  MODEL DISCOVERY CACHE — Skips genai.list_models() on cold start
+# ═════════════════════════════════════════════════════════
+def discovery_fingerprint(api_key: str, priorities: list[str]) -> str:
+    """Identify a discovery result by API key (hashed) and model priority list."""
+    raw = f"{api_key}\0{'|'.join(priorities)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def load_discovered_model(fingerprint: str, config: CacheConfig) -> str | None:
+    """Return the cached model name for this fingerprint, or None if absent or stale."""
+    try:
+        with open(config.model_discovery_path, "r", encoding="utf-8") as f:
+            record = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(record, dict) or record.get("fingerprint") != fingerprint:
+        return None
+    if time.time() - record.get("discovered_at", 0) > config.model_discovery_ttl_seconds:
+        return None
+    return record.get("model") or None
+
+
+def save_discovered_model(fingerprint: str, model_name: str, config: CacheConfig) -> None:
+    """Persist a discovery result atomically; failures are ignored."""
+    record = {"fingerprint": fingerprint, "model": model_name, "discovered_at": time.time()}
+    tmp_path = f"{config.model_discovery_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(config.model_discovery_path) or ".", exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f)
+        os.replace(tmp_path, config.model_discovery_path)
+    except OSError:
+        pass
+
+
+# ═════════════════════════════════════════════════════════
+#  PROCESS-WIDE INSTANCE
+# ═════════════════════════════════════════════════════════
+_cache: SummaryCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_summary_cache() -> SummaryCache | None:
+    """Return the shared summary cache, or None when caching is disabled."""
+    global _cache
+    config = get_config().cache
+    if not config.enabled:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = SummaryCache(config)
+            except sqlite3.Error:
+                return None
+        return _cache
@@ -0,0 +1,141 @@
+"""
+canonical.py — Canonical source keys for the Omega-Summarizer.
+Maps every input to one key, so equivalent inputs share a cache entry and
+a history row and are never summarized twice.
+
+Features:
+- YouTube links (youtu.be, watch?v=…&t=…, m./music., /shorts/, /embed/, /live/) → youtube:<id>
+- Article URLs with tracking parameters, fragments, default ports, `www.`
+  and trailing slashes stripped, and the query sorted → url:<canonical url>
+- Audio payloads keyed by content hash → audio:<sha256>
+- All patterns compiled once at import
+"""
+
+import hashlib
+import os
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from audio import get_audio_handle
+from constants import (
+    YOUTUBE_VIDEO_ID_PATTERNS,
+    YOUTUBE_HOSTS,
+    TRACKING_QUERY_PREFIXES,
+    TRACKING_QUERY_PARAMS,
+)
+
+
+# ═════════════════════════════════════════════════════════
+#  PRECOMPILED PATTERNS
+# ═════════════════════════════════════════════════════════
+# One alternation of every video ID pattern; each alternative has one group
+_VIDEO_ID_PATTERN = re.compile("|".join(YOUTUBE_VIDEO_ID_PATTERNS))
+_REPEATED_SLASHES = re.compile(r"/{2,}")
+
+
+# ═════════════════════════════════════════════════════════
+#  YOUTUBE
+# ═════════════════════════════════════════════════════════
+def _host(url: str) -> str:
+    """Lowercase host of a URL without `www.`, or "" if it cannot be parsed."""
+    try:
+        host = urlsplit(url.strip()).hostname or ""
+    except ValueError:
+        return ""
+    return host[4:] if host.startswith("www.") else host
+
+
+def is_youtube_url(url: str) -> bool:
+    """Determine if a URL points to a YouTube video."""
+    return _host(url) in YOUTUBE_HOSTS
+
+
+def extract_video_id(url: str) -> str | None:
+    """Extract a YouTube video ID from various URL formats."""
+    match = _VIDEO_ID_PATTERN.search(url)
+    return match.group(match.lastindex) if match else None
+
+
+# ═════════════════════════════════════════════════════════
+#  ARTICLE URLS
+# ═════════════════════════════════════════════════════════
+def is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_QUERY_PARAMS or name.startswith(TRACKING_QUERY_PREFIXES)
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize a URL for identity, not fetching: http → https, lowercase host
+    without `www.` or default port, no fragment or tracking parameters,
+    sorted query, and no trailing slash.
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    netloc = host if port in (None, 80, 443) else f"{host}:{port}"
+
+    path = _REPEATED_SLASHES.sub("/", parts.path)
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = urlencode(sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not is_tracking_param(name)
+    ))
+    scheme = "https" if parts.scheme.lower() in ("http", "https") else parts.scheme.lower()
+    return urlunsplit((scheme, netloc, path or "/", query, ""))
+
+
+def canonical_url_key(url: str) -> str | None:
+    """Canonical source key for a URL: youtube:<id> for videos, url:<canonical> otherwise."""
+    url = url.strip()
+    if not url:
+        return None
+    if is_youtube_url(url):
+        video_id = extract_video_id(url)
+        if video_id:
+            return f"youtube:{video_id}"
+    return f"url:{canonicalize_url(url)}"
+
+
+# ═════════════════════════════════════════════════════════
+#  SOURCE IDENTITY — Keys for cache, history and dedup
+# ═════════════════════════════════════════════════════════
+def file_sha256(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Hash a file's bytes without loading it into memory at once."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_identity(tool_name: str, arguments: dict) -> str | None:
+    """
+    Canonical key of the source a tool call will summarize.
+    Returns None when the source cannot be identified (the call is not cached).
+    """
+    try:
+        if tool_name == "youtube_tool":
+            video_id = extract_video_id(arguments.get("url", ""))
+            return f"youtube:{video_id}" if video_id else None
+
+        if tool_name == "article_tool":
+            return canonical_url_key(arguments.get("url", ""))
+
+        if tool_name == "audio_tool":
+            file_path = arguments.get("file_path", "")
+            handle = get_audio_handle(file_path)
+            if handle is not None:
+                return f"audio:{handle.sha256()}"
+            if file_path and os.path.isfile(file_path):
+                return f"audio:{file_sha256(file_path)}"
+    except (OSError, ValueError):
+        return None
+    return None
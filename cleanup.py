@@ -0,0 +1,215 @@
+"""
+cleanup.py — Streaming content cleanup for the Omega-Summarizer.
+Strips markup and page chrome from extracted articles and de-noises
+auto-generated captions before they are sent to Gemini as tokens.
+
+Features:
+- Markdown: image and link markup removed (link text kept), navigation
+  lines, cookie banners, footers and repeated chrome blocks dropped;
+  fenced code and repeated prose lines pass through untouched
+- Captions: [Music]-style tags, filler words, stuttered repeats and the
+  rolling overlap of auto-generated caption lines removed
+- Line-by-line generators, so input is never held twice
+- Per-request report of characters and estimated tokens saved
+"""
+
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+from constants import (
+    CHARS_PER_TOKEN,
+    BOILERPLATE_PATTERNS,
+    BOILERPLATE_MAX_CHARS,
+    BANNER_PATTERNS,
+    BANNER_MAX_CHARS,
+    NAV_MIN_LINKS,
+    CAPTION_FILLER_PATTERNS,
+    CAPTION_DEDUP_WINDOW,
+    CAPTION_MIN_OVERLAP_WORDS,
+)
+
+
+@dataclass
+class CleanupStats:
+    """Characters in and out of one cleanup pass."""
+
+    source: str
+    chars_in: int = 0
+    chars_out: int = 0
+
+    @property
+    def chars_saved(self) -> int:
+        return max(0, self.chars_in - self.chars_out)
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.chars_saved // CHARS_PER_TOKEN
+
+    def describe(self) -> str:
+        percent = 100 * self.chars_saved / self.chars_in if self.chars_in else 0.0
+        return (
+            f"Cleaned {self.source}: removed {self.chars_saved:,} chars "
+            f"(~{self.tokens_saved:,} tokens, {percent:.0f}%)"
+        )
+
+
+# ═════════════════════════════════════════════════════════
+#  PRECOMPILED PATTERNS
+# ═════════════════════════════════════════════════════════
+_IMAGE = re.compile(r"!\[[^\]]*\]\([^)]*\)|<img\b[^>]*>", re.IGNORECASE)
+_LINK = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+_HTML_TAG = re.compile(r"</?[a-zA-Z][^>]*>")
+_NAV_ITEM = re.compile(r"^\s*(?:[-*+]|\d+\.)?\s*\[[^\]]*\]\([^)]*\)\s*$")
+_BOILERPLATE = re.compile("|".join(BOILERPLATE_PATTERNS), re.IGNORECASE)
+_BANNER = re.compile("|".join(BANNER_PATTERNS), re.IGNORECASE)
+_FENCE = re.compile(r"^\s*(```|~~~)")
+_EMPTY_MARKUP = re.compile(r"^[\s*_#>|\-+\[\]()]*$")
+
+_CAPTION_TAG = re.compile(r"\[[^\]]{1,40}\]|♪+")
+_FILLER = re.compile(r"\b(?:" + "|".join(CAPTION_FILLER_PATTERNS) + r")\b[,.]?", re.IGNORECASE)
+_REPEATED_WORD = re.compile(r"\b(\w+)(?:\s+\1\b)+", re.IGNORECASE)
+
+
+# ═════════════════════════════════════════════════════════
+#  ARTICLES (Firecrawl markdown / Trafilatura text)
+# ═════════════════════════════════════════════════════════
+def _is_navigation(line: str) -> bool:
+    """A lone list link, or a line of several links with little other text."""
+    if _NAV_ITEM.match(line):
+        return True
+    links = _LINK.findall(line)
+    if len(links) < NAV_MIN_LINKS:
+        return False
+    visible = len(_LINK.sub(r"\1", line).strip())
+    return visible > 0 and sum(len(text) for text in links) >= 0.6 * visible
+
+
+def _is_boilerplate(line: str, had_link: bool) -> bool:
+    """Cookie banners, footers and share/sign-up banners; headings and long lines are content."""
+    if len(line) > BOILERPLATE_MAX_CHARS or line.startswith("#"):
+        return False
+    if _BOILERPLATE.search(line):
+        return True
+    banner = had_link or not line.endswith((".", "!", "?"))
+    return banner and len(line) <= BANNER_MAX_CHARS and bool(_BANNER.search(line))
+
+
+def _dedupable(block: list[str], linked: bool) -> bool:
+    """Repeated chrome: a multi-line block or a line of link text (not a table)."""
+    if block[0].lstrip().startswith("|"):  # Table rows legitimately repeat
+        return False
+    return len(block) > 1 or linked
+
+
+def _markdown_blocks(lines: Iterable[str]) -> Iterator[tuple[list[str], bool]]:
+    """
+    Group cleaned lines into blank-line separated blocks, yielding (lines, dedupable).
+    Fenced code is passed through verbatim and never deduplicated.
+    """
+    block: list[str] = []
+    linked = False
+    fence = None
+    for raw in lines:
+        if fence is not None:
+            block.append(raw.rstrip())
+            if raw.strip().startswith(fence):
+                yield block, False
+                block, fence = [], None
+            continue
+        opening = _FENCE.match(raw)
+        if opening:
+            if block:
+                yield block, _dedupable(block, linked)
+            block, linked, fence = [raw.rstrip()], False, opening.group(1)
+            continue
+
+        if _is_navigation(raw):
+            continue
+        had_link = bool(_LINK.search(raw))
+        line = _HTML_TAG.sub("", _LINK.sub(r"\1", _IMAGE.sub("", raw))).rstrip()
+        stripped = line.strip()
+
+        if _EMPTY_MARKUP.match(stripped) and not stripped.startswith("|"):
+            if block:
+                yield block, _dedupable(block, linked)
+            block, linked = [], False
+            continue
+        if _is_boilerplate(stripped, had_link):
+            continue
+        block.append(line)
+        linked = linked or had_link
+
+    if block:
+        yield block, fence is None and _dedupable(block, linked)
+
+
+def iter_clean_markdown(lines: Iterable[str]) -> Iterator[str]:
+    """Yield the content lines of extracted markdown, with chrome and markup removed."""
+    seen: set[tuple[str, ...]] = set()
+    first = True
+    for block, dedupable in _markdown_blocks(lines):
+        if dedupable:
+            key = tuple(line.strip().lower() for line in block)
+            if key in seen:
+                continue
+            seen.add(key)
+        if not first:
+            yield ""
+        first = False
+        yield from block
+
+
+def clean_markdown(markdown: str) -> tuple[str, CleanupStats]:
+    """Clean an extracted article and report what was removed."""
+    text = "\n".join(iter_clean_markdown(markdown.splitlines())).strip()
+    return text, CleanupStats("article", len(markdown), len(text))
+
+
+# ═════════════════════════════════════════════════════════
+#  CAPTIONS (YouTube transcripts)
+# ═════════════════════════════════════════════════════════
+def _overlap_length(previous: list[str], current: list[str]) -> int:
+    """Longest run of words that ends `previous` and starts `current`, if long enough to be a roll-over."""
+    for size in range(min(len(previous), len(current)), CAPTION_MIN_OVERLAP_WORDS - 1, -1):
+        if [w.lower() for w in previous[-size:]] == [w.lower() for w in current[:size]]:
+            return size
+    return 0
+
+
+def iter_clean_captions(entries: Iterable[str]) -> Iterator[str]:
+    """Yield de-noised caption lines, skipping repeats and rolled-over text."""
+    recent: deque[str] = deque(maxlen=CAPTION_DEDUP_WINDOW)
+    previous: list[str] = []
+    for entry in entries:
+        text = _CAPTION_TAG.sub(" ", entry.replace("\n", " "))
+        text = _REPEATED_WORD.sub(r"\1", _FILLER.sub("", text))
+        words = text.split()
+        if not words:
+            continue
+
+        normalized = " ".join(words).lower()
+        if normalized in recent:
+            continue
+        recent.append(normalized)
+
+        fresh = words[_overlap_length(previous, words):]
+        previous = words
+        if fresh:
+            yield " ".join(fresh)
+
+
+def clean_captions(entries: Iterable[str]) -> tuple[str, CleanupStats]:
+    """Join caption entries into one cleaned transcript and report what was removed."""
+    stats = CleanupStats("captions")
+
+    def counted() -> Iterator[str]:
+        for entry in entries:
+            stats.chars_in += len(entry) + 1  # Plus the joining space
+            yield entry
+
+    text = " ".join(iter_clean_captions(counted()))
+    stats.chars_in = max(0, stats.chars_in - 1)
+    stats.chars_out = len(text)
+    return text, stats
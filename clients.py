@@ -0,0 +1,280 @@
+"""
+clients.py — Process-wide registry of provider API clients.
+Groq, Gemini and Firecrawl clients are created once per process and shared by
+every session, thread and batch worker, instead of once per request.
+
+Features:
+- One tuned keep-alive httpx pool behind the Groq and Firecrawl clients, so
+  warm requests reuse an open connection and skip TCP/TLS setup entirely
+- AsyncGroq clients get an equally tuned pool per event loop (httpx async
+  clients are bound to the loop they first run on)
+- Gemini is configured once; the SDK keeps its own long-lived channel
+- Thread-safe, lazy creation: importing this module loads no SDKs
+- Pool statistics (requests, connections opened, TLS handshakes, idle
+  connections) for /health and benchmarks
+"""
+
+import asyncio
+import os
+import threading
+import types
+import weakref
+
+from config import ClientPoolConfig, get_config
+from constants import FIRECRAWL_API_URL
+
+
+def _api_key(name: str) -> str | None:
+    """Read an API key, ignoring the .env.example placeholders."""
+    key = os.getenv(name)
+    if not key or key.startswith("your_"):
+        return None
+    return key
+
+
+# ═════════════════════════════════════════════════════════
+#  POOL STATISTICS
+# ═════════════════════════════════════════════════════════
+class PoolStats:
+    """
+    Counters fed by httpx request hooks. Each request also carries an httpcore
+    trace callback, which reports when a new connection (and TLS session) is set up.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+        self._lock = threading.Lock()
+
+    def _record(self, event: str) -> None:
+        with self._lock:
+            if event == "request":
+                self.requests += 1
+            elif event == "connection.connect_tcp.complete":
+                self.connections_opened += 1
+            elif event == "connection.start_tls.complete":
+                self.tls_handshakes += 1
+
+    def on_request(self, request) -> None:
+        self._record("request")
+        request.extensions["trace"] = lambda event, info: self._record(event)
+
+    async def on_request_async(self, request) -> None:
+        self._record("request")
+
+        async def trace(event, info):
+            self._record(event)
+
+        request.extensions["trace"] = trace
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            reused = max(0, self.requests - self.connections_opened)
+            return {
+                "requests": self.requests,
+                "connections_opened": self.connections_opened,
+                "tls_handshakes": self.tls_handshakes,
+                "reused": reused,
+                "reuse_ratio": round(reused / self.requests, 3) if self.requests else None,
+            }
+
+
+# ═════════════════════════════════════════════════════════
+#  FIRECRAWL — Scrape endpoint on the shared pool
+# ═════════════════════════════════════════════════════════
+class FirecrawlClient:
+    """
+    Firecrawl's v2 scrape endpoint called through the shared pool. (The SDK
+    issues every request through a fresh `requests.post`, which never reuses
+    a connection.) HTTP errors raise httpx.HTTPStatusError, whose status code
+    and Retry-After header the retry engine understands.
+    """
+
+    def __init__(self, api_key: str, api_url: str, http, timeout: float):
+        self.api_url = api_url.rstrip("/")
+        self._headers = {"Authorization": f"Bearer {api_key}"}
+        self._http = http
+        self._timeout = timeout
+
+    def scrape(self, url: str, formats: list[str] | None = None):
+        """Scrape one page; returns an object with a `markdown` attribute (None if empty)."""
+        response = self._http.post(
+            f"{self.api_url}/v2/scrape",
+            json={"url": url, "formats": formats or ["markdown"]},
+            headers=self._headers,
+            timeout=self._timeout,
+        )
+        response.raise_for_status()
+        data = response.json().get("data") or {}
+        return types.SimpleNamespace(markdown=data.get("markdown"), metadata=data.get("metadata") or {})
+
+
+# ═════════════════════════════════════════════════════════
+#  CLIENT REGISTRY
+# ═════════════════════════════════════════════════════════
+class ClientRegistry:
+    """
+    Lazily built, shared provider clients. Clients are keyed by API key and
+    base URL, so changing either (e.g. pointing at standin.py) builds a new one.
+    """
+
+    def __init__(self, config: ClientPoolConfig):
+        self.config = config
+        self.sync_stats = PoolStats()
+        self.async_stats = PoolStats()
+        self._http = None
+        self._groq: dict[tuple[str, str], object] = {}
+        self._firecrawl: dict[tuple[str, str], FirecrawlClient] = {}
+        self._async_groq: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = weakref.WeakKeyDictionary()
+        self._gemini: tuple[str, str] | None = None
+        self._lock = threading.Lock()
+
+    def _limits_and_timeout(self):
+        import httpx
+
+        limits = httpx.Limits(
+            max_connections=self.config.max_connections,
+            max_keepalive_connections=self.config.max_keepalive_connections,
+            keepalive_expiry=self.config.keepalive_expiry_seconds,
+        )
+        # Per-call timeouts (Groq's own, Firecrawl's) override the read timeout
+        timeout = httpx.Timeout(60.0, connect=self.config.connect_timeout_seconds)
+        return limits, timeout
+
+    def http(self):
+        """The shared synchronous httpx client (thread-safe)."""
+        with self._lock:
+            if self._http is None:
+                import httpx
+
+                limits, timeout = self._limits_and_timeout()
+                self._http = httpx.Client(
+                    limits=limits,
+                    timeout=timeout,
+                    event_hooks={"request": [self.sync_stats.on_request]},
+                )
+            return self._http
+
+    def groq(self):
+        """The shared Groq client (orchestration and Whisper), or None without a key."""
+        key = _api_key("GROQ_API_KEY")
+        if key is None:
+            return None
+        base_url = get_config().endpoints.groq_base_url
+        http = self.http()
+        with self._lock:
+            client = self._groq.get((key, base_url))
+            if client is None:
+                from groq import Groq
+
+                client = self._groq[(key, base_url)] = Groq(api_key=key, base_url=base_url or None, http_client=http)
+            return client
+
+    def async_groq(self):
+        """The AsyncGroq client for the running event loop, or None without a key."""
+        key = _api_key("GROQ_API_KEY")
+        if key is None:
+            return None
+        base_url = get_config().endpoints.groq_base_url
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._async_groq.setdefault(loop, {})
+            client = clients.get((key, base_url))
+            if client is None:
+                import httpx
+                from groq import AsyncGroq
+
+                limits, timeout = self._limits_and_timeout()
+                http = httpx.AsyncClient(
+                    limits=limits,
+                    timeout=timeout,
+                    event_hooks={"request": [self.async_stats.on_request_async]},
+                )
+                client = clients[(key, base_url)] = AsyncGroq(api_key=key, base_url=base_url or None, http_client=http)
+            return client
+
+    def firecrawl(self) -> FirecrawlClient | None:
+        """The shared Firecrawl client, or None without a key."""
+        key = _api_key("FIRE_CRAWL_KEY")
+        if key is None:
+            return None
+        base_url = get_config().endpoints.firecrawl_base_url or FIRECRAWL_API_URL
+        http = self.http()
+        with self._lock:
+            client = self._firecrawl.get((key, base_url))
+            if client is None:
+                client = self._firecrawl[(key, base_url)] = FirecrawlClient(
+                    key, base_url, http, self.config.firecrawl_timeout_seconds
+                )
+            return client
+
+    def gemini(self):
+        """
+        The `google.generativeai` module, configured once for this process, or
+        None without a key. Re-configuring would drop the SDK's open channel, so
+        it only happens when the key or base URL changes.
+        """
+        key = _api_key("GOOGLE_API_KEY")
+        if key is None:
+            return None
+        import google.generativeai as genai
+
+        base_url = get_config().endpoints.gemini_base_url
+        with self._lock:
+            if self._gemini != (key, base_url):
+                if base_url:
+                    genai.configure(api_key=key, transport="rest", client_options={"api_endpoint": base_url})
+                else:
+                    genai.configure(api_key=key)
+                self._gemini = (key, base_url)
+        return genai
+
+    def stats(self) -> dict:
+        """Connection reuse for the sync and async pools, and the clients built so far."""
+        with self._lock:
+            pool = getattr(getattr(self._http, "_transport", None), "_pool", None)
+            connections = list(getattr(pool, "connections", []))
+            return {
+                "sync": {
+                    **self.sync_stats.snapshot(),
+                    "open": len(connections),
+                    "idle": sum(1 for c in connections if c.is_idle()),
+                },
+                "async": self.async_stats.snapshot(),
+                "limits": {
+                    "max_connections": self.config.max_connections,
+                    "max_keepalive_connections": self.config.max_keepalive_connections,
+                    "keepalive_expiry_seconds": self.config.keepalive_expiry_seconds,
+                },
+                "clients": {
+                    "groq": len(self._groq),
+                    "async_groq": sum(len(c) for c in self._async_groq.values()),
+                    "firecrawl": len(self._firecrawl),
+                    "gemini": ("rest" if self._gemini[1] else "grpc") if self._gemini else None,
+                },
+            }
+
+    def close(self) -> None:
+        """Close the shared sync pool and forget every client."""
+        with self._lock:
+            if self._http is not None:
+                self._http.close()
+            self._http = None
+            self._groq.clear()
+            self._firecrawl.clear()
+            self._async_groq = weakref.WeakKeyDictionary()
+            self._gemini = None
+
+
+_registry: ClientRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_clients() -> ClientRegistry:
+    """Return the process-wide client registry."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ClientRegistry(get_config().clients)
+        return _registry
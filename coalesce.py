@@ -0,0 +1,96 @@
+"""
+coalesce.py — Single-flight coalescing of concurrent identical requests.
+When many sessions ask for the same source at once, only the first caller
+runs the pipeline; the others wait on its in-flight future and receive the
+same result (or the same exception).
+
+Features:
+- Keyed by canonical source (see canonical.source_identity), so URL variants coalesce
+- Sync (threads, Streamlit sessions) and asyncio callers share one registry
+- Nothing is cached: a key is released as soon as its call settles, so a
+  failure is seen by every waiter but the next request starts afresh
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+
+from exceptions import RequestCancelledError
+
+
+class SingleFlight:
+    """Registry of in-flight calls keyed by string."""
+
+    def __init__(self):
+        self._calls: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0    # Calls that ran the work
+        self.followers = 0  # Calls served by another caller's in-flight work
+
+    def _claim(self, key: str) -> tuple[Future, bool]:
+        """Return (future, is_leader) — the caller that creates the future does the work."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.followers += 1
+                return future, False
+            future = self._calls[key] = Future()
+            self.leaders += 1
+            return future, True
+
+    def _settle(self, key: str, future: Future, result=None, error: BaseException | None = None) -> None:
+        # Release the key first: anyone arriving from now on starts a new call
+        with self._lock:
+            self._calls.pop(key, None)
+        if error is None:
+            future.set_result(result)
+        elif isinstance(error, (asyncio.CancelledError, KeyboardInterrupt, SystemExit)):
+            # The leader was interrupted — waiters fail instead of being cancelled themselves
+            future.set_exception(RequestCancelledError("The shared in-flight request"))
+        else:
+            future.set_exception(error)
+
+    def do(self, key: str, func, on_join=None):
+        """
+        Run func() unless a call for `key` is already in flight, in which case
+        wait for that call instead (calling on_join() first, if given).
+        Returns (result, shared); exceptions propagate to every caller.
+        """
+        future, leader = self._claim(key)
+        if not leader:
+            if on_join is not None:
+                on_join()
+            return future.result(), True
+
+        try:
+            result = func()
+        except BaseException as e:
+            self._settle(key, future, error=e)
+            raise
+        self._settle(key, future, result=result)
+        return result, False
+
+    async def do_async(self, key: str, coroutine_func, on_join=None):
+        """Async counterpart of do(): `coroutine_func()` is awaited by the leader only."""
+        future, leader = self._claim(key)
+        if not leader:
+            if on_join is not None:
+                on_join()
+            # shield: a cancelled waiter must not cancel the shared future
+            return await asyncio.shield(asyncio.wrap_future(future)), True
+
+        try:
+            result = await coroutine_func()
+        except BaseException as e:
+            self._settle(key, future, error=e)
+            raise
+        self._settle(key, future, result=result)
+        return result, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"in_flight": len(self._calls), "leaders": self.leaders, "followers": self.followers}
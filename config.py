@@ -11,14 +11,80 @@ from dotenv import load_dotenv
 from constants import (
     DEFAULT_ORCHESTRATOR_MODEL,
     AVAILABLE_ORCHESTRATOR_MODELS,
+    ORCHESTRATION_POLICIES,
+    DEFAULT_ORCHESTRATION_POLICY,
+    STREAM_SUMMARIES,
     MAX_AGENT_ITERATIONS,
     MAX_GROQ_TOKENS,
     MAX_ARTICLE_LENGTH,
     MAX_AUDIO_FILE_SIZE_MB,
+    MAX_AUDIO_INPUT_SIZE_MB,
+    AUDIO_SEGMENT_SECONDS,
+    MAX_TRANSCRIPTION_WORKERS,
+    CHUNKING_THRESHOLD_TOKENS,
+    CHUNK_SIZE_TOKENS,
+    MAX_CHUNK_WORKERS,
+    MAX_CHUNKS_PER_SUMMARY,
+    SALIENCE_KEEP_RATIO,
+    SALIENCE_MIN_TOKENS,
+    EXTRACTION_MODES,
+    DEFAULT_EXTRACTION_MODE,
+    HEDGE_DELAY_SECONDS,
+    MIN_CONTENT_CHARS,
     WHISPER_MODEL,
     APP_VERSION,
+    CACHE_DIRNAME,
+    SUMMARY_CACHE_FILENAME,
+    HISTORY_FILENAME,
+    HISTORY_DB_FILENAME,
+    MAX_SUMMARY_HISTORY_ITEMS,
+    MODEL_DISCOVERY_FILENAME,
+    NEAR_DUPLICATE_FILENAME,
+    DEDUP_JACCARD_THRESHOLD,
+    DEDUP_NUM_PERMUTATIONS,
+    DEDUP_LSH_BANDS,
+    DEDUP_SHINGLE_WORDS,
+    DEDUP_MIN_WORDS,
+    DEDUP_MAX_ENTRIES,
+    MODEL_DISCOVERY_TTL_SECONDS,
+    SUMMARY_CACHE_TTL_SECONDS,
+    SUMMARY_CACHE_MAX_ENTRIES,
+    SUMMARY_CACHE_MAX_BYTES,
+    SERVER_HOST,
+    SERVER_PORT,
+    SERVER_MAX_WORKERS,
+    SERVER_IDLE_TIMEOUT_SECONDS,
+    REQUEST_DEADLINE_SECONDS,
+    RETRY_MAX_DELAY_SECONDS,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_SECONDS,
+    METRICS_HOST,
+    METRICS_PORT,
+    LOG_DIRNAME,
+    JSON_LOG_FILENAME,
+    LOG_LEVEL,
+    LOG_MAX_BYTES,
+    LOG_BACKUP_COUNT,
+    PROVIDER_QUOTAS,
+    RATE_LIMIT_FILENAME,
+    RATE_LIMIT_MAX_WAIT_SECONDS,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    HTTP_CONNECT_TIMEOUT_SECONDS,
+    FIRECRAWL_TIMEOUT_SECONDS,
 )
 
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    """Read a boolean flag from the environment."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.lower() in ("true", "1", "yes")
+
 
 @dataclass
 class APIKeys:
@@ -68,6 +134,8 @@ class ModelConfig:
     whisper_model: str = WHISPER_MODEL
     max_tokens: int = MAX_GROQ_TOKENS
     max_agent_iterations: int = MAX_AGENT_ITERATIONS
+    orchestration_policy: str = DEFAULT_ORCHESTRATION_POLICY
+    stream_summaries: bool = STREAM_SUMMARIES
 
     @property
     def available_models(self) -> list[str]:
@@ -80,6 +148,173 @@ class ProcessingConfig:
 
     max_article_length: int = MAX_ARTICLE_LENGTH
     max_audio_file_size_mb: int = MAX_AUDIO_FILE_SIZE_MB
+    chunking_enabled: bool = True
+    chunking_threshold_tokens: int = CHUNKING_THRESHOLD_TOKENS
+    chunk_size_tokens: int = CHUNK_SIZE_TOKENS
+    max_chunk_workers: int = MAX_CHUNK_WORKERS
+    max_chunks: int = MAX_CHUNKS_PER_SUMMARY
+    extraction_mode: str = DEFAULT_EXTRACTION_MODE
+    hedge_delay_seconds: float = HEDGE_DELAY_SECONDS
+    min_content_chars: int = MIN_CONTENT_CHARS
+    audio_segmentation_enabled: bool = True
+    max_audio_input_size_mb: int = MAX_AUDIO_INPUT_SIZE_MB
+    audio_segment_seconds: int = AUDIO_SEGMENT_SECONDS
+    max_transcription_workers: int = MAX_TRANSCRIPTION_WORKERS
+    cleanup_enabled: bool = True
+    salience_enabled: bool = False
+    salience_keep_ratio: float = SALIENCE_KEEP_RATIO
+    salience_min_tokens: int = SALIENCE_MIN_TOKENS
+    coalescing_enabled: bool = True
+
+
+@dataclass
+class CacheConfig:
+    """Configuration for the persistent summary cache."""
+
+    enabled: bool = True
+    path: str = os.path.join(PROJECT_ROOT, CACHE_DIRNAME, SUMMARY_CACHE_FILENAME)
+    ttl_seconds: int = SUMMARY_CACHE_TTL_SECONDS
+    max_entries: int = SUMMARY_CACHE_MAX_ENTRIES
+    max_bytes: int = SUMMARY_CACHE_MAX_BYTES
+    model_discovery_path: str = os.path.join(PROJECT_ROOT, CACHE_DIRNAME, MODEL_DISCOVERY_FILENAME)
+    model_discovery_ttl_seconds: int = MODEL_DISCOVERY_TTL_SECONDS
+
+
+@dataclass
+class ProviderEndpoints:
+    """
+    Base-URL overrides for the provider APIs (empty = the SDK default).
+    Point these at standin.py to load-test without real quota. Gemini is
+    then reached over its REST transport.
+    """
+
+    gemini_base_url: str = ""
+    groq_base_url: str = ""
+    firecrawl_base_url: str = ""
+
+
+@dataclass
+class ClientPoolConfig:
+    """
+    Configuration for the HTTP connection pool shared by the provider clients.
+    Connections stay open between requests so warm calls skip TCP/TLS setup.
+    """
+
+    max_connections: int = HTTP_MAX_CONNECTIONS
+    max_keepalive_connections: int = HTTP_MAX_KEEPALIVE_CONNECTIONS
+    keepalive_expiry_seconds: float = HTTP_KEEPALIVE_EXPIRY_SECONDS
+    connect_timeout_seconds: float = HTTP_CONNECT_TIMEOUT_SECONDS
+    firecrawl_timeout_seconds: float = FIRECRAWL_TIMEOUT_SECONDS
+
+
+@dataclass
+class RetryConfig:
+    """Configuration for retries, request deadlines and circuit breakers."""
+
+    request_deadline_seconds: float = REQUEST_DEADLINE_SECONDS
+    max_delay_seconds: float = RETRY_MAX_DELAY_SECONDS
+    breaker_failure_threshold: int = BREAKER_FAILURE_THRESHOLD
+    breaker_reset_seconds: float = BREAKER_RESET_SECONDS
+
+
+@dataclass(frozen=True)
+class ProviderQuota:
+    """Per-minute budgets for one provider model (0 = unlimited)."""
+
+    rpm: int
+    tpm: int = 0
+    completion_tokens: int = 0  # Added to each call's prompt estimate for the TPM budget
+
+
+def _default_quotas() -> dict[str, ProviderQuota]:
+    return {key: ProviderQuota(*values) for key, values in PROVIDER_QUOTAS.items()}
+
+
+def parse_quotas(spec: str) -> dict[str, ProviderQuota]:
+    """
+    Parse quota overrides such as "gemini:*=2000/4000000,groq:whisper-large-v3-turbo=20".
+    Each entry is provider:model=rpm[/tpm[/completion_tokens]]; malformed entries are skipped.
+    """
+    quotas = {}
+    for entry in spec.split(","):
+        key, _, values = entry.strip().partition("=")
+        try:
+            numbers = [int(v) for v in values.split("/")]
+        except ValueError:
+            continue
+        if ":" in key and 1 <= len(numbers) <= 3:
+            quotas[key.strip()] = ProviderQuota(*numbers)
+    return quotas
+
+
+@dataclass
+class RateLimitConfig:
+    """
+    Configuration for the host-wide provider rate limiter. Every process that
+    points at the same `path` shares one set of quota buckets.
+    """
+
+    enabled: bool = True
+    path: str = os.path.join(PROJECT_ROOT, CACHE_DIRNAME, RATE_LIMIT_FILENAME)
+    quotas: dict[str, ProviderQuota] = field(default_factory=_default_quotas)
+    max_wait_seconds: float = RATE_LIMIT_MAX_WAIT_SECONDS
+
+
+@dataclass
+class DedupConfig:
+    """Configuration for near-duplicate summary reuse."""
+
+    enabled: bool = True
+    path: str = os.path.join(PROJECT_ROOT, CACHE_DIRNAME, NEAR_DUPLICATE_FILENAME)
+    threshold: float = DEDUP_JACCARD_THRESHOLD
+    num_permutations: int = DEDUP_NUM_PERMUTATIONS
+    bands: int = DEDUP_LSH_BANDS
+    shingle_words: int = DEDUP_SHINGLE_WORDS
+    min_words: int = DEDUP_MIN_WORDS
+    max_entries: int = DEDUP_MAX_ENTRIES
+
+
+@dataclass
+class HistoryConfig:
+    """Configuration for the persistent summary history."""
+
+    path: str = os.path.join(PROJECT_ROOT, HISTORY_DB_FILENAME)
+    legacy_path: str = os.path.join(PROJECT_ROOT, HISTORY_FILENAME)
+    max_items: int = MAX_SUMMARY_HISTORY_ITEMS
+
+
+@dataclass
+class ServerConfig:
+    """Configuration for the headless HTTP service."""
+
+    host: str = SERVER_HOST
+    port: int = SERVER_PORT
+    max_workers: int = SERVER_MAX_WORKERS
+    idle_timeout_seconds: float = SERVER_IDLE_TIMEOUT_SECONDS
+
+
+@dataclass
+class TelemetryConfig:
+    """Configuration for request tracing and the stage metrics endpoint."""
+
+    tracing_enabled: bool = True
+    metrics_host: str = METRICS_HOST
+    metrics_port: int = METRICS_PORT  # 0 = no standalone endpoint (server.py always serves /metrics)
+
+
+@dataclass
+class LoggingConfig:
+    """
+    Configuration for structured logging. With `json_lines`, records are
+    queued on the calling thread and written as JSON lines by a background
+    listener, to a size-rotated file (or stdout when `path` is empty).
+    """
+
+    json_lines: bool = False
+    level: str = LOG_LEVEL
+    path: str = os.path.join(PROJECT_ROOT, LOG_DIRNAME, JSON_LOG_FILENAME)
+    max_bytes: int = LOG_MAX_BYTES
+    backup_count: int = LOG_BACKUP_COUNT
 
 
 @dataclass
@@ -91,7 +326,17 @@ class AppConfig:
 
     api_keys: APIKeys = field(default_factory=APIKeys)
     models: ModelConfig = field(default_factory=ModelConfig)
+    endpoints: ProviderEndpoints = field(default_factory=ProviderEndpoints)
+    clients: ClientPoolConfig = field(default_factory=ClientPoolConfig)
     processing: ProcessingConfig = field(default_factory=ProcessingConfig)
+    cache: CacheConfig = field(default_factory=CacheConfig)
+    dedup: DedupConfig = field(default_factory=DedupConfig)
+    history: HistoryConfig = field(default_factory=HistoryConfig)
+    server: ServerConfig = field(default_factory=ServerConfig)
+    retry: RetryConfig = field(default_factory=RetryConfig)
+    rate_limits: RateLimitConfig = field(default_factory=RateLimitConfig)
+    telemetry: TelemetryConfig = field(default_factory=TelemetryConfig)
+    logging: LoggingConfig = field(default_factory=LoggingConfig)
     version: str = APP_VERSION
     debug: bool = False
 
@@ -105,8 +350,7 @@ class AppConfig:
             load_dotenv(env_path)
         else:
             # Try to load from project root
-            project_root = os.path.dirname(os.path.abspath(__file__))
-            load_dotenv(os.path.join(project_root, ".env"))
+            load_dotenv(os.path.join(PROJECT_ROOT, ".env"))
 
         api_keys = APIKeys(
             google_api_key=os.getenv("GOOGLE_API_KEY", ""),
@@ -114,10 +358,107 @@ class AppConfig:
             firecrawl_api_key=os.getenv("FIRE_CRAWL_KEY", ""),
         )
 
-        debug = os.getenv("OMEGA_DEBUG", "false").lower() in ("true", "1", "yes")
+        debug = _env_flag("OMEGA_DEBUG", False)
+
+        models = ModelConfig(
+            orchestration_policy=os.getenv("OMEGA_ORCHESTRATION_POLICY", DEFAULT_ORCHESTRATION_POLICY).lower(),
+            stream_summaries=_env_flag("OMEGA_STREAM_SUMMARIES", STREAM_SUMMARIES),
+        )
+
+        endpoints = ProviderEndpoints(
+            gemini_base_url=os.getenv("OMEGA_GEMINI_BASE_URL", "").rstrip("/"),
+            groq_base_url=os.getenv("OMEGA_GROQ_BASE_URL", "").rstrip("/"),
+            firecrawl_base_url=os.getenv("OMEGA_FIRECRAWL_BASE_URL", "").rstrip("/"),
+        )
+
+        clients = ClientPoolConfig(
+            max_connections=int(os.getenv("OMEGA_HTTP_MAX_CONNECTIONS", HTTP_MAX_CONNECTIONS)),
+            max_keepalive_connections=int(os.getenv("OMEGA_HTTP_MAX_KEEPALIVE", HTTP_MAX_KEEPALIVE_CONNECTIONS)),
+            keepalive_expiry_seconds=float(os.getenv("OMEGA_HTTP_KEEPALIVE_SECONDS", HTTP_KEEPALIVE_EXPIRY_SECONDS)),
+        )
+
+        processing = ProcessingConfig(
+            chunking_enabled=_env_flag("OMEGA_CHUNKING_ENABLED", True),
+            chunking_threshold_tokens=int(os.getenv("OMEGA_CHUNKING_THRESHOLD_TOKENS", CHUNKING_THRESHOLD_TOKENS)),
+            chunk_size_tokens=int(os.getenv("OMEGA_CHUNK_SIZE_TOKENS", CHUNK_SIZE_TOKENS)),
+            max_chunk_workers=int(os.getenv("OMEGA_MAX_CHUNK_WORKERS", MAX_CHUNK_WORKERS)),
+            max_chunks=int(os.getenv("OMEGA_MAX_CHUNKS", MAX_CHUNKS_PER_SUMMARY)),
+            extraction_mode=os.getenv("OMEGA_EXTRACTION_MODE", DEFAULT_EXTRACTION_MODE).lower(),
+            hedge_delay_seconds=float(os.getenv("OMEGA_HEDGE_DELAY_SECONDS", HEDGE_DELAY_SECONDS)),
+            audio_segmentation_enabled=_env_flag("OMEGA_AUDIO_SEGMENTATION", True),
+            audio_segment_seconds=int(os.getenv("OMEGA_AUDIO_SEGMENT_SECONDS", AUDIO_SEGMENT_SECONDS)),
+            max_transcription_workers=int(os.getenv("OMEGA_TRANSCRIPTION_WORKERS", MAX_TRANSCRIPTION_WORKERS)),
+            cleanup_enabled=_env_flag("OMEGA_CLEANUP_ENABLED", True),
+            salience_enabled=_env_flag("OMEGA_SALIENCE_ENABLED", False),
+            salience_keep_ratio=float(os.getenv("OMEGA_SALIENCE_KEEP_RATIO", SALIENCE_KEEP_RATIO)),
+            salience_min_tokens=int(os.getenv("OMEGA_SALIENCE_MIN_TOKENS", SALIENCE_MIN_TOKENS)),
+            coalescing_enabled=_env_flag("OMEGA_COALESCING_ENABLED", True),
+        )
+
+        cache = CacheConfig(
+            enabled=_env_flag("OMEGA_CACHE_ENABLED", True),
+            path=os.getenv("OMEGA_CACHE_PATH", CacheConfig.path),
+            ttl_seconds=int(os.getenv("OMEGA_CACHE_TTL_SECONDS", SUMMARY_CACHE_TTL_SECONDS)),
+            model_discovery_ttl_seconds=int(os.getenv("OMEGA_MODEL_DISCOVERY_TTL_SECONDS", MODEL_DISCOVERY_TTL_SECONDS)),
+        )
+
+        dedup = DedupConfig(
+            enabled=_env_flag("OMEGA_DEDUP_ENABLED", True),
+            path=os.getenv("OMEGA_DEDUP_PATH", DedupConfig.path),
+            threshold=float(os.getenv("OMEGA_DEDUP_THRESHOLD", DEDUP_JACCARD_THRESHOLD)),
+        )
+
+        history = HistoryConfig(
+            path=os.getenv("OMEGA_HISTORY_PATH", HistoryConfig.path),
+            max_items=int(os.getenv("OMEGA_HISTORY_MAX_ITEMS", MAX_SUMMARY_HISTORY_ITEMS)),
+        )
+
+        server = ServerConfig(
+            host=os.getenv("OMEGA_SERVER_HOST", SERVER_HOST),
+            port=int(os.getenv("OMEGA_SERVER_PORT", SERVER_PORT)),
+            max_workers=int(os.getenv("OMEGA_SERVER_WORKERS", SERVER_MAX_WORKERS)),
+            idle_timeout_seconds=float(os.getenv("OMEGA_SERVER_IDLE_TIMEOUT", SERVER_IDLE_TIMEOUT_SECONDS)),
+        )
+
+        retry = RetryConfig(
+            request_deadline_seconds=float(os.getenv("OMEGA_REQUEST_DEADLINE_SECONDS", REQUEST_DEADLINE_SECONDS)),
+        )
+
+        rate_limits = RateLimitConfig(
+            enabled=_env_flag("OMEGA_RATE_LIMIT_ENABLED", True),
+            path=os.getenv("OMEGA_RATE_LIMIT_PATH", RateLimitConfig.path),
+            quotas={**_default_quotas(), **parse_quotas(os.getenv("OMEGA_RATE_LIMITS", ""))},
+            max_wait_seconds=float(os.getenv("OMEGA_RATE_LIMIT_MAX_WAIT", RATE_LIMIT_MAX_WAIT_SECONDS)),
+        )
+
+        telemetry = TelemetryConfig(
+            tracing_enabled=_env_flag("OMEGA_TRACING_ENABLED", True),
+            metrics_host=os.getenv("OMEGA_METRICS_HOST", METRICS_HOST),
+            metrics_port=int(os.getenv("OMEGA_METRICS_PORT", METRICS_PORT)),
+        )
+
+        logging_config = LoggingConfig(
+            json_lines=_env_flag("OMEGA_JSON_LOGS", False),
+            level=os.getenv("OMEGA_LOG_LEVEL", LOG_LEVEL).upper(),
+            path=os.getenv("OMEGA_LOG_PATH", LoggingConfig.path),
+            max_bytes=int(os.getenv("OMEGA_LOG_MAX_BYTES", LOG_MAX_BYTES)),
+            backup_count=int(os.getenv("OMEGA_LOG_BACKUPS", LOG_BACKUP_COUNT)),
+        )
 
         return cls(
             api_keys=api_keys,
+            models=models,
+            endpoints=endpoints,
+            clients=clients,
+            processing=processing,
+            cache=cache,
+            dedup=dedup,
+            history=history,
+            server=server,
+            retry=retry,
+            rate_limits=rate_limits,
+            telemetry=telemetry,
+            logging=logging_config,
             debug=debug,
         )
 
@@ -143,6 +484,36 @@ class AppConfig:
                 f"Available: {', '.join(AVAILABLE_ORCHESTRATOR_MODELS)}"
             )
 
+        if self.processing.extraction_mode not in EXTRACTION_MODES:
+            warnings.append(
+                f"Unknown extraction mode: {self.processing.extraction_mode}. "
+                f"Available: {', '.join(EXTRACTION_MODES)}"
+            )
+
+        if self.models.orchestration_policy not in ORCHESTRATION_POLICIES:
+            warnings.append(
+                f"Unknown orchestration policy: {self.models.orchestration_policy}. "
+                f"Available: {', '.join(ORCHESTRATION_POLICIES)}"
+            )
+
+        if self.processing.max_chunks < 1:
+            warnings.append(f"Max chunks per summary must be at least 1: {self.processing.max_chunks}")
+
+        if not 0.0 < self.processing.salience_keep_ratio <= 1.0:
+            warnings.append(f"Salience keep ratio must be in (0, 1]: {self.processing.salience_keep_ratio}")
+
+        if not 0.0 < self.dedup.threshold <= 1.0:
+            warnings.append(f"Near-duplicate threshold must be in (0, 1]: {self.dedup.threshold}")
+
+        if self.logging.level not in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"):
+            warnings.append(f"Unknown log level: {self.logging.level}")
+
+        if self.dedup.num_permutations % self.dedup.bands:
+            warnings.append(
+                f"Near-duplicate bands ({self.dedup.bands}) must divide "
+                f"the signature length ({self.dedup.num_permutations})."
+            )
+
         return warnings
 
     def __repr__(self) -> str:
@@ -153,3 +524,17 @@ class AppConfig:
             f"model={self.models.orchestrator_model}, "
             f"api_status={status})"
         )
+
+
+# ═════════════════════════════════════════════════════════
+#  PROCESS-WIDE CONFIGURATION
+# ═════════════════════════════════════════════════════════
+_config: AppConfig | None = None
+
+
+def get_config() -> AppConfig:
+    """Return the process-wide configuration, loading it from the environment on first use."""
+    global _config
+    if _config is None:
+        _config = AppConfig.from_env()
+    return _config
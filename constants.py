@@ -24,15 +24,186 @@ AVAILABLE_ORCHESTRATOR_MODELS = [
     "llama3-70b-8192",
 ]
 
+# How run_agent picks a tool:
+#   rules  — deterministic routing only; ambiguous input is rejected
+#   llm    — always ask the Groq orchestrator
+#   hybrid — deterministic routing, Groq only for ambiguous input
+ORCHESTRATION_POLICIES = ["rules", "llm", "hybrid"]
+DEFAULT_ORCHESTRATION_POLICY = "hybrid"
+STREAM_SUMMARIES = True               # Stream Gemini tokens to the UI as they arrive
+
 # ═════════════════════════════════════════════════════════
 #  CONTENT PROCESSING LIMITS
 # ═════════════════════════════════════════════════════════
-MAX_ARTICLE_LENGTH = 200_000          # Characters before truncation
-MAX_AUDIO_FILE_SIZE_MB = 25           # Groq Whisper's limit
-MAX_SUMMARY_HISTORY_ITEMS = 50        # Max items in sidebar history
+MAX_ARTICLE_LENGTH = 200_000          # Characters before truncation (when chunking is off; see MAX_CHUNKS_PER_SUMMARY)
+MAX_AUDIO_FILE_SIZE_MB = 25           # Groq Whisper's limit per request
+MAX_AUDIO_INPUT_SIZE_MB = 200         # Largest recording accepted with segmentation on
+MAX_SUMMARY_HISTORY_ITEMS = 50        # Entries retained in the history store (<= 0: unlimited)
+HISTORY_PAGE_SIZE = 10                # History titles listed per sidebar page
 SIDEBAR_TITLE_MAX_LENGTH = 25         # Truncate history titles
 URL_DISPLAY_MAX_LENGTH = 30           # Truncate URLs in history
 
+# ═════════════════════════════════════════════════════════
+#  CHUNKED (MAP-REDUCE) SUMMARIZATION
+# ═════════════════════════════════════════════════════════
+CHARS_PER_TOKEN = 4                   # Rough token estimate for prose
+CHUNKING_THRESHOLD_TOKENS = 16_000    # Longer inputs are summarized in chunks
+CHUNK_SIZE_TOKENS = 8_000             # Token budget per chunk
+MAX_CHUNK_WORKERS = 4                 # Concurrent Gemini calls per summary
+MAX_CHUNKS_PER_SUMMARY = 24           # Map-step Gemini calls per pass; longer inputs are fitted first
+
+# ═════════════════════════════════════════════════════════
+#  SALIENCE PRE-COMPRESSION (optional, requires NumPy)
+# ═════════════════════════════════════════════════════════
+SALIENCE_KEEP_RATIO = 0.5             # Fraction of the input's tokens sent to Gemini
+SALIENCE_MIN_TOKENS = 6_000           # Shorter inputs are sent whole
+SALIENCE_HASH_DIM = 2048              # Hashed TF-IDF vector width
+SALIENCE_DAMPING = 0.85               # TextRank damping factor
+SALIENCE_ITERATIONS = 30              # TextRank power iterations (upper bound)
+SALIENCE_TOLERANCE = 1e-6             # Stop iterating once scores change less than this (L1)
+SALIENCE_MAX_SENTENCE_WORDS = 60      # Longer (unpunctuated) runs are split into windows
+
+# ═════════════════════════════════════════════════════════
+#  AUDIO SEGMENTATION (long recordings)
+# ═════════════════════════════════════════════════════════
+AUDIO_SEGMENT_SECONDS = 300           # Target length of one Whisper request
+AUDIO_SEGMENT_MAX_MB = 20             # Segment size cap, safely under the Whisper limit
+AUDIO_SEGMENT_OVERLAP_SECONDS = 2.0   # Audio repeated at each cut, de-duplicated when stitching
+AUDIO_SILENCE_SEARCH_SECONDS = 15.0   # Look back this far from a cut for a quiet spot
+MAX_TRANSCRIPTION_WORKERS = 4         # Concurrent Whisper requests per recording
+AUDIO_HANDLE_SCHEME = "audio://"      # Prefix of in-memory audio references
+AUDIO_SPOOL_THRESHOLD_MB = 32         # Larger in-memory uploads are spooled to disk
+
+# ═════════════════════════════════════════════════════════
+#  RETRY & CIRCUIT BREAKERS
+# ═════════════════════════════════════════════════════════
+REQUEST_DEADLINE_SECONDS = 120        # Overall budget for one tool execution
+RETRY_MAX_DELAY_SECONDS = 20          # Cap for a single backoff sleep
+BREAKER_FAILURE_THRESHOLD = 5         # Consecutive transient failures that trip a breaker
+BREAKER_RESET_SECONDS = 30            # Time a tripped breaker fails fast before a trial call
+PROVIDERS = ["gemini", "groq", "firecrawl", "trafilatura", "youtube"]
+
+# ═════════════════════════════════════════════════════════
+#  PROVIDER CLIENTS (shared keep-alive HTTP pool)
+# ═════════════════════════════════════════════════════════
+HTTP_MAX_CONNECTIONS = 64             # Open connections across all provider hosts
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 32   # Idle connections kept warm for the next request
+HTTP_KEEPALIVE_EXPIRY_SECONDS = 90    # Idle time before a pooled connection is closed
+HTTP_CONNECT_TIMEOUT_SECONDS = 10
+FIRECRAWL_API_URL = "https://api.firecrawl.dev"
+FIRECRAWL_TIMEOUT_SECONDS = 60        # One scrape, including Firecrawl's own page load
+
+# ═════════════════════════════════════════════════════════
+#  PROVIDER QUOTAS (host-wide rate limiting)
+# ═════════════════════════════════════════════════════════
+# "provider:model" (or "provider:*" for any other model) →
+#   (requests per minute, tokens per minute, expected completion tokens per call)
+# 0 disables that budget. Defaults follow the providers' free tiers; raise them
+# with OMEGA_RATE_LIMITS on paid keys, e.g. "gemini:*=2000/4000000".
+PROVIDER_QUOTAS = {
+    "groq:*": (30, 6_000, 256),
+    "groq:llama-3.3-70b-versatile": (30, 12_000, 256),
+    "groq:whisper-large-v3-turbo": (20, 0, 0),
+    "gemini:*": (15, 1_000_000, 1_024),
+}
+RATE_LIMIT_MAX_WAIT_SECONDS = 60      # Longest a call queues for quota before failing
+
+# ═════════════════════════════════════════════════════════
+#  ARTICLE EXTRACTION
+# ═════════════════════════════════════════════════════════
+# sequential — Firecrawl, then Trafilatura on failure
+# hedged     — race Firecrawl and Trafilatura, first good result wins
+#              (lower tail latency, but slow pages are fetched twice — opt in)
+EXTRACTION_MODES = ["sequential", "hedged"]
+DEFAULT_EXTRACTION_MODE = "sequential"
+HEDGE_DELAY_SECONDS = 1.0             # Head start for Firecrawl before Trafilatura starts
+MIN_CONTENT_CHARS = 500               # Extractions shorter than this do not win a race
+EXTRACTION_POOL_WORKERS = 32          # Threads shared by hedged extractors
+
+# ═════════════════════════════════════════════════════════
+#  CONTENT CLEANUP (before summarization)
+# ═════════════════════════════════════════════════════════
+# Lines matching any of these are page chrome, not content (unless long or a heading)
+BOILERPLATE_PATTERNS = [
+    r"\bwe use cookies\b",
+    r"\b(?:site|website) uses cookies\b",
+    r"\bcookie (?:policy|settings|preferences|consent)\b",
+    r"\baccept all cookies\b|^accept all$",
+    r"\ball rights reserved\b",
+    r"(?:©|\(c\))\s*\d{4}",
+    r"\bsubscribe to (?:our|the) newsletter\b",
+    r"\bskip to (?:main )?content\b",
+    r"^advertisement$",
+]
+# Only dropped from banner-like lines: built from links, or short without closing punctuation
+BANNER_PATTERNS = [
+    r"\bprivacy policy\b",
+    r"\bterms of (?:use|service)\b",
+    r"\bsign up\b",
+    r"\bshare (?:this|on)\b",
+    r"\bfollow us\b",
+]
+BOILERPLATE_MAX_CHARS = 200           # Longer lines are kept even if they match
+BANNER_MAX_CHARS = 80                 # Longest line treated as a banner
+NAV_MIN_LINKS = 3                     # Lines with this many links that are mostly link text are navigation
+CAPTION_FILLER_PATTERNS = [r"u+m+", r"u+h+", r"e+r+m+", r"h+m+", r"a+h+"]  # um, uhh, erm, hmm, ahh
+CAPTION_DEDUP_WINDOW = 8              # Caption lines compared against this many previous lines
+CAPTION_MIN_OVERLAP_WORDS = 3         # Shorter line-to-line overlaps are kept ("of the")
+
+# ═════════════════════════════════════════════════════════
+#  BATCH RUNNER
+# ═════════════════════════════════════════════════════════
+BATCH_MAX_WORKERS = 16                # Total items in flight
+BATCH_PROVIDER_LIMITS = {             # Items in flight per tool/provider
+    "article_tool": 8,                # Firecrawl / Trafilatura
+    "youtube_tool": 4,                # YouTube transcript API
+    "audio_tool": 2,                  # Groq Whisper
+}
+
+# ═════════════════════════════════════════════════════════
+#  ASYNC PIPELINE
+# ═════════════════════════════════════════════════════════
+ASYNC_EXECUTOR_WORKERS = 64           # Threads for SDKs without async clients
+
+# ═════════════════════════════════════════════════════════
+#  HTTP SERVICE
+# ═════════════════════════════════════════════════════════
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8000
+SERVER_MAX_WORKERS = 8                # Summaries run concurrently (/health and /metrics never wait)
+SERVER_IDLE_TIMEOUT_SECONDS = 30      # Idle keep-alive connections are closed after this
+SERVER_MAX_BODY_MB = MAX_AUDIO_INPUT_SIZE_MB + 1  # Upload plus multipart overhead
+SERVER_MAX_FIELD_BYTES = 1024 * 1024  # JSON bodies and multipart text fields
+MULTIPART_CHUNK_BYTES = 64 * 1024     # Uploads are streamed to a spooled file in chunks of this size
+
+# ═════════════════════════════════════════════════════════
+#  PROVIDER STAND-IN (local load testing)
+# ═════════════════════════════════════════════════════════
+STANDIN_HOST = "127.0.0.1"
+STANDIN_PORT = 8765
+STANDIN_SUMMARY_CHARS = 1_500         # Gemini response size
+STANDIN_MARKDOWN_CHARS = 20_000       # Firecrawl markdown size
+STANDIN_TRANSCRIPT_CHARS = 20_000     # Whisper transcript size
+STANDIN_STREAM_CHUNKS = 8             # Chunks per streamed response
+STANDIN_RETRY_AFTER_SECONDS = 1       # Retry-After sent with injected 429s
+
+# ═════════════════════════════════════════════════════════
+#  TRACING & METRICS
+# ═════════════════════════════════════════════════════════
+# Stage duration histogram bounds in seconds (provider calls span ms to minutes)
+TRACE_HISTOGRAM_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+TRACE_REQUEST_ID_MAX_LENGTH = 64      # Longer caller-supplied X-Request-ID values are truncated
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = 0                      # Standalone /metrics endpoint; 0 = disabled
+
+# ═════════════════════════════════════════════════════════
+#  STRUCTURED LOGGING (JSON lines)
+# ═════════════════════════════════════════════════════════
+LOG_LEVEL = "INFO"
+LOG_MAX_BYTES = 10 * 1024 * 1024      # Rotate the JSON log beyond this size
+LOG_BACKUP_COUNT = 5                  # Rotated files kept (omega.jsonl.1 … .5)
+LOG_QUEUE_MAX_RECORDS = 10_000        # Records waiting for the writer thread; newer ones are dropped beyond this
+
 # ═════════════════════════════════════════════════════════
 #  WHISPER CONFIGURATION
 # ═════════════════════════════════════════════════════════
@@ -50,6 +221,7 @@ GEMINI_MODEL_PRIORITIES = [
     "gemini-1.0-pro",
 ]
 GEMINI_FALLBACK_MODEL = "gemini-1.5-flash"
+MODEL_DISCOVERY_TTL_SECONDS = 24 * 3600  # Re-run genai.list_models() after this
 
 # ═════════════════════════════════════════════════════════
 #  ERROR PREFIXES (for checking error states)
@@ -60,7 +232,32 @@ WARNING_PREFIX = "⚠️"
 # ═════════════════════════════════════════════════════════
 #  FILE PATHS
 # ═════════════════════════════════════════════════════════
-HISTORY_FILENAME = "summary_history.json"
+HISTORY_FILENAME = "summary_history.json"   # Legacy store, imported once into the database
+HISTORY_DB_FILENAME = "summary_history.db"
+CACHE_DIRNAME = ".omega_cache"
+SUMMARY_CACHE_FILENAME = "summary_cache.db"
+MODEL_DISCOVERY_FILENAME = "gemini_model.json"
+NEAR_DUPLICATE_FILENAME = "near_duplicates.db"
+RATE_LIMIT_FILENAME = "rate_limits.db"
+LOG_DIRNAME = "logs"
+JSON_LOG_FILENAME = "omega.jsonl"
+
+# ═════════════════════════════════════════════════════════
+#  SUMMARY CACHE
+# ═════════════════════════════════════════════════════════
+SUMMARY_CACHE_TTL_SECONDS = 7 * 24 * 3600   # Entries older than this are stale
+SUMMARY_CACHE_MAX_ENTRIES = 5_000           # LRU eviction beyond this count
+SUMMARY_CACHE_MAX_BYTES = 200 * 1024 * 1024 # LRU eviction beyond this size
+
+# ═════════════════════════════════════════════════════════
+#  NEAR-DUPLICATE DETECTION (MinHash + LSH)
+# ═════════════════════════════════════════════════════════
+DEDUP_JACCARD_THRESHOLD = 0.8         # Reuse a summary at or above this estimated similarity
+DEDUP_NUM_PERMUTATIONS = 64           # MinHash signature length (32-bit values)
+DEDUP_LSH_BANDS = 16                  # Bands of NUM_PERMUTATIONS / BANDS rows each
+DEDUP_SHINGLE_WORDS = 5               # Words per shingle
+DEDUP_MIN_WORDS = 50                  # Shorter texts are never fingerprinted
+DEDUP_MAX_ENTRIES = 200_000           # Oldest fingerprints are dropped beyond this count
 
 # ═════════════════════════════════════════════════════════
 #  YOUTUBE URL PATTERNS
@@ -69,5 +266,23 @@ YOUTUBE_VIDEO_ID_PATTERNS = [
     r'(?:v=|/v/|youtu\.be/)([a-zA-Z0-9_-]{11})',
     r'(?:embed/)([a-zA-Z0-9_-]{11})',
     r'(?:shorts/)([a-zA-Z0-9_-]{11})',
+    r'(?:live/)([a-zA-Z0-9_-]{11})',
 ]
 YOUTUBE_VIDEO_ID_LENGTH = 11
+YOUTUBE_HOSTS = frozenset({
+    "youtube.com",
+    "m.youtube.com",
+    "music.youtube.com",
+    "youtube-nocookie.com",
+    "youtu.be",
+})
+
+# ═════════════════════════════════════════════════════════
+#  URL CANONICALIZATION
+# ═════════════════════════════════════════════════════════
+# Query parameters that never change the page content
+TRACKING_QUERY_PREFIXES = ("utm_",)
+TRACKING_QUERY_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid",
+    "mc_cid", "mc_eid", "_ga", "_gl", "ref_src", "spm",
+})
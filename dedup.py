@@ -0,0 +1,251 @@
+"""
+dedup.py — Near-duplicate detection for the Omega-Summarizer.
+Syndicated articles, AMP pages and mirrored posts reach the summarizer under
+different URLs with nearly identical text. Fingerprinting the extracted text
+lets a new source reuse the summary of a near-duplicate instead of paying for
+another Gemini call.
+
+Features:
+- Word-shingle MinHash signatures (one-permutation hashing with densification)
+- Compact array-backed 32-bit signatures stored as SQLite BLOBs
+- LSH banding on an indexed table, so lookups touch a handful of rows
+- Matches scoped by source type, prompt template version and Gemini model
+- Configurable Jaccard threshold and bounded index size
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+
+from config import DedupConfig, get_config
+from prompts import PROMPT_TEMPLATE_VERSION
+
+
+# ═════════════════════════════════════════════════════════
+#  MINHASH SIGNATURES
+# ═════════════════════════════════════════════════════════
+_WORD_PATTERN = re.compile(r"\w+")
+_EMPTY_BIN = 0xFFFFFFFF
+_DENSIFY_STEP = 0x9E3779B1  # Odd constant separating values borrowed from a distance
+
+
+def _hash64(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+def shingle_hashes(text: str, shingle_words: int) -> set[int]:
+    """Hash every run of `shingle_words` consecutive words (case-insensitive)."""
+    words = _WORD_PATTERN.findall(text.lower())
+    if len(words) < shingle_words:
+        return {_hash64(" ".join(words).encode("utf-8"))} if words else set()
+    return {
+        _hash64(" ".join(words[i:i + shingle_words]).encode("utf-8"))
+        for i in range(len(words) - shingle_words + 1)
+    }
+
+
+def minhash_signature(shingles: set[int], num_permutations: int) -> array:
+    """
+    One-permutation MinHash: each shingle hash picks a bin with its low bits and
+    competes for that bin's minimum with its high 32 bits. Empty bins borrow
+    from the next filled bin so short texts still yield comparable signatures.
+    """
+    bins = array("I", [_EMPTY_BIN]) * num_permutations
+    for h in shingles:
+        index = h % num_permutations
+        value = h >> 32
+        if value < bins[index]:
+            bins[index] = value
+
+    filled = [i for i in range(num_permutations) if bins[i] != _EMPTY_BIN]
+    if filled and len(filled) < num_permutations:
+        dense = array("I", bins)
+        for i in range(num_permutations):
+            if bins[i] == _EMPTY_BIN:
+                distance = next(d for d in range(1, num_permutations) if bins[(i + d) % num_permutations] != _EMPTY_BIN)
+                dense[i] = (bins[(i + distance) % num_permutations] + distance * _DENSIFY_STEP) & 0xFFFFFFFF
+        bins = dense
+    return bins
+
+
+def estimate_jaccard(a: array, b: array) -> float:
+    """Estimate the Jaccard similarity of two texts from their signatures."""
+    return sum(x == y for x, y in zip(a, b)) / len(a) if len(a) else 0.0
+
+
+def dedup_scope(source_type: str, model_name: str) -> str:
+    """Summaries are only reused for the same prompt (source type + template) and model."""
+    return f"{source_type}\0{PROMPT_TEMPLATE_VERSION}\0{model_name}"
+
+
+@dataclass(frozen=True)
+class NearDuplicate:
+    """A previously summarized text similar enough to reuse."""
+
+    entry_id: int
+    similarity: float
+    summary: str
+
+
+# ═════════════════════════════════════════════════════════
+#  SQLITE-BACKED LSH INDEX
+# ═════════════════════════════════════════════════════════
+class NearDuplicateIndex:
+    """
+    MinHash/LSH index of summarized texts.
+    A signature is split into bands; texts sharing any band are candidates,
+    and candidates are verified against the full signature before reuse.
+    A single connection is shared by all threads and guarded by a lock.
+    """
+
+    def __init__(self, config: DedupConfig):
+        if config.bands <= 0 or config.num_permutations % config.bands:
+            raise ValueError("bands must evenly divide num_permutations")
+        self.config = config
+        self.rows_per_band = config.num_permutations // config.bands
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(config.path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(config.path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprints ("
+            "  id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            "  scope TEXT NOT NULL,"
+            "  signature BLOB NOT NULL,"
+            "  summary TEXT NOT NULL,"
+            "  created_at REAL NOT NULL"
+            ")"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS bands ("
+            "  band_key INTEGER NOT NULL,"
+            "  entry_id INTEGER NOT NULL,"
+            "  PRIMARY KEY (band_key, entry_id)"
+            ") WITHOUT ROWID"
+        )
+        self._conn.commit()
+
+    def signature(self, text: str) -> array | None:
+        """Fingerprint a text, or None if it is too short to compare reliably."""
+        if len(_WORD_PATTERN.findall(text)) < self.config.min_words:
+            return None
+        return minhash_signature(
+            shingle_hashes(text, self.config.shingle_words), self.config.num_permutations
+        )
+
+    def band_keys(self, signature: array, scope: str) -> list[int]:
+        """Hash each band (with its position and the scope) into a signed 64-bit key."""
+        prefix = hashlib.blake2b(scope.encode("utf-8"), digest_size=8).digest()
+        rows = self.rows_per_band
+        keys = []
+        for band in range(self.config.bands):
+            chunk = signature[band * rows:(band + 1) * rows].tobytes()
+            digest = hashlib.blake2b(prefix + band.to_bytes(2, "little") + chunk, digest_size=8).digest()
+            keys.append(int.from_bytes(digest, "little", signed=True))
+        return keys
+
+    def lookup(self, signature: array, scope: str) -> NearDuplicate | None:
+        """Return the most similar indexed text at or above the threshold, if any."""
+        keys = self.band_keys(signature, scope)
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, signature, summary FROM fingerprints WHERE id IN "
+                f"(SELECT entry_id FROM bands WHERE band_key IN ({placeholders})) AND scope = ?",
+                (*keys, scope),
+            ).fetchall()
+
+        best = None
+        for entry_id, blob, summary in rows:
+            similarity = estimate_jaccard(signature, array("I", blob))
+            if similarity >= self.config.threshold and (best is None or similarity > best.similarity):
+                best = NearDuplicate(entry_id, similarity, summary)
+
+        if best is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return best
+
+    def add(self, signature: array, scope: str, summary: str) -> int:
+        """Index a summarized text and drop the oldest entries beyond the cap."""
+        keys = self.band_keys(signature, scope)
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO fingerprints (scope, signature, summary, created_at) VALUES (?, ?, ?, ?)",
+                (scope, signature.tobytes(), summary, time.time()),
+            )
+            entry_id = cursor.lastrowid
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO bands (band_key, entry_id) VALUES (?, ?)",
+                [(key, entry_id) for key in keys],
+            )
+            self._evict()
+            self._conn.commit()
+            return entry_id
+
+    def _evict(self) -> None:
+        """Trim to max_entries once the index has grown 10% past it."""
+        limit = self.config.max_entries
+        count = self._conn.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+        if count <= limit + max(1, limit // 10):
+            return
+        cutoff = self._conn.execute(
+            "SELECT id FROM fingerprints ORDER BY id DESC LIMIT 1 OFFSET ?", (limit,)
+        ).fetchone()[0]
+        self._conn.execute("DELETE FROM fingerprints WHERE id <= ?", (cutoff,))
+        self._conn.execute("DELETE FROM bands WHERE entry_id <= ?", (cutoff,))
+
+    def clear(self) -> None:
+        """Remove every fingerprint and reset the counters."""
+        with self._lock:
+            self._conn.execute("DELETE FROM fingerprints")
+            self._conn.execute("DELETE FROM bands")
+            self._conn.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the number of indexed texts."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __repr__(self) -> str:
+        return f"NearDuplicateIndex(path={self.config.path!r}, threshold={self.config.threshold})"
+
+
+# ═════════════════════════════════════════════════════════
+#  PROCESS-WIDE INSTANCE
+# ═════════════════════════════════════════════════════════
+_index: NearDuplicateIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_near_duplicate_index() -> NearDuplicateIndex | None:
+    """Return the shared near-duplicate index, or None when dedup is disabled."""
+    global _index
+    config = get_config().dedup
+    if not config.enabled:
+        return None
+    with _index_lock:
+        if _index is None:
+            try:
+                _index = NearDuplicateIndex(config)
+            except (sqlite3.Error, ValueError):
+                return None
+        return _index
@@ -60,6 +60,32 @@ class RateLimitError(APICallError):
         self.retry_after = retry_after
 
 
+class CircuitOpenError(OmegaSummarizerError):
+    """Raised without calling a provider whose circuit breaker is tripped."""
+
+    def __init__(self, service_name: str, retry_in: float):
+        super().__init__(
+            message=f"{service_name} circuit is open; next trial in {retry_in:.0f}s.",
+            user_message=(
+                f"**{service_name}** is temporarily unavailable after repeated failures. "
+                f"Please try again in about {max(1, round(retry_in))} seconds."
+            ),
+        )
+        self.service_name = service_name
+        self.retry_in = retry_in
+
+
+class DeadlineExceededError(OmegaSummarizerError):
+    """Raised when a request runs out of its overall time budget."""
+
+    def __init__(self, service_name: str):
+        super().__init__(
+            message=f"Request deadline exceeded while calling {service_name}.",
+            user_message=f"The request ran out of time while waiting for **{service_name}**. Please try again.",
+        )
+        self.service_name = service_name
+
+
 # ═════════════════════════════════════════════════════════
 #  CONTENT EXTRACTION ERRORS
 # ═════════════════════════════════════════════════════════
@@ -180,6 +206,17 @@ class SummarizationError(OmegaSummarizerError):
         )
 
 
+class RequestCancelledError(OmegaSummarizerError):
+    """Raised inside work that was abandoned, e.g. the losing side of a hedged request."""
+
+    def __init__(self, operation: str):
+        super().__init__(
+            message=f"{operation} was cancelled.",
+            user_message=f"{operation} was cancelled.",
+        )
+        self.operation = operation
+
+
 class AgentLoopError(OmegaSummarizerError):
     """Raised when the agent loop exceeds max iterations."""
 
@@ -2,15 +2,25 @@
 logger.py — Structured logging for the Omega-Summarizer.
 Provides both console logging and in-app execution log tracking
 with configurable log levels and formatted output.
+
+With `OMEGA_JSON_LOGS` enabled, records are instead handed to a queue on the
+calling thread and written as JSON lines (size-rotated) by a listener thread,
+so a log call on the request path never waits on I/O.
 """
 
+import atexit
+import json
 import logging
 import os
+import queue
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from typing import Literal
 
-from constants import APP_NAME
+from config import LoggingConfig, get_config
+from constants import APP_NAME, LOG_QUEUE_MAX_RECORDS
+from tracing import current_request_id
 
 
 # ═════════════════════════════════════════════════════════
@@ -25,6 +35,7 @@ def setup_logger(
     """
     Create and configure a logger with formatted console output.
     Optionally writes to a rotating log file.
+    Switches to queued JSON lines when `config.logging.json_lines` is set.
     """
     logger = logging.getLogger(name)
 
@@ -32,6 +43,11 @@ def setup_logger(
     if logger.handlers:
         return logger
 
+    settings = get_config().logging
+    if settings.json_lines:
+        setup_json_logging(logger, settings)
+        return logger
+
     logger.setLevel(level)
 
     # Console handler with colored-style formatting
@@ -70,6 +86,137 @@ def setup_logger(
     return logger
 
 
+# ═════════════════════════════════════════════════════════
+#  JSON LINES — Queue-backed, written off the request thread
+# ═════════════════════════════════════════════════════════
+class JsonLineFormatter(logging.Formatter):
+    """One JSON object per record: ts, level, logger, msg, request_id and any structured fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            payload["request_id"] = request_id
+        payload.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class ContextQueueHandler(QueueHandler):
+    """
+    QueueHandler that does the minimum on the caller's thread: capture the
+    request ID (a ContextVar, so it cannot be read later) and enqueue.
+    Formatting and I/O happen on the listener thread. When the queue is full
+    the record is dropped and counted rather than blocking the request.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if not hasattr(record, "request_id"):
+            record.request_id = current_request_id()
+        # Freeze the message now: args may be mutated after the call returns
+        if record.args:
+            record.msg, record.args = record.getMessage(), None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JsonLogListener(QueueListener):
+    """QueueListener whose stop signal waits for room instead of failing on a full queue."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+_listener: QueueListener | None = None
+_queue_handler: ContextQueueHandler | None = None
+_json_logger: logging.Logger | None = None
+
+
+def setup_json_logging(logger: logging.Logger, settings: LoggingConfig) -> QueueListener:
+    """
+    Attach a ContextQueueHandler to `logger` and start the listener that
+    writes JSON lines to a RotatingFileHandler (stdout if no path is set).
+    """
+    global _listener, _queue_handler, _json_logger
+    if settings.path:
+        os.makedirs(os.path.dirname(os.path.abspath(settings.path)), exist_ok=True)
+        target = RotatingFileHandler(
+            settings.path,
+            maxBytes=settings.max_bytes,
+            backupCount=settings.backup_count,
+            encoding="utf-8",
+        )
+    else:
+        target = logging.StreamHandler(sys.stdout)
+    target.setFormatter(JsonLineFormatter())
+
+    _queue_handler = ContextQueueHandler(queue.Queue(maxsize=LOG_QUEUE_MAX_RECORDS))
+    logger.addHandler(_queue_handler)
+    logger.setLevel(settings.level)
+    logger.propagate = False
+
+    _json_logger = logger
+    _listener = JsonLogListener(_queue_handler.queue, target)
+    _listener.start()
+    atexit.register(shutdown_json_logging)
+    return _listener
+
+
+def shutdown_json_logging() -> None:
+    """Flush queued records, stop the listener and detach its handler."""
+    global _listener, _queue_handler, _json_logger
+    if _listener is None:
+        return
+    _listener.stop()  # Drains the queue before returning
+    for handler in _listener.handlers:
+        handler.close()
+    _json_logger.removeHandler(_queue_handler)
+    _listener = _queue_handler = _json_logger = None
+
+
+def json_logging_active() -> bool:
+    return _listener is not None
+
+
+def dropped_records() -> int:
+    """Records discarded because the JSON log queue was full."""
+    return _queue_handler.dropped if _queue_handler else 0
+
+
+_events = logging.getLogger(f"{APP_NAME}.events")
+
+
+def log_event(entry: dict) -> None:
+    """
+    Mirror an execution log entry (see omega_summarizer.utils.add_log) into the
+    JSON log, keeping its tool, status, request ID and any stage timing as fields.
+    A no-op unless JSON logging is active, so the console logger stays quiet.
+    """
+    if _listener is None:
+        return  # Checked first: this is called for every execution log entry
+    level = logging.ERROR if entry.get("status") == "error" else logging.INFO
+    if not _events.isEnabledFor(level):
+        return
+    fields = {key: value for key, value in entry.items() if key not in ("time", "message")}
+    request_id = fields.pop("request_id", None) or current_request_id()
+    _events.log(level, entry.get("message", ""), extra={"fields": fields, "request_id": request_id})
+
+
 # ═════════════════════════════════════════════════════════
 #  IN-APP EXECUTION LOG (for Streamlit UI)
 # ═════════════════════════════════════════════════════════
@@ -2,27 +2,98 @@
 agent.py — Groq-powered Agentic orchestration.
 """
 
-import os
 import json
-from groq import Groq
+import tools
 from prompts import SYSTEM_PROMPT, TOOL_DEFINITIONS
 from tools import execute_tool
+from async_tools import execute_tool_async, get_async_groq_client
+from config import get_config
+from retry import retry_with_backoff, async_retry_with_backoff
+from tracing import span, traced
+from utils import estimate_tokens
+from .router import route_input
 from .utils import add_log
 
-def run_agent(user_input: str, model: str):
+@traced("route")
+def plan_route(user_input: str, policy: str) -> tuple[tuple[str, dict] | None, str | None]:
+    """
+    Fast path for the `rules` and `hybrid` policies.
+    Returns (route, rejection): `route` is the (tool_name, arguments) picked by the
+    deterministic router, `rejection` an error message when `rules` finds no tool.
+    Both are None when the orchestrator is still needed.
+    """
+    route = route_input(user_input)
+    if route is None:
+        if policy == "rules":
+            add_log("router", "Input is ambiguous — no tool matched", "error")
+            return None, "❌ Could not determine how to process this input. Please provide a single URL or an audio file."
+        add_log("router", "Input is ambiguous — deferring to Groq", "working")
+        return None, None
+
+    tool_name, tool_args = route
+    add_log("router", f"Routed to {tool_name} without orchestration", "success")
+    add_log(tool_name, f"Executing with args: {tool_args}", "working")
+    return route, None
+
+
+def log_tool_result(tool_name: str, result: str) -> None:
+    """Record a routed tool's outcome in the execution log."""
+    if result.startswith("❌"):
+        add_log(tool_name, "Failed", "error")
+    else:
+        add_log(tool_name, "Completed ✓", "success")
+
+
+def parse_tool_arguments(tool_call) -> dict:
+    """Decode the JSON arguments of a Groq tool call."""
+    try:
+        return json.loads(tool_call.function.arguments)
+    except json.JSONDecodeError:
+        return {}
+
+
+# The tool schemas are sent with every orchestration call
+TOOL_DEFINITION_TOKENS = estimate_tokens(json.dumps(TOOL_DEFINITIONS))
+
+
+def orchestration_quota(model: str, messages: list) -> tuple[str, int]:
+    """The `quota` argument of retry_with_backoff for one Groq orchestration call."""
+    return model, TOOL_DEFINITION_TOKENS + sum(estimate_tokens(str(message)) for message in messages)
+
+
+def tool_feedback(tool_result: str) -> str:
+    """Build the SHORT tool message sent back to Groq instead of the full summary."""
+    if tool_result.startswith("❌"):
+        return tool_result[:500]
+    return "[Tool completed successfully. The summary has been generated and will be displayed to the user. Just confirm completion in your response.]"
+
+
+@traced("request", root=True)
+def run_agent(user_input: str, model: str, policy: str | None = None):
     """
     Orchestrates the agentic flow:
-    1. Sends user input to Groq with tool definitions.
-    2. Groq decides which tool to call.
-    3. Tool executes — the FULL result is stored for the user.
-    4. A SHORT confirmation is sent back to Groq.
-    5. Groq produces a brief final response (or we use the tool result directly).
+    1. Under the `rules`/`hybrid` policies, unambiguous input goes straight to its tool.
+    2. Otherwise sends user input to Groq with tool definitions.
+    3. Groq decides which tool to call.
+    4. Tool executes — the FULL result is stored for the user.
+    5. Under `hybrid`, a successful result is returned immediately; under `llm`,
+       a SHORT confirmation is sent back to Groq for a brief final response.
     """
-    groq_key = os.getenv("GROQ_API_KEY")
-    if not groq_key or groq_key.startswith("your_"):
+    policy = policy or get_config().models.orchestration_policy
+    if policy != "llm":
+        route, rejection = plan_route(user_input, policy)
+        if rejection:
+            return rejection
+        if route:
+            result = execute_tool(*route)
+            log_tool_result(route[0], result)
+            return result
+
+    # Shared with Whisper: one long-lived client and connection pool per process
+    client = tools.groq_client
+    if client is None:
         return "❌ **GROQ_API_KEY** is not set. Please add it to your `.env` file."
 
-    client = Groq(api_key=groq_key)
     messages = [
         {"role": "system", "content": SYSTEM_PROMPT},
         {"role": "user", "content": user_input},
@@ -36,13 +107,19 @@ def run_agent(user_input: str, model: str):
 
     for iteration in range(max_iterations):
         try:
-            response = client.chat.completions.create(
-                model=model,
-                messages=messages,
-                tools=TOOL_DEFINITIONS,
-                tool_choice="auto",
-                max_tokens=4096,
-            )
+            with span("orchestrate", model=model):
+                response = retry_with_backoff(
+                    lambda: client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        tools=TOOL_DEFINITIONS,
+                        tool_choice="auto",
+                        max_tokens=4096,
+                    ),
+                    max_retries=1,
+                    provider="groq",
+                    quota=orchestration_quota(model, messages),
+                )
         except Exception as e:
             error_msg = str(e)
             add_log("agent", f"Groq API error: {error_msg}", "error")
@@ -60,10 +137,7 @@ def run_agent(user_input: str, model: str):
 
             for tool_call in choice.message.tool_calls:
                 tool_name = tool_call.function.name
-                try:
-                    tool_args = json.loads(tool_call.function.arguments)
-                except json.JSONDecodeError:
-                    tool_args = {}
+                tool_args = parse_tool_arguments(tool_call)
 
                 add_log(tool_name, f"Executing with args: {tool_args}", "working")
 
@@ -73,16 +147,16 @@ def run_agent(user_input: str, model: str):
 
                 add_log(tool_name, "Completed ✓", "success")
 
-                # Send only a SHORT confirmation back to Groq
-                if tool_result.startswith("❌"):
-                    truncated = tool_result[:500]
-                else:
-                    truncated = "[Tool completed successfully. The summary has been generated and will be displayed to the user. Just confirm completion in your response.]"
+                # Skip the confirmation round trip once the tool has succeeded
+                if policy != "llm" and not tool_result.startswith("❌"):
+                    add_log("agent", "Final response ready ✓", "success")
+                    return tool_result
 
+                # Send only a SHORT confirmation back to Groq
                 messages.append({
                     "role": "tool",
                     "tool_call_id": tool_call.id,
-                    "content": truncated,
+                    "content": tool_feedback(tool_result),
                 })
 
         # ── If Groq returns a final response ──
@@ -107,3 +181,99 @@ def run_agent(user_input: str, model: str):
 
     add_log("agent", "Max iterations reached", "error")
     return "❌ Agent loop hit the safety limit. Please try again."
+
+
+@traced("request", root=True)
+async def run_agent_async(user_input: str, model: str, policy: str | None = None):
+    """
+    Async counterpart of run_agent, using AsyncGroq for orchestration and
+    execute_tool_async for the tools. Follows the same policy rules.
+    """
+    policy = policy or get_config().models.orchestration_policy
+    if policy != "llm":
+        route, rejection = plan_route(user_input, policy)
+        if rejection:
+            return rejection
+        if route:
+            result = await execute_tool_async(*route)
+            log_tool_result(route[0], result)
+            return result
+
+    client = get_async_groq_client()
+    if client is None:
+        return "❌ **GROQ_API_KEY** is not set. Please add it to your `.env` file."
+
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_input},
+    ]
+
+    add_log("agent", "Starting Groq orchestration…", "working")
+    last_tool_result = None
+    max_iterations = 3
+
+    for iteration in range(max_iterations):
+        try:
+            with span("orchestrate", model=model):
+                response = await async_retry_with_backoff(
+                    lambda: client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        tools=TOOL_DEFINITIONS,
+                        tool_choice="auto",
+                        max_tokens=4096,
+                    ),
+                    max_retries=1,
+                    provider="groq",
+                    quota=orchestration_quota(model, messages),
+                )
+        except Exception as e:
+            error_msg = str(e)
+            add_log("agent", f"Groq API error: {error_msg}", "error")
+            if last_tool_result and not last_tool_result.startswith("❌"):
+                add_log("agent", "Using cached tool result ✓", "success")
+                return last_tool_result
+            return f"❌ Groq API call failed: {error_msg}"
+
+        choice = response.choices[0]
+
+        if choice.finish_reason == "tool_calls" and choice.message.tool_calls:
+            messages.append(choice.message)
+
+            for tool_call in choice.message.tool_calls:
+                tool_name = tool_call.function.name
+                tool_args = parse_tool_arguments(tool_call)
+
+                add_log(tool_name, f"Executing with args: {tool_args}", "working")
+                tool_result = await execute_tool_async(tool_name, tool_args)
+                last_tool_result = tool_result
+                add_log(tool_name, "Completed ✓", "success")
+
+                if policy != "llm" and not tool_result.startswith("❌"):
+                    add_log("agent", "Final response ready ✓", "success")
+                    return tool_result
+
+                messages.append({
+                    "role": "tool",
+                    "tool_call_id": tool_call.id,
+                    "content": tool_feedback(tool_result),
+                })
+
+        elif choice.finish_reason == "stop":
+            add_log("agent", "Final response ready ✓", "success")
+            if last_tool_result and not last_tool_result.startswith("❌"):
+                return last_tool_result
+            return choice.message.content or last_tool_result or "❌ No response generated."
+
+        else:
+            add_log("agent", f"Unexpected finish_reason: {choice.finish_reason}", "error")
+            if last_tool_result and not last_tool_result.startswith("❌"):
+                return last_tool_result
+            return choice.message.content or "❌ Unexpected response from the orchestrator."
+
+    if last_tool_result and not last_tool_result.startswith("❌"):
+        add_log("agent", "Returning cached tool result ✓", "success")
+        return last_tool_result
+
+    add_log("agent", "Max iterations reached", "error")
+    return "❌ Agent loop hit the safety limit. Please try again."
@@ -208,6 +208,25 @@ CUSTOM_CSS = """
         box-shadow: 0 10px 30px rgba(0,0,0,0.3);
     }
 
+    /* ── Stage Timings (execution log) ──────── */
+    .stage-timings {
+        margin-top: 0.75rem;
+        font-family: var(--font-mono) !important;
+        font-size: 0.8rem;
+    }
+    .stage-row {
+        display: flex;
+        align-items: center;
+        gap: 0.75rem;
+        padding: 2px 0;
+        color: var(--text-secondary);
+    }
+    .stage-name { width: 11rem; white-space: nowrap; overflow: hidden; }
+    .stage-track { flex: 1; position: relative; height: 6px; background: rgba(255,255,255,0.04); }
+    .stage-bar { position: absolute; top: 0; height: 6px; background: var(--accent); border-radius: 2px; }
+    .stage-bar.stage-error { background: #FF4B4B; }
+    .stage-ms { width: 6rem; text-align: right; color: var(--text-primary); }
+
     /* ── Status Badges ─────────────────────── */
     .status-badge {
         background-color: rgba(255,255,255,0.03) !important;
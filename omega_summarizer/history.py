@@ -0,0 +1,264 @@
+"""
+history.py — Persistent summary history for the Omega-Summarizer.
+Replaces the rewrite-the-whole-file summary_history.json with an
+append-only SQLite store.
+
+Features:
+- O(1) appends: each summary is a single INSERT, never a full rewrite
+- Retention bounded by entry count, enforced in the same transaction
+- One entry per canonical source key: re-summarizing a source moves it to the top
+- WAL journaling so concurrent sessions and processes can write safely
+- Paginated title listing that never loads summary bodies
+- FTS5 full-text search over titles and bodies (LIKE fallback without FTS5)
+- One-time import of a legacy summary_history.json
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+
+from config import HistoryConfig, get_config
+
+
+@dataclass(frozen=True)
+class HistoryEntry:
+    """A history row without its summary body."""
+
+    id: int
+    title: str
+    created_at: float
+
+
+# ═════════════════════════════════════════════════════════
+#  SEARCH QUERIES
+# ═════════════════════════════════════════════════════════
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def search_terms(query: str) -> list[str]:
+    """Split free text into search words, dropping FTS5 operators and punctuation."""
+    return _WORD_PATTERN.findall(query or "")
+
+
+def fts_query(terms: list[str]) -> str:
+    """Build an FTS5 MATCH expression requiring every term as a prefix."""
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _like_clause(terms: list[str]) -> tuple[str, list[str]]:
+    """Fallback WHERE clause for SQLite builds without FTS5."""
+    clause = " AND ".join("(title LIKE ? OR summary LIKE ?)" for _ in terms)
+    params = [f"%{term}%" for term in terms for _ in range(2)]
+    return clause, params
+
+
+# ═════════════════════════════════════════════════════════
+#  SQLITE-BACKED HISTORY
+# ═════════════════════════════════════════════════════════
+class HistoryStore:
+    """
+    SQLite store of past summaries, newest first.
+    A single connection is shared by all threads and guarded by a lock;
+    other processes are serialised by SQLite's own WAL locking.
+    """
+
+    def __init__(self, config: HistoryConfig):
+        self.config = config
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(config.path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(config.path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS history ("
+            "  id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            "  title TEXT NOT NULL,"
+            "  summary TEXT NOT NULL,"
+            "  source TEXT NOT NULL DEFAULT '',"
+            "  created_at REAL NOT NULL"
+            ")"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_history_source ON history (source)")
+        self._conn.commit()
+        self.fts_enabled = self._create_search_index()
+        self._import_legacy()
+
+    def _create_search_index(self) -> bool:
+        """Create the FTS5 index and its sync triggers; False if FTS5 is unavailable."""
+        exists = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'history_fts'"
+        ).fetchone()
+        try:
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5("
+                "  title, summary, content='history', content_rowid='id'"
+                ")"
+            )
+        except sqlite3.OperationalError:
+            return False
+        self._conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS history_ai AFTER INSERT ON history BEGIN"
+            "  INSERT INTO history_fts (rowid, title, summary) VALUES (new.id, new.title, new.summary);"
+            " END"
+        )
+        self._conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS history_ad AFTER DELETE ON history BEGIN"
+            "  INSERT INTO history_fts (history_fts, rowid, title, summary)"
+            "  VALUES ('delete', old.id, old.title, old.summary);"
+            " END"
+        )
+        if not exists:
+            # Index rows written before the search index existed
+            self._conn.execute("INSERT INTO history_fts (history_fts) VALUES ('rebuild')")
+        self._conn.commit()
+        return True
+
+    def append(self, title: str, summary: str, source: str = "") -> int:
+        """
+        Record a summary and drop the oldest entries beyond the retention cap.
+        An earlier entry for the same canonical source is replaced.
+        """
+        with self._lock:
+            if source:
+                self._conn.execute("DELETE FROM history WHERE source = ?", (source,))
+            cursor = self._conn.execute(
+                "INSERT INTO history (title, summary, source, created_at) VALUES (?, ?, ?, ?)",
+                (title, summary, source, time.time()),
+            )
+            self._enforce_retention()
+            self._conn.commit()
+            return cursor.lastrowid
+
+    def _enforce_retention(self) -> None:
+        """Delete everything older than the newest `max_items` rows (`max_items` <= 0 keeps all)."""
+        if self.config.max_items <= 0:
+            return
+        self._conn.execute(
+            "DELETE FROM history WHERE id <= "
+            "(SELECT id FROM history ORDER BY id DESC LIMIT 1 OFFSET ?)",
+            (self.config.max_items,),
+        )
+
+    def list_titles(self, limit: int = 20, offset: int = 0) -> list[HistoryEntry]:
+        """Return one page of entries, newest first, without summary bodies."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, title, created_at FROM history ORDER BY id DESC LIMIT ? OFFSET ?",
+                (limit, offset),
+            ).fetchall()
+        return [HistoryEntry(*row) for row in rows]
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> list[HistoryEntry]:
+        """Return one page of entries matching every word of query, best match first."""
+        terms = search_terms(query)
+        if not terms:
+            return self.list_titles(limit, offset)
+        with self._lock:
+            if self.fts_enabled:
+                rows = self._conn.execute(
+                    "SELECT h.id, h.title, h.created_at FROM history_fts"
+                    " JOIN history h ON h.id = history_fts.rowid"
+                    " WHERE history_fts MATCH ? ORDER BY bm25(history_fts), h.id DESC"
+                    " LIMIT ? OFFSET ?",
+                    (fts_query(terms), limit, offset),
+                ).fetchall()
+            else:
+                where, params = _like_clause(terms)
+                rows = self._conn.execute(
+                    f"SELECT id, title, created_at FROM history WHERE {where}"
+                    " ORDER BY id DESC LIMIT ? OFFSET ?",
+                    (*params, limit, offset),
+                ).fetchall()
+        return [HistoryEntry(*row) for row in rows]
+
+    def get_summary(self, entry_id: int) -> str | None:
+        """Load the summary body of one entry, or None if it no longer exists."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary FROM history WHERE id = ?", (entry_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def count(self, query: str = "") -> int:
+        """Return the number of stored entries, or of those matching query."""
+        terms = search_terms(query)
+        with self._lock:
+            if not terms:
+                return self._conn.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+            if self.fts_enabled:
+                return self._conn.execute(
+                    "SELECT COUNT(*) FROM history_fts WHERE history_fts MATCH ?",
+                    (fts_query(terms),),
+                ).fetchone()[0]
+            where, params = _like_clause(terms)
+            return self._conn.execute(
+                f"SELECT COUNT(*) FROM history WHERE {where}", params
+            ).fetchone()[0]
+
+    def clear(self) -> None:
+        """Remove every history entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM history")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _import_legacy(self) -> None:
+        """Move entries from a legacy JSON history into an empty store, once."""
+        legacy_path = self.config.legacy_path
+        if not legacy_path or not os.path.isfile(legacy_path):
+            return
+        try:
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        rows = [
+            (str(item.get("title", "Summary")), str(item["summary"]), "", time.time())
+            for item in entries
+            if isinstance(item, dict) and item.get("summary")
+        ] if isinstance(entries, list) else []
+
+        with self._lock:
+            if self._conn.execute("SELECT COUNT(*) FROM history").fetchone()[0] == 0:
+                self._conn.executemany(
+                    "INSERT INTO history (title, summary, source, created_at) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                self._enforce_retention()
+                self._conn.commit()
+        try:
+            os.replace(legacy_path, f"{legacy_path}.migrated")
+        except OSError:
+            pass
+
+    def __repr__(self) -> str:
+        return f"HistoryStore(path={self.config.path!r}, max_items={self.config.max_items})"
+
+
+# ═════════════════════════════════════════════════════════
+#  PROCESS-WIDE INSTANCE
+# ═════════════════════════════════════════════════════════
+_store: HistoryStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_history_store() -> HistoryStore | None:
+    """Return the shared history store, or None if the database cannot be opened."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            try:
+                _store = HistoryStore(get_config().history)
+            except sqlite3.Error:
+                return None
+        return _store
@@ -0,0 +1,57 @@
+"""
+router.py — Deterministic input routing that bypasses the Groq orchestrator.
+"""
+
+import os
+import re
+
+from audio import get_audio_handle
+from constants import SUPPORTED_AUDIO_FORMATS
+from utils import is_valid_url
+from canonical import is_youtube_url
+
+URL_PATTERN = re.compile(r"https?://[^\s<>\"'`]+", re.IGNORECASE)
+AUDIO_PATH_PATTERN = re.compile(
+    r"(\S+\.(?:%s))(?=\s|$)" % "|".join(SUPPORTED_AUDIO_FORMATS), re.IGNORECASE
+)
+TRAILING_PUNCTUATION = ".,;:!?)]}"
+
+
+def find_urls(text: str) -> list[str]:
+    """Return every http(s) URL mentioned in the text, without trailing punctuation."""
+    return [match.rstrip(TRAILING_PUNCTUATION) for match in URL_PATTERN.findall(text)]
+
+
+def find_audio_paths(text: str) -> list[str]:
+    """Return every existing audio file path (or registered `audio://` reference) mentioned in the text."""
+    candidates = [text.strip()] + AUDIO_PATH_PATTERN.findall(text)
+    paths = []
+    for candidate in candidates:
+        candidate = candidate.strip().strip("\"'`")
+        if candidate not in paths and (os.path.isfile(candidate) or get_audio_handle(candidate)):
+            _, ext = os.path.splitext(candidate)
+            if ext.lstrip(".").lower() in SUPPORTED_AUDIO_FORMATS:
+                paths.append(candidate)
+    return paths
+
+
+def route_input(user_input: str) -> tuple[str, dict] | None:
+    """
+    Pick a tool for unambiguous input without calling an LLM.
+    Returns (tool_name, arguments), or None when the input needs the orchestrator.
+    """
+    urls = find_urls(user_input)
+    audio_paths = find_audio_paths(user_input)
+
+    if len(set(urls)) + len(audio_paths) != 1:
+        return None
+
+    if audio_paths:
+        return "audio_tool", {"file_path": audio_paths[0]}
+
+    url = urls[0]
+    if is_youtube_url(url):
+        return "youtube_tool", {"url": url}
+    if is_valid_url(url):
+        return "article_tool", {"url": url}
+    return None
@@ -4,7 +4,9 @@ ui.py — Streamlit UI components and layout.
 
 import streamlit as st
 from datetime import datetime
-from .utils import save_history
+from .history import get_history_store
+from constants import HISTORY_PAGE_SIZE, SIDEBAR_TITLE_MAX_LENGTH
+from cache import get_summary_cache
 
 def render_header():
     st.markdown(
@@ -37,6 +39,51 @@ def render_feature_cards():
         unsafe_allow_html=True,
     )
 
+def render_history(history):
+    """Render one page of history titles, filtered by the full-text search box."""
+    if history is None or history.count() == 0:
+        return
+
+    st.markdown('<p class="section-label">Recent Summaries</p>', unsafe_allow_html=True)
+    query = st.text_input("Search history", placeholder="Search past summaries", label_visibility="collapsed")
+    if query != st.session_state.get("history_query", ""):
+        st.session_state.history_query = query
+        st.session_state.history_page = 0
+
+    # Only the current page is queried, so rerun cost does not grow with the history
+    total = history.count(query)
+    pages = max(1, -(-total // HISTORY_PAGE_SIZE))
+    page = min(st.session_state.get("history_page", 0), pages - 1)
+    entries = history.search(query, limit=HISTORY_PAGE_SIZE, offset=page * HISTORY_PAGE_SIZE)
+
+    for entry in entries:
+        title = entry.title
+        disp_title = (title[:SIDEBAR_TITLE_MAX_LENGTH] + '...') if len(title) > SIDEBAR_TITLE_MAX_LENGTH else title
+        # Only titles are listed; the body is loaded when an entry is opened
+        if st.button(f"📄 {disp_title}", key=f"hist_{entry.id}", use_container_width=True):
+            st.session_state.summary_result = history.get_summary(entry.id)
+    if not entries:
+        st.caption("No matching summaries.")
+
+    if pages > 1:
+        prev_col, label_col, next_col = st.columns([1, 2, 1])
+        with prev_col:
+            if st.button("‹", key="hist_prev", disabled=page == 0, use_container_width=True):
+                st.session_state.history_page = page - 1
+                st.rerun()
+        with label_col:
+            st.caption(f"Page {page + 1} of {pages}")
+        with next_col:
+            if st.button("›", key="hist_next", disabled=page >= pages - 1, use_container_width=True):
+                st.session_state.history_page = page + 1
+                st.rerun()
+
+    st.markdown("")
+    if st.button("Clear History", use_container_width=True):
+        history.clear()
+        st.session_state.history_page = 0
+        st.rerun()
+
 def render_sidebar(orchestrator_model_list):
     import os
     with st.sidebar:
@@ -87,30 +134,48 @@ def render_sidebar(orchestrator_model_list):
         st.markdown("---")
 
         # ── History ──
-        if st.session_state.summary_history:
-            st.markdown('<p class="section-label">Recent Summaries</p>', unsafe_allow_html=True)
-            for i, hist in enumerate(reversed(st.session_state.summary_history)):
-                title = hist.get('title', f"Summary {i}")
-                disp_title = (title[:25] + '...') if len(title) > 25 else title
-                if st.button(f"📄 {disp_title}", key=f"hist_{i}", use_container_width=True):
-                    st.session_state.summary_result = hist['summary']
-            
-            st.markdown("")
-            if st.button("Clear History", use_container_width=True):
-                st.session_state.summary_history = []
-                save_history([])
-                st.rerun()
+        render_history(get_history_store())
 
         st.markdown("---")
 
         # ── Platform Stats ──
+        cache = get_summary_cache()
+        cache_line = ""
+        if cache:
+            stats = cache.stats()
+            cache_line = (
+                '<p style="margin:0.5rem 0 0; font-size: 0.7rem; color: var(--text-muted);">SUMMARY CACHE</p>'
+                f'<p style="margin:0; font-size: 0.8rem; color: var(--text-secondary);">'
+                f'{stats["entries"]} entries · {stats["hits"]} hits · {stats["misses"]} misses</p>'
+            )
         st.markdown('<div style="background: rgba(255,255,255,0.03); padding: 1rem; border-radius: 8px; border: 1px solid var(--border);">'
                     '<p style="margin:0; font-size: 0.7rem; color: var(--text-muted);">PLATFORM VERSION</p>'
                     '<p style="margin:0; font-weight: bold; color: var(--accent);">v2.4.0-CORE</p>'
+                    f'{cache_line}'
                     '</div>', unsafe_allow_html=True)
         
         return orchestrator_model
 
+def render_stage_timings(timings):
+    """Waterfall of the last request's stages: offset and length relative to the whole request."""
+    total = max((row["offset_ms"] + row["total_ms"] for row in timings), default=0.0) or 1.0
+    html = '<div class="stage-timings"><p class="section-label">Stage Timings</p>'
+    for row in timings:
+        calls = f' ×{row["calls"]}' if row["calls"] > 1 else ""
+        left = 100 * row["offset_ms"] / total
+        # Concurrent calls of one stage overlap, so their summed time can exceed the wall-clock span
+        width = max(0.5, min(100 - left, 100 * row["total_ms"] / total))
+        bar_cls = "stage-bar stage-error" if row["errors"] else "stage-bar"
+        html += (
+            f'<div class="stage-row">'
+            f'  <span class="stage-name">{"&nbsp;&nbsp;" * row["depth"]}{row["stage"]}{calls}</span>'
+            f'  <span class="stage-track"><span class="{bar_cls}" style="left:{left:.1f}%; width:{width:.1f}%"></span></span>'
+            f'  <span class="stage-ms">{row["total_ms"]:,.0f} ms</span>'
+            f"</div>"
+        )
+    html += '</div>'
+    st.markdown(html, unsafe_allow_html=True)
+
 def render_execution_log():
     if st.session_state.execution_log:
         with st.expander("Execution Log", expanded=False):
@@ -126,6 +191,21 @@ def render_execution_log():
                 )
             log_html += '</div>'
             st.markdown(log_html, unsafe_allow_html=True)
+            if st.session_state.get("stage_timings"):
+                render_stage_timings(st.session_state.stage_timings)
+                request_id = st.session_state.get("request_id")
+                if request_id:
+                    st.caption(f"Request ID: {request_id}")
+
+def make_stream_renderer(placeholder):
+    """Return a token callback that renders the growing summary into a placeholder."""
+    parts = []
+
+    def on_token(text: str):
+        parts.append(text)
+        placeholder.markdown("".join(parts) + " ▌")
+
+    return on_token
 
 def render_results():
     if st.session_state.summary_result:
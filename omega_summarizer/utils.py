@@ -1,39 +1,55 @@
 """
-utils.py — Helper functions for history and logging.
+utils.py — Helper functions for logging.
 """
 
-import os
-import json
-import streamlit as st
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
 
-# Persistent History Helpers
-HISTORY_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "summary_history.json")
+from logger import log_event
+from tracing import current_request_id
 
-def load_history():
-    if os.path.exists(HISTORY_FILE):
-        try:
-            with open(HISTORY_FILE, "r") as f:
-                return json.load(f)
-        except Exception:
-            return []
-    return []
+# Headless callers (HTTP service, batch jobs) receive log entries through a
+# callback instead of Streamlit session state.
+_log_sink: ContextVar = ContextVar("omega_log_sink", default=None)
 
-def save_history(history):
+
+@contextmanager
+def log_sink(callback):
+    """Route add_log entries in the current context to callback(entry)."""
+    token = _log_sink.set(callback)
     try:
-        with open(HISTORY_FILE, "w") as f:
-            json.dump(history, f, indent=4)
-    except Exception:
-        pass
+        yield
+    finally:
+        _log_sink.reset(token)
 
-def add_log(tool: str, message: str, status: str = "working"):
-    """Append a log entry with timestamp to session state."""
-    if "execution_log" not in st.session_state:
-        st.session_state.execution_log = []
-        
-    st.session_state.execution_log.append({
+
+def add_log(tool: str, message: str, status: str = "working", **fields):
+    """
+    Append a log entry with timestamp to session state (or the active log sink).
+    Inside a traced request the entry carries its `request_id`; extra keyword
+    fields (e.g. a stage's `duration_ms`) are added as-is.
+    """
+    entry = {
         "time": datetime.now().strftime("%H:%M:%S"),
         "tool": tool,
         "message": message,
         "status": status,  # working | success | error
-    })
+        **fields,
+    }
+    request_id = current_request_id()
+    if request_id:
+        entry["request_id"] = request_id
+    log_event(entry)
+
+    sink = _log_sink.get()
+    if sink is not None:
+        sink(entry)
+        return
+
+    import streamlit as st  # Deferred so headless callers never load Streamlit
+
+    if "execution_log" not in st.session_state:
+        st.session_state.execution_log = []
+
+    st.session_state.execution_log.append(entry)
@@ -7,8 +7,12 @@ This module provides:
 - Content-type-specific summarization prompts for Gemini
 - TOOL_DEFINITIONS: Function-calling schemas for Groq
 - build_summarize_prompt(): Dynamic prompt builder
+- build_chunk_prompt(): Map-step prompt for chunked summarization
+- PROMPT_TEMPLATE_VERSION: Fingerprint of the summarization templates
 """
 
+import hashlib
+
 # ─────────────────────────────────────────────
 # SYSTEM PROMPT  (Groq Orchestrator personality)
 # ─────────────────────────────────────────────
@@ -178,6 +182,47 @@ Here is the audio transcription:
 """
 
 
+# Map-step prompt for long inputs summarized in chunks. The condensed notes
+# of every chunk are then summarized with one of the templates above.
+CHUNK_SUMMARIZE_PROMPT = """You are a world-class content analyst. You will receive part {index} of {total} of a {source_type}.
+
+Condense this part into dense notes that preserve everything a final summary could need:
+- Main points, arguments and conclusions, in the order they appear
+- Specific facts, figures, names, tools and quotes
+- Any recommendations or next steps that are mentioned
+
+Rules:
+- Output only bullet points. No introduction, no conclusion.
+- Do not speculate about the other parts.
+
+Here is part {index} of {total}:
+
+---
+{content}
+---
+"""
+
+# Fallback when a YouTube video has no transcript: Gemini analyzes the URL natively
+YOUTUBE_ANALYSIS_PROMPT = (
+    "Analyze this YouTube video: {url}\n\n"
+    "Provide a comprehensive summary of the video's content, key topics discussed, "
+    "main arguments, and any important data or conclusions presented."
+)
+
+# Fingerprint of every template build_summarize_prompt() can select.
+# Editing any template changes the version and invalidates cached summaries.
+PROMPT_TEMPLATE_VERSION = hashlib.sha256(
+    "\0".join([
+        SUMMARIZE_PROMPT,
+        ARTICLE_SUMMARIZE_PROMPT,
+        YOUTUBE_SUMMARIZE_PROMPT,
+        AUDIO_SUMMARIZE_PROMPT,
+        CHUNK_SUMMARIZE_PROMPT,
+        YOUTUBE_ANALYSIS_PROMPT,
+    ]).encode("utf-8")
+).hexdigest()[:12]
+
+
 # ─────────────────────────────────────────────
 # PROMPT BUILDER
 # ─────────────────────────────────────────────
@@ -215,6 +260,13 @@ def build_summarize_prompt(
     return SUMMARIZE_PROMPT.format(source_type=source_type, content=content)
 
 
+def build_chunk_prompt(content: str, index: int, total: int, source_type: str = "content") -> str:
+    """Build the map-step prompt for one chunk (1-based index) of a long input."""
+    return CHUNK_SUMMARIZE_PROMPT.format(
+        index=index, total=total, source_type=source_type, content=content
+    )
+
+
 # ─────────────────────────────────────────────
 # GROQ TOOL DEFINITIONS  (function-calling JSON)
 # ─────────────────────────────────────────────
@@ -263,7 +315,7 @@ TOOL_DEFINITIONS = [
                 "properties": {
                     "file_path": {
                         "type": "string",
-                        "description": "The local file path to the uploaded audio file."
+                        "description": "The local file path (or audio:// reference) of the uploaded audio file."
                     }
                 },
                 "required": ["file_path"]
@@ -0,0 +1,209 @@
+"""
+ratelimit.py — Host-wide token-bucket rate limiting for provider quotas.
+Groq and Gemini enforce requests-per-minute and tokens-per-minute quotas per
+API key, and every session and worker process on a host shares that key. This
+module keeps one bucket pair per (provider, model) in SQLite, so all of them
+draw from the same budget and wait for a slot instead of collecting 429s.
+
+Features:
+- RPM and estimated-TPM budgets per provider and model (see config.RateLimitConfig)
+- Reservations: a caller takes its tokens immediately (the bucket may go into
+  debt) and sleeps until the debt is repaid, so waiters are served in arrival
+  order across threads and processes
+- Waits never outlast the request deadline — the call fails fast instead
+- Returns None from get_rate_limiter() (no limiting) if the database is unusable
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+
+from config import ProviderQuota, RateLimitConfig, get_config
+from exceptions import DeadlineExceededError
+from tracing import span
+
+
+# ═════════════════════════════════════════════════════════
+#  TOKEN BUCKETS
+# ═════════════════════════════════════════════════════════
+class RateLimiter:
+    """
+    SQLite-backed token buckets shared by every process using the same file.
+    Each bucket refills continuously at capacity/60 per second (a per-minute
+    quota) and starts full, allowing one minute's worth of burst.
+    """
+
+    def __init__(self, config: RateLimitConfig):
+        self.config = config
+        self.waits = 0
+        self.waited_seconds = 0.0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(config.path) or ".", exist_ok=True)
+        # isolation_level=None: transactions are opened explicitly with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(config.path, check_same_thread=False, timeout=10, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            "  name TEXT PRIMARY KEY,"
+            "  level REAL NOT NULL,"
+            "  updated_at REAL NOT NULL"
+            ")"
+        )
+
+    def quota_for(self, provider: str, model: str) -> ProviderQuota | None:
+        """Return the configured quota for a model, the provider's `*` entry, or None."""
+        quotas = self.config.quotas
+        return quotas.get(f"{provider}:{model}") or quotas.get(f"{provider}:*")
+
+    def reserve(self, budgets: list[tuple[str, float, float]], max_wait: float | None = None) -> float | None:
+        """
+        Atomically take `amount` from every (bucket, capacity, amount) budget.
+        Returns the seconds to wait before the reservation may be used, or None
+        — with nothing taken — if that wait would exceed `max_wait`.
+        """
+        now = time.time()  # Wall clock: comparable across processes
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                wait, levels = 0.0, []
+                for name, capacity, amount in budgets:
+                    row = self._conn.execute(
+                        "SELECT level, updated_at FROM buckets WHERE name = ?", (name,)
+                    ).fetchone()
+                    rate = capacity / 60.0
+                    level = capacity if row is None else min(capacity, row[0] + max(0.0, now - row[1]) * rate)
+                    level -= min(amount, capacity)  # A request larger than the quota waits one full window
+                    wait = max(wait, -level / rate)
+                    levels.append((name, level, now))
+
+                if max_wait is not None and wait > max_wait:
+                    self._conn.execute("ROLLBACK")
+                    return None
+                self._conn.executemany(
+                    "INSERT INTO buckets (name, level, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET level = excluded.level, updated_at = excluded.updated_at",
+                    levels,
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+            if wait > 0:
+                self.waits += 1
+                self.waited_seconds += wait
+            return wait
+
+    def acquire(self, provider: str, model: str, tokens: int = 0) -> float:
+        """
+        Reserve one request (and `tokens` estimated tokens) against the model's
+        quota. Returns the seconds the caller must wait before sending it.
+
+        Raises:
+            DeadlineExceededError: If the wait would outlast the request
+                deadline or the configured maximum wait.
+        """
+        model = model.rsplit("/", 1)[-1]  # Gemini reports "models/<name>"
+        quota = self.quota_for(provider, model)
+        if quota is None:
+            return 0.0
+
+        bucket = f"{provider}:{model}"
+        budgets = []
+        if quota.rpm > 0:
+            budgets.append((f"{bucket}:rpm", float(quota.rpm), 1.0))
+        if quota.tpm > 0:
+            budgets.append((f"{bucket}:tpm", float(quota.tpm), float(tokens + quota.completion_tokens)))
+        if not budgets:
+            return 0.0
+
+        # Deferred: retry imports this module
+        from retry import time_remaining
+
+        max_wait = self.config.max_wait_seconds
+        remaining = time_remaining()
+        if remaining is not None:
+            max_wait = min(max_wait, remaining)
+
+        wait = self.reserve(budgets, max_wait)
+        if wait is None:
+            raise DeadlineExceededError(f"{provider} quota")
+        return wait
+
+    def snapshot(self) -> dict:
+        """Current bucket levels (as stored, before refill) and wait counters."""
+        with self._lock:
+            rows = self._conn.execute("SELECT name, level FROM buckets ORDER BY name").fetchall()
+            return {
+                "buckets": {name: round(level, 1) for name, level in rows},
+                "waits": self.waits,
+                "waited_seconds": round(self.waited_seconds, 2),
+            }
+
+    def reset(self) -> None:
+        """Refill every bucket (forget all reservations)."""
+        with self._lock:
+            self._conn.execute("DELETE FROM buckets")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# ═════════════════════════════════════════════════════════
+#  PROCESS-WIDE LIMITER
+# ═════════════════════════════════════════════════════════
+_limiter: RateLimiter | None = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter | None:
+    """Return the process-wide rate limiter, or None if it is disabled or unusable."""
+    global _limiter
+    config = get_config().rate_limits
+    if not config.enabled:
+        return None
+    with _limiter_lock:
+        if _limiter is None:
+            try:
+                _limiter = RateLimiter(config)
+            except sqlite3.Error:
+                return None
+        return _limiter
+
+
+def _reserve(provider: str, model: str, tokens: int) -> float:
+    limiter = get_rate_limiter()
+    if limiter is None:
+        return 0.0
+    try:
+        return limiter.acquire(provider, model, tokens)
+    except sqlite3.Error:
+        return 0.0  # A broken quota store must not take the pipeline down with it
+
+
+def throttle(provider: str, model: str, tokens: int = 0) -> None:
+    """Block until a request to `model` fits the provider's quota."""
+    wait = _reserve(provider, model, tokens)
+    if wait > 0:
+        with span(f"quota.{provider}", log=False, model=model):
+            time.sleep(wait)
+
+
+async def throttle_async(provider: str, model: str, tokens: int = 0) -> None:
+    """
+    Async counterpart of throttle(). The reservation (a lock and a SQLite
+    write transaction) runs on the shared executor; only the wait happens
+    on the event loop, as asyncio.sleep.
+    """
+    # Deferred: async_tools imports retry, which imports this module
+    from async_tools import run_blocking
+
+    wait = await run_blocking(_reserve, provider, model, tokens)
+    if wait > 0:
+        with span(f"quota.{provider}", log=False, model=model):
+            await asyncio.sleep(wait)
@@ -0,0 +1,371 @@
+"""
+retry.py — Retry engine for provider calls in the Omega-Summarizer.
+Replaces blind exponential backoff with failure-aware retries.
+
+Features:
+- Classifies exceptions as retryable (timeouts, 429, 5xx) or fatal (bad keys, 4xx)
+- Full-jitter exponential backoff, honoring Retry-After hints
+- Overall per-request deadline shared by every call in the request
+- Per-provider circuit breakers that fail fast while a provider is down
+- Optional host-wide quota throttling before each attempt (see ratelimit.py)
+- Sync and asyncio variants with identical semantics
+"""
+
+import asyncio
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+
+from config import get_config
+from exceptions import (
+    OmegaSummarizerError,
+    APIKeyMissingError,
+    InvalidInputError,
+    RateLimitError,
+    RequestCancelledError,
+    CircuitOpenError,
+    DeadlineExceededError,
+)
+from ratelimit import throttle, throttle_async
+
+
+# ═════════════════════════════════════════════════════════
+#  EXCEPTION CLASSIFICATION
+# ═════════════════════════════════════════════════════════
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+# SDK exception class names, matched without importing the SDKs
+FATAL_ERROR_NAMES = {
+    "AuthenticationError",        # groq
+    "PermissionDeniedError",      # groq
+    "BadRequestError",            # groq
+    "NotFoundError",              # groq
+    "UnprocessableEntityError",   # groq
+    "Unauthenticated",            # google.api_core
+    "PermissionDenied",           # google.api_core
+    "InvalidArgument",            # google.api_core
+    "NotFound",                   # google.api_core
+    "TranscriptsDisabled",        # youtube_transcript_api
+    "NoTranscriptFound",          # youtube_transcript_api
+    "VideoUnavailable",           # youtube_transcript_api
+    "InvalidVideoId",             # youtube_transcript_api
+    "AgeRestricted",              # youtube_transcript_api
+}
+
+FATAL_ERROR_TYPES = (
+    APIKeyMissingError,
+    InvalidInputError,
+    RequestCancelledError,
+    CircuitOpenError,
+    DeadlineExceededError,
+    ValueError,
+    TypeError,
+    KeyError,
+)
+
+
+def _status_code(exc: Exception) -> int | None:
+    """Extract an HTTP status code from SDK exceptions, if present."""
+    for candidate in (
+        getattr(exc, "status_code", None),
+        getattr(exc, "code", None),
+        getattr(getattr(exc, "response", None), "status_code", None),
+    ):
+        if isinstance(candidate, int) and 100 <= candidate < 600:
+            return candidate
+    return None
+
+
+def retry_after_seconds(exc: Exception) -> float | None:
+    """Read a Retry-After hint (seconds or HTTP date) from an exception."""
+    if isinstance(exc, RateLimitError) and exc.retry_after:
+        return float(exc.retry_after)
+
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    value = headers.get("retry-after") if headers is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(exc: Exception) -> bool:
+    """Decide whether retrying the call that raised exc could succeed."""
+    if isinstance(exc, RateLimitError):
+        return True
+    if isinstance(exc, FATAL_ERROR_TYPES):
+        return False
+    if type(exc).__name__ in FATAL_ERROR_NAMES:
+        return False
+
+    status = _status_code(exc)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES or status >= 500
+
+    # Network errors, timeouts and anything unrecognised are treated as transient
+    return True
+
+
+# ═════════════════════════════════════════════════════════
+#  REQUEST DEADLINE
+# ═════════════════════════════════════════════════════════
+_deadline: ContextVar = ContextVar("omega_request_deadline", default=None)
+
+
+@contextmanager
+def request_deadline(seconds: float | None):
+    """
+    Bound every retried call in this context by an overall time budget.
+    Nested deadlines never extend an outer one.
+    """
+    if seconds is None:
+        yield
+        return
+    deadline = time.monotonic() + seconds
+    outer = _deadline.get()
+    token = _deadline.set(min(deadline, outer) if outer is not None else deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def time_remaining() -> float | None:
+    """Seconds left before the current request deadline, or None without one."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+# ═════════════════════════════════════════════════════════
+#  CIRCUIT BREAKERS
+# ═════════════════════════════════════════════════════════
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one provider.
+    closed → open after `failure_threshold` transient failures; open fails fast
+    for `reset_seconds`; then half-open lets a single trial call through.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def check(self) -> None:
+        """Raise CircuitOpenError if before_call() would refuse, without taking the trial."""
+        with self._lock:
+            state = self.state
+            if state == "closed" or (state == "half_open" and not self._trial_in_flight):
+                return
+            retry_in = max(0.0, self.reset_seconds - (time.monotonic() - self.opened_at))
+            raise CircuitOpenError(self.name, retry_in)
+
+    def before_call(self) -> bool:
+        """
+        Raise CircuitOpenError unless a call to the provider is allowed now.
+        Returns True if the call is the half-open trial, which must end in
+        record_success, record_failure or release_trial.
+        """
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return False
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            retry_in = max(0.0, self.reset_seconds - (time.monotonic() - self.opened_at))
+            raise CircuitOpenError(self.name, retry_in)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._trial_in_flight or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Free the trial slot of a call that was cancelled or failed for app-level reasons."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def __repr__(self) -> str:
+        return f"CircuitBreaker(name={self.name!r}, state={self.state}, failures={self.failures})"
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(provider: str) -> CircuitBreaker:
+    """Return the process-wide circuit breaker for a provider."""
+    with _breakers_lock:
+        breaker = _breakers.get(provider)
+        if breaker is None:
+            config = get_config().retry
+            breaker = CircuitBreaker(
+                provider, config.breaker_failure_threshold, config.breaker_reset_seconds
+            )
+            _breakers[provider] = breaker
+        return breaker
+
+
+def breaker_states() -> dict[str, str]:
+    """Return the state of every provider breaker created so far."""
+    with _breakers_lock:
+        return {name: breaker.state for name, breaker in _breakers.items()}
+
+
+# ═════════════════════════════════════════════════════════
+#  BACKOFF POLICY
+# ═════════════════════════════════════════════════════════
+def _next_delay(exc: Exception, attempt: int, base_delay: float) -> float:
+    """Full-jitter exponential delay, or the provider's Retry-After hint if larger."""
+    cap = get_config().retry.max_delay_seconds
+    delay = random.uniform(0, min(cap, base_delay * (2 ** attempt)))
+    hint = retry_after_seconds(exc)
+    if hint is not None:
+        delay = max(delay, hint + random.uniform(0, base_delay))
+    return delay
+
+
+def _check_budget(exc: Exception, delay: float) -> None:
+    """Give up instead of sleeping past the request deadline."""
+    remaining = time_remaining()
+    if remaining is not None and delay >= remaining:
+        raise exc
+
+
+def _on_failure(exc: Exception, breaker: CircuitBreaker | None, trial: bool) -> bool:
+    """Record a failed attempt and return whether it may be retried."""
+    retryable = is_retryable(exc)
+    if breaker is None:
+        return retryable
+    if retryable:
+        breaker.record_failure()
+    elif not isinstance(exc, OmegaSummarizerError):
+        breaker.record_success()  # The provider answered; the request itself was bad
+    elif trial:
+        breaker.release_trial()  # e.g. RequestCancelledError: says nothing about the provider
+    return retryable
+
+
+# ═════════════════════════════════════════════════════════
+#  RETRY — Sync and async entry points
+# ═════════════════════════════════════════════════════════
+def retry_with_backoff(
+    func,
+    max_retries: int = 3,
+    base_delay: float = 1.0,
+    provider: str | None = None,
+    quota: tuple[str, int] | None = None,
+):
+    """
+    Retry a function call with classified, jittered exponential backoff.
+
+    Args:
+        func: Callable to retry.
+        max_retries: Maximum number of retry attempts.
+        base_delay: Initial delay cap in seconds (doubles each retry).
+        provider: Provider name whose circuit breaker guards the call.
+        quota: (model, estimated prompt tokens) — wait for the provider's
+            rate-limit budget before every attempt.
+
+    Returns:
+        The result of the function call.
+
+    Raises:
+        The first fatal exception, the last exception once retries or the
+        request deadline are exhausted, or CircuitOpenError while tripped.
+    """
+    breaker = get_breaker(provider) if provider else None
+    for attempt in range(max_retries + 1):
+        remaining = time_remaining()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceededError(provider or "provider")
+        if quota is not None and provider:
+            if breaker is not None:
+                breaker.check()  # An open circuit fails fast without spending quota
+            throttle(provider, *quota)
+        trial = breaker.before_call() if breaker is not None else False
+        try:
+            result = func()
+        except Exception as e:
+            if not _on_failure(e, breaker, trial) or attempt == max_retries:
+                raise
+            delay = _next_delay(e, attempt, base_delay)
+            _check_budget(e, delay)
+            time.sleep(delay)
+        except BaseException:
+            if trial:
+                breaker.release_trial()  # Interrupted: neither a success nor a provider failure
+            raise
+        else:
+            if breaker is not None:
+                breaker.record_success()
+            return result
+
+
+async def async_retry_with_backoff(
+    coro_func,
+    max_retries: int = 3,
+    base_delay: float = 1.0,
+    provider: str | None = None,
+    quota: tuple[str, int] | None = None,
+):
+    """
+    Async counterpart of retry_with_backoff using asyncio.sleep.
+    coro_func must return a fresh awaitable per attempt.
+    """
+    breaker = get_breaker(provider) if provider else None
+    for attempt in range(max_retries + 1):
+        remaining = time_remaining()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceededError(provider or "provider")
+        if quota is not None and provider:
+            if breaker is not None:
+                breaker.check()
+            await throttle_async(provider, *quota)
+        trial = breaker.before_call() if breaker is not None else False
+        try:
+            result = await coro_func()
+        except Exception as e:
+            if not _on_failure(e, breaker, trial) or attempt == max_retries:
+                raise
+            delay = _next_delay(e, attempt, base_delay)
+            _check_budget(e, delay)
+            await asyncio.sleep(delay)
+        except BaseException:
+            if trial:
+                breaker.release_trial()  # Cancelled (e.g. a hedge loser): no verdict on the provider
+            raise
+        else:
+            if breaker is not None:
+                breaker.record_success()
+            return result
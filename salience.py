@@ -0,0 +1,149 @@
+"""
+salience.py — Extractive pre-compression for the Omega-Summarizer.
+Scores sentences by salience and keeps the best ones, in original order,
+up to a token budget, so long articles and transcripts reach Gemini as
+shorter prompts instead of being cut off at a fixed length.
+
+Features:
+- TF-IDF sentence vectors (feature-hashed into a fixed width) built with NumPy
+- TextRank over cosine similarity, computed as X(Xᵀv) so the sentence
+  similarity matrix is never materialized
+- Unpunctuated captions are cut into fixed-size word windows
+- NumPy is optional: without it, is_available() is False and callers skip the stage
+"""
+
+import re
+
+from constants import (
+    CHARS_PER_TOKEN,
+    SALIENCE_HASH_DIM,
+    SALIENCE_DAMPING,
+    SALIENCE_ITERATIONS,
+    SALIENCE_TOLERANCE,
+    SALIENCE_MAX_SENTENCE_WORDS,
+)
+from utils import PARAGRAPH_BREAK, SENTENCE_BREAK
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def is_available() -> bool:
+    """True when NumPy can be imported."""
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# ═════════════════════════════════════════════════════════
+#  SENTENCE SEGMENTATION
+# ═════════════════════════════════════════════════════════
+def split_sentences(text: str, max_words: int = SALIENCE_MAX_SENTENCE_WORDS) -> tuple[list[str], list[int]]:
+    """
+    Split text into sentences and return them with the index of their paragraph.
+    Sentences longer than max_words (typical of captions) become word windows.
+    """
+    sentences, paragraphs = [], []
+    for paragraph_index, paragraph in enumerate(PARAGRAPH_BREAK.split(text)):
+        for sentence in SENTENCE_BREAK.split(paragraph.strip()):
+            words = sentence.split()
+            for start in range(0, len(words), max_words):
+                sentences.append(" ".join(words[start:start + max_words]))
+                paragraphs.append(paragraph_index)
+    return sentences, paragraphs
+
+
+# ═════════════════════════════════════════════════════════
+#  SCORING
+# ═════════════════════════════════════════════════════════
+def sentence_vectors(sentences: list[str], dim: int = SALIENCE_HASH_DIM):
+    """Return L2-normalized TF-IDF vectors (sentences × dim) using hashed term columns."""
+    import numpy as np
+
+    vocabulary: dict[str, int] = {}
+    rows, terms = [], []
+    for index, sentence in enumerate(sentences):
+        for word in _WORD_PATTERN.findall(sentence.lower()):
+            rows.append(index)
+            terms.append(vocabulary.setdefault(word, len(vocabulary)))
+
+    matrix = np.zeros((len(sentences), dim), dtype=np.float32)
+    if not rows:
+        return matrix
+
+    rows = np.asarray(rows, dtype=np.int64)
+    terms = np.asarray(terms, dtype=np.int64)
+    pairs, tf = np.unique(rows * len(vocabulary) + terms, return_counts=True)
+    pair_rows, pair_terms = np.divmod(pairs, len(vocabulary))
+    df = np.bincount(pair_terms, minlength=len(vocabulary))
+    idf = np.log(len(sentences) / (1.0 + df)) + 1.0
+
+    np.add.at(matrix, (pair_rows, pair_terms % dim), (tf * idf[pair_terms]).astype(np.float32))
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms > 0, norms, 1.0)
+
+
+def textrank_scores(
+    vectors,
+    damping: float = SALIENCE_DAMPING,
+    iterations: int = SALIENCE_ITERATIONS,
+    tolerance: float = SALIENCE_TOLERANCE,
+):
+    """
+    PageRank over the cosine-similarity graph of the sentence vectors.
+    W·v is evaluated as X(Xᵀv) − v (self-similarity removed), which costs
+    O(sentences × dim) per iteration instead of O(sentences²).
+    """
+    import numpy as np
+
+    count = vectors.shape[0]
+    if count == 0:
+        return np.zeros(0, dtype=np.float32)
+    degree = vectors @ (vectors.T @ np.ones(count, dtype=np.float32)) - 1.0
+    degree = np.where(degree > 1e-9, degree, np.inf)  # Isolated sentences pass on nothing
+
+    scores = np.full(count, 1.0 / count, dtype=np.float32)
+    for _ in range(iterations):
+        flow = scores / degree
+        updated = (1.0 - damping) / count + damping * (vectors @ (vectors.T @ flow) - flow)
+        converged = np.abs(updated - scores).sum() < tolerance
+        scores = updated
+        if converged:
+            break
+    return scores
+
+
+# ═════════════════════════════════════════════════════════
+#  EXTRACTION
+# ═════════════════════════════════════════════════════════
+def salient_extract(text: str, max_tokens: int) -> str:
+    """
+    Keep the most salient sentences of text within max_tokens, in original
+    order and paragraph structure. Text already within budget is returned as is.
+    Requires NumPy (see is_available()).
+    """
+    import numpy as np
+
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+
+    sentences, paragraphs = split_sentences(text)
+    scores = textrank_scores(sentence_vectors(sentences))
+
+    keep, used = [], 0
+    for index in np.argsort(-scores, kind="stable"):
+        cost = len(sentences[index]) + 1
+        if used + cost <= max_chars:
+            keep.append(index)
+            used += cost
+    keep.sort()
+
+    output, previous = [], None
+    for index in keep:
+        if previous is not None:
+            output.append("\n\n" if paragraphs[index] != paragraphs[previous] else " ")
+        output.append(sentences[index])
+        previous = index
+    return "".join(output)
@@ -0,0 +1,440 @@
+"""
+server.py — Headless HTTP service for the Omega-Summarizer.
+Exposes the agent pipeline without a browser session, so several replicas
+can sit behind a load balancer and serve other internal systems.
+
+Endpoints:
+    POST /summarize   JSON `{"url": ...}` or multipart form with a `file` (audio)
+                      and/or `url` field. Optional `model` and `policy` fields.
+                      Responds with server-sent events:
+                        event: progress  — one per execution log entry
+                        event: token     — summary text as Gemini generates it
+                        event: summary   — the final result, request ID and stage timings
+                        event: done
+                      An `X-Request-ID` header is used as the correlation ID
+                      (one is generated otherwise) and echoed back.
+    GET  /health      Liveness/readiness with API key status and pool usage
+    GET  /metrics     Stage duration histograms in the Prometheus text format
+
+Usage:
+    python server.py                       # Uses config.ServerConfig
+    python server.py --port 9000 --workers 16
+
+Every connection gets its own lightweight thread; only summaries — including
+reading their request bodies — are bounded by `--workers`. Uploads are streamed
+to spooled files rather than parsed in memory. Idle keep-alive connections are
+closed after ServerConfig.idle_timeout_seconds, so they never pin a thread for long.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from tempfile import SpooledTemporaryFile
+import mmap
+from email.message import Message
+from email.parser import BytesParser
+from email.policy import default as default_policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+# ── Ensure local imports work ────────────────────────────
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from audio import register_audio
+from clients import get_clients
+from config import get_config
+from constants import (
+    APP_NAME,
+    APP_VERSION,
+    AUDIO_SPOOL_THRESHOLD_MB,
+    AVAILABLE_ORCHESTRATOR_MODELS,
+    MULTIPART_CHUNK_BYTES,
+    ORCHESTRATION_POLICIES,
+    SERVER_MAX_BODY_MB,
+    SERVER_MAX_FIELD_BYTES,
+    SUPPORTED_AUDIO_FORMATS,
+)
+from omega_summarizer.agent import run_agent
+from omega_summarizer.utils import log_sink
+from ratelimit import get_rate_limiter
+from tools import get_single_flight, stream_tokens
+from tracing import (
+    PROMETHEUS_CONTENT_TYPE,
+    new_request_id,
+    render_prometheus,
+    sanitize_request_id,
+    start_trace,
+)
+from utils import is_error_response, is_valid_url
+
+
+# ═════════════════════════════════════════════════════════
+#  REQUEST PARSING
+# ═════════════════════════════════════════════════════════
+def format_sse(event: str, data: dict) -> bytes:
+    """Encode one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode("utf-8")
+
+
+def parse_multipart(
+    content_type: str, stream, length: int, spool_bytes: int = AUDIO_SPOOL_THRESHOLD_MB * 1024 * 1024
+) -> tuple[dict[str, str], dict[str, tuple[str, SpooledTemporaryFile]]]:
+    """
+    Stream-parse a multipart/form-data body of `length` bytes from `stream`.
+    Returns (fields, files) where files maps field name to (filename, spooled
+    file): uploads are written out chunk by chunk and spill to disk above
+    `spool_bytes`, so a body is never held in memory whole. The caller closes
+    the files. Raises ValueError for a malformed body or an oversized field.
+    """
+    header = Message()
+    header["Content-Type"] = content_type
+    boundary = header.get_param("boundary")
+    if not boundary:
+        raise ValueError("multipart body without a boundary")
+    delimiter = b"\r\n--" + str(boundary).encode("latin-1")
+    keep = len(delimiter) - 1  # Bytes held back in case a delimiter straddles two chunks
+    buffer = bytearray(b"\r\n")  # Lets the first boundary match like every later one
+    remaining = length
+    fields, files = {}, {}
+
+    def fill() -> bool:
+        nonlocal remaining
+        chunk = stream.read(min(MULTIPART_CHUNK_BYTES, remaining)) if remaining > 0 else b""
+        remaining -= len(chunk)
+        buffer.extend(chunk)
+        return bool(chunk)
+
+    def limited(target: bytearray, what: str):
+        def collect(data: bytes) -> None:
+            if len(target) + len(data) > SERVER_MAX_FIELD_BYTES:
+                raise ValueError(f"multipart {what} is too large")
+            target.extend(data)
+        return collect
+
+    def read_until(marker: bytes, sink) -> None:
+        """Move bytes up to `marker` into sink(bytes) and drop the marker."""
+        while (index := buffer.find(marker)) < 0:
+            if len(buffer) > keep:
+                sink(bytes(buffer[:-keep]))
+                del buffer[:-keep]
+            if not fill():
+                raise ValueError("truncated multipart body")
+        sink(bytes(buffer[:index]))
+        del buffer[:index + len(marker)]
+
+    try:
+        read_until(delimiter, lambda _: None)  # Preamble
+        while True:
+            while len(buffer) < 2 and fill():
+                pass
+            if buffer[:2] == b"--":
+                return fields, files
+            if buffer[:2] != b"\r\n":
+                raise ValueError("malformed multipart boundary")
+            del buffer[:2]
+
+            head = bytearray()
+            while len(buffer) < 2 and fill():
+                pass
+            if buffer[:2] == b"\r\n":
+                del buffer[:2]  # A part without headers
+            else:
+                read_until(b"\r\n\r\n", limited(head, "part header"))
+            part = BytesParser(policy=default_policy).parsebytes(bytes(head) + b"\r\n\r\n")
+            name = part.get_param("name", header="content-disposition")
+            filename = part.get_filename()
+
+            if filename:
+                spooled = SpooledTemporaryFile(max_size=spool_bytes)
+                if name:
+                    files[name] = (filename, spooled)
+                read_until(delimiter, spooled.write)
+                if not name:
+                    spooled.close()
+                continue
+
+            value = bytearray()
+            read_until(delimiter, limited(value, f"field {name!r}"))
+            if name:
+                fields[name] = value.decode(part.get_content_charset() or "utf-8").strip()
+    except BaseException:
+        for _, spooled in files.values():
+            spooled.close()
+        raise
+
+
+@contextmanager
+def upload_buffer(spooled: SpooledTemporaryFile, spool_bytes: int = AUDIO_SPOOL_THRESHOLD_MB * 1024 * 1024):
+    """A buffer over an uploaded file: its bytes if small, else a read-only map of the spilled file."""
+    size = spooled.tell()
+    spooled.flush()
+    if size <= spool_bytes:  # Still in memory (SpooledTemporaryFile rolls over above max_size)
+        spooled.seek(0)
+        yield spooled.read()
+        return
+    mapped = mmap.mmap(spooled.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        yield mapped
+    finally:
+        try:
+            mapped.close()
+        except BufferError:
+            pass  # A view is still alive; the map is freed with it
+
+
+# ═════════════════════════════════════════════════════════
+#  REQUEST HANDLER
+# ═════════════════════════════════════════════════════════
+class SummarizeHandler(BaseHTTPRequestHandler):
+    """Routes /summarize and /health requests."""
+
+    server_version = f"OmegaSummarizer/{APP_VERSION}"
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        self.timeout = self.server.idle_timeout  # Socket timeout: idle keep-alive clients are dropped
+        super().setup()
+
+    # ── Helpers ──
+    def send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_text(self, status: int, text: str, content_type: str) -> None:
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def start_event_stream(self, request_id: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("X-Request-ID", request_id)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+    def send_event(self, event: str, data: dict) -> bool:
+        """Write one event; returns False once the client has gone away."""
+        try:
+            self.wfile.write(format_sse(event, data))
+            self.wfile.flush()
+            return True
+        except OSError:  # Broken pipe, reset or a client that stopped reading
+            return False
+
+    def log_message(self, format: str, *args) -> None:
+        pass  # Keep request logs out of stderr; progress is streamed to the client
+
+    # ── Routes ──
+    def do_GET(self) -> None:
+        path = urlparse(self.path).path
+        if path == "/metrics":
+            self.send_text(200, render_prometheus(), PROMETHEUS_CONTENT_TYPE)
+            return
+        if path != "/health":
+            self.send_json(404, {"error": "Not found"})
+            return
+
+        config = get_config()
+        limiter = get_rate_limiter()
+        self.send_json(200, {
+            "status": "ok",
+            "app": APP_NAME,
+            "version": APP_VERSION,
+            "apis": config.api_keys.get_status(),
+            "workers": self.server.max_workers,
+            "in_flight": self.server.in_flight,
+            "coalescing": get_single_flight().stats(),
+            "rate_limits": limiter.snapshot() if limiter else None,
+            "clients": get_clients().stats(),
+        })
+
+    def do_POST(self) -> None:
+        if urlparse(self.path).path != "/summarize":
+            self.send_json(404, {"error": "Not found"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            self.close_connection = True  # The unread body would be parsed as the next request
+            self.send_json(400, {"error": "Content-Length must be an integer."})
+            return
+        if length <= 0:
+            self.send_json(400, {"error": "Request body is required."})
+            return
+        if length > SERVER_MAX_BODY_MB * 1024 * 1024:
+            self.close_connection = True
+            self.send_json(413, {"error": f"Request body exceeds {SERVER_MAX_BODY_MB} MB."})
+            return
+
+        content_type = self.headers.get("Content-Type", "")
+        multipart = content_type.startswith("multipart/form-data")
+        if not multipart and length > SERVER_MAX_FIELD_BYTES:
+            self.close_connection = True
+            self.send_json(413, {"error": f"JSON body exceeds {SERVER_MAX_FIELD_BYTES // 1024} KB."})
+            return
+
+        # The body is read inside a summary slot, so at most --workers uploads are in flight
+        with self.server.summary_slot():
+            self.summarize_request(length, content_type, multipart)
+
+    def summarize_request(self, length: int, content_type: str, multipart: bool) -> None:
+        """Read and validate a /summarize body, then stream the summary."""
+        self.close_connection = True  # One request per connection: a rejected body may be partly unread
+        files = {}
+        try:
+            try:
+                if multipart:
+                    fields, files = parse_multipart(content_type, self.rfile, length)
+                else:
+                    fields = json.loads(self.rfile.read(length) or b"{}")
+            except (ValueError, UnicodeDecodeError):
+                fields = None
+            if not isinstance(fields, dict):
+                self.send_json(400, {"error": "Body must be a JSON object or multipart/form-data."})
+                return
+
+            upload = files.get("file")
+            url = str(fields.get("url", "")).strip()
+            if not upload and not is_valid_url(url):
+                self.send_json(400, {"error": "Provide a valid `url` or an audio `file`."})
+                return
+
+            config = get_config()
+            model = str(fields.get("model") or config.models.orchestrator_model)
+            policy = str(fields.get("policy") or "") or None
+            if model not in AVAILABLE_ORCHESTRATOR_MODELS and model != config.models.orchestrator_model:
+                self.send_json(400, {"error": f"Unknown `model`. Available: {', '.join(AVAILABLE_ORCHESTRATOR_MODELS)}"})
+                return
+            if policy is not None and policy not in ORCHESTRATION_POLICIES:
+                self.send_json(400, {"error": f"Unknown `policy`. Available: {', '.join(ORCHESTRATION_POLICIES)}"})
+                return
+
+            request_id = sanitize_request_id(self.headers.get("X-Request-ID")) or new_request_id()
+            self.start_event_stream(request_id)
+            with start_trace(request_id):
+                if upload:
+                    self.summarize_audio(upload, model, policy)
+                else:
+                    self.run_and_stream(f"Please summarize: {url}", model, policy)
+        finally:
+            for _, spooled in files.values():
+                spooled.close()
+
+    # ── Pipeline ──
+    def run_and_stream(self, user_input: str, model: str, policy: str | None) -> None:
+        """Run the agent, streaming its execution log, summary tokens and then the result."""
+        with start_trace() as trace, \
+                log_sink(lambda entry: self.send_event("progress", entry)), \
+                stream_tokens(lambda text: self.send_event("token", {"text": text})):
+            try:
+                result = run_agent(user_input, model, policy)
+            except Exception as e:
+                result = f"❌ Unexpected error: {e}"
+
+        self.send_event("summary", {
+            "status": "error" if is_error_response(result) else "ok",
+            "summary": result,
+            "request_id": trace.request_id,
+            "timings": trace.timings(),
+        })
+        self.send_event("done", {})
+
+    def summarize_audio(self, upload: tuple[str, SpooledTemporaryFile], model: str, policy: str | None) -> None:
+        """Register an uploaded audio file as an audio handle and summarize it."""
+        filename, spooled = upload
+        ext = os.path.splitext(filename)[1].lower()
+        if ext.lstrip(".") not in SUPPORTED_AUDIO_FORMATS:
+            self.send_event("summary", {
+                "status": "error",
+                "summary": f"❌ Unsupported format: {ext or 'unknown'}. Supported: {', '.join(SUPPORTED_AUDIO_FORMATS)}",
+            })
+            self.send_event("done", {})
+            return
+
+        with upload_buffer(spooled) as data, register_audio(data, filename) as handle:
+            self.run_and_stream(
+                f"Please summarize this audio input from {filename} located at: {handle.ref}",
+                model,
+                policy,
+            )
+
+
+# ═════════════════════════════════════════════════════════
+#  SERVER — Summaries run in a bounded number of slots
+# ═════════════════════════════════════════════════════════
+class BoundedHTTPServer(ThreadingHTTPServer):
+    """
+    ThreadingHTTPServer that bounds concurrent summaries, not connections.
+    /health and /metrics are answered on the connection's own thread, so a
+    full set of summaries (or idle keep-alive clients) never delays them.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, server_address, handler_class, max_workers: int, idle_timeout: float):
+        super().__init__(server_address, handler_class)
+        self.max_workers = max_workers
+        self.idle_timeout = idle_timeout
+        self.in_flight = 0
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._in_flight_lock = threading.Lock()
+
+    def handle_error(self, request, client_address):
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return  # Client hung up between keep-alive requests
+        super().handle_error(request, client_address)
+
+    @contextmanager
+    def summary_slot(self):
+        """Wait for one of the `max_workers` summary slots."""
+        with self._slots:
+            with self._in_flight_lock:
+                self.in_flight += 1
+            try:
+                yield
+            finally:
+                with self._in_flight_lock:
+                    self.in_flight -= 1
+
+
+def create_server(host: str, port: int, max_workers: int, idle_timeout: float | None = None) -> BoundedHTTPServer:
+    """Build (but do not start) the HTTP service."""
+    if idle_timeout is None:
+        idle_timeout = get_config().server.idle_timeout_seconds
+    return BoundedHTTPServer((host, port), SummarizeHandler, max_workers=max(1, max_workers), idle_timeout=idle_timeout)
+
+
+def main(argv: list[str] | None = None) -> int:
+    config = get_config().server
+    parser = argparse.ArgumentParser(description="Run the Omega-Summarizer HTTP service.")
+    parser.add_argument("--host", default=config.host)
+    parser.add_argument("--port", type=int, default=config.port)
+    parser.add_argument("--workers", type=int, default=config.max_workers, help="Concurrent summaries")
+    args = parser.parse_args(argv)
+
+    server = create_server(args.host, args.port, args.workers)
+    print(f"⚡ {APP_NAME} service listening on http://{args.host}:{args.port} ({args.workers} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
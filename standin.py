@@ -0,0 +1,622 @@
+"""
+standin.py — Local stand-in for the Gemini, Groq and Firecrawl HTTP APIs.
+Lets the summarizer be load-tested on one machine without spending real
+quota: point the SDKs at it through the base-URL overrides in config.py
+(OMEGA_GEMINI_BASE_URL, OMEGA_GROQ_BASE_URL, OMEGA_FIRECRAWL_BASE_URL).
+
+Endpoints:
+    GET  /v1beta/models                                Gemini model discovery
+    POST /v1beta/models/{model}:generateContent        Gemini generation
+    POST /v1beta/models/{model}:streamGenerateContent  Gemini streaming (JSON array, or SSE with alt=sse)
+    POST /openai/v1/chat/completions                   Groq chat — calls the tool matching a URL in
+                                                       the prompt, then confirms; `stream: true` is SSE
+    POST /openai/v1/audio/transcriptions               Groq Whisper (text, json, verbose_json)
+    POST /v0/scrape, /v1/scrape, /v2/scrape            Firecrawl scrape to markdown
+    GET  /_standin/stats                               Requests by provider and status, peak concurrency
+    POST /_standin/config                              Change latency, faults or payload sizes at runtime
+    POST /_standin/reset                               Clear the stats
+
+Every provider (gemini, groq, whisper, firecrawl) has a latency
+distribution and a set of injected failures, answered with that provider's
+own error body (and Retry-After on 429) so the SDKs raise their usual errors.
+
+Usage:
+    python standin.py                                              # 127.0.0.1:8765, no latency
+    python standin.py --latency gemini=lognormal:800:0.4 --latency firecrawl=uniform:200:900
+    python standin.py --fault gemini:429=0.1 --fault groq:500=0.02 --stream-delay-ms 250
+    python standin.py --summary-chars 20000 --markdown-chars 2000000   # Large payloads
+
+    OMEGA_GEMINI_BASE_URL=http://127.0.0.1:8765 OMEGA_GROQ_BASE_URL=http://127.0.0.1:8765 \\
+    OMEGA_FIRECRAWL_BASE_URL=http://127.0.0.1:8765 python server.py
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field, asdict
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# ── Ensure local imports work ────────────────────────────
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from constants import (
+    APP_VERSION,
+    GEMINI_MODEL_PRIORITIES,
+    STANDIN_HOST,
+    STANDIN_PORT,
+    STANDIN_SUMMARY_CHARS,
+    STANDIN_MARKDOWN_CHARS,
+    STANDIN_TRANSCRIPT_CHARS,
+    STANDIN_STREAM_CHUNKS,
+    STANDIN_RETRY_AFTER_SECONDS,
+)
+
+PROVIDERS = ["gemini", "groq", "whisper", "firecrawl"]
+
+
+# ═════════════════════════════════════════════════════════
+#  BEHAVIOR — Latency distributions, faults, payload sizes
+# ═════════════════════════════════════════════════════════
+@dataclass
+class Latency:
+    """
+    A latency distribution in milliseconds, written as a spec string:
+    `fixed:MS`, `uniform:LOW:HIGH`, `normal:MEAN:STDDEV` or `lognormal:MEDIAN:SIGMA`.
+    """
+
+    kind: str = "fixed"
+    params: tuple[float, ...] = (0.0,)
+
+    @classmethod
+    def parse(cls, spec: str) -> "Latency":
+        kind, *values = spec.split(":")
+        arity = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+        if kind.replace(".", "", 1).isdigit():
+            kind, values = "fixed", [kind]
+        if kind not in arity or len(values) != arity[kind]:
+            raise ValueError(f"Invalid latency spec {spec!r}. Use fixed:MS, uniform:LO:HI, normal:MEAN:SD or lognormal:MEDIAN:SIGMA.")
+        return cls(kind, tuple(float(value) for value in values))
+
+    def sample_ms(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return rng.uniform(*self.params)
+        if self.kind == "normal":
+            return max(0.0, rng.gauss(*self.params))
+        if self.kind == "lognormal":
+            median, sigma = self.params
+            return median * math.exp(rng.gauss(0.0, sigma)) if median > 0 else 0.0
+        return self.params[0]
+
+    def __str__(self) -> str:
+        return ":".join([self.kind, *(f"{value:g}" for value in self.params)])
+
+
+@dataclass
+class ProviderProfile:
+    """How one provider behaves: its latency and the probability of each injected status."""
+
+    latency: Latency = field(default_factory=Latency)
+    faults: dict[int, float] = field(default_factory=dict)
+
+
+@dataclass
+class StandinConfig:
+    """Runtime behavior of the stand-in server."""
+
+    profiles: dict[str, ProviderProfile] = field(
+        default_factory=lambda: {name: ProviderProfile() for name in PROVIDERS}
+    )
+    summary_chars: int = STANDIN_SUMMARY_CHARS
+    markdown_chars: int = STANDIN_MARKDOWN_CHARS
+    transcript_chars: int = STANDIN_TRANSCRIPT_CHARS
+    stream_chunks: int = STANDIN_STREAM_CHUNKS
+    stream_delay_ms: float = 0.0
+    retry_after_seconds: int = STANDIN_RETRY_AFTER_SECONDS
+
+    def update(self, changes: dict) -> None:
+        """
+        Apply a JSON update such as
+        {"latency": {"gemini": "fixed:500"}, "faults": {"groq": {"429": 0.2}}, "summary_chars": 5000}.
+        Faults given for a provider replace its previous faults.
+        """
+        for provider, spec in (changes.get("latency") or {}).items():
+            self.profile(provider).latency = Latency.parse(str(spec))
+        for provider, faults in (changes.get("faults") or {}).items():
+            self.profile(provider).faults = {int(status): float(p) for status, p in faults.items()}
+        for name in ("summary_chars", "markdown_chars", "transcript_chars", "stream_chunks", "retry_after_seconds"):
+            if name in changes:
+                setattr(self, name, int(changes[name]))
+        if "stream_delay_ms" in changes:
+            self.stream_delay_ms = float(changes["stream_delay_ms"])
+
+    def profile(self, provider: str) -> ProviderProfile:
+        if provider not in self.profiles:
+            raise ValueError(f"Unknown provider {provider!r}. Known: {', '.join(PROVIDERS)}")
+        return self.profiles[provider]
+
+    def describe(self) -> dict:
+        described = asdict(self)
+        described["profiles"] = {
+            name: {"latency": str(profile.latency), "faults": profile.faults}
+            for name, profile in self.profiles.items()
+        }
+        return described
+
+
+# ═════════════════════════════════════════════════════════
+#  PAYLOADS — Deterministic synthetic text
+# ═════════════════════════════════════════════════════════
+_VOCABULARY = (
+    "the grid battery storage solar wind demand price market model data team "
+    "report growth cost energy policy research system network customer product "
+    "design launch quarter revenue risk plan result study signal trend capacity "
+    "supply chain region forecast analyst platform service update release"
+).split()
+
+
+@lru_cache(maxsize=256)
+def synthetic_text(seed: str, chars: int) -> str:
+    """Prose of about `chars` characters; the same seed always gives the same text."""
+    rng = random.Random(zlib.crc32(seed.encode()))
+    sentences, length = [], 0
+    while length < chars:
+        words = rng.choices(_VOCABULARY, k=rng.randint(8, 22))
+        sentence = " ".join(words).capitalize() + "."
+        sentences.append(sentence)
+        length += len(sentence) + 1
+    return " ".join(sentences)[:max(chars, 0)]
+
+
+def synthetic_summary(prompt: str, chars: int) -> str:
+    """A response in the summarizer's Quick Take / Key Insights / Action Steps format."""
+    body = synthetic_text(prompt[-2000:], max(chars - 160, 40))
+    return (
+        f"## 🎯 Quick Take\n{body[:200]}\n\n"
+        f"## 💡 Key Insights\n- **Finding**: {body[200:]}\n\n"
+        "## 🚀 Action Steps\n- **Apply**: Act on the finding.\n"
+    )
+
+
+def synthetic_markdown(url: str, chars: int) -> str:
+    """Article markdown with the navigation and footer chrome real pages carry."""
+    body = synthetic_text(url, chars)
+    paragraphs = [body[i:i + 700] for i in range(0, len(body), 700)]
+    return "\n\n".join(
+        ["- [Home](/)\n- [News](/news)", f"# {synthetic_text(url + '#title', 60)}"]
+        + paragraphs
+        + ["© Example Media. All rights reserved."]
+    )
+
+
+def split_evenly(text: str, parts: int) -> list[str]:
+    size = max(1, math.ceil(len(text) / max(1, parts)))
+    return [text[i:i + size] for i in range(0, len(text), size)] or [""]
+
+
+# ═════════════════════════════════════════════════════════
+#  PROVIDER RESPONSES
+# ═════════════════════════════════════════════════════════
+GEMINI_ERROR_STATUS = {400: "INVALID_ARGUMENT", 403: "PERMISSION_DENIED", 404: "NOT_FOUND",
+                       429: "RESOURCE_EXHAUSTED", 500: "INTERNAL", 503: "UNAVAILABLE", 504: "DEADLINE_EXCEEDED"}
+
+
+def error_body(provider: str, status: int) -> dict:
+    """The error payload each provider's SDK expects for a given status."""
+    message = "Rate limit exceeded (injected by standin)" if status == 429 else f"Injected error {status}"
+    if provider == "gemini":
+        return {"error": {"code": status, "message": message, "status": GEMINI_ERROR_STATUS.get(status, "UNKNOWN")}}
+    if provider in ("groq", "whisper"):
+        kind = "rate_limit_exceeded" if status == 429 else "internal_server_error"
+        return {"error": {"message": message, "type": kind, "code": kind}}
+    return {"success": False, "error": message}
+
+
+def gemini_candidate(text: str, finish: bool) -> dict:
+    candidate = {"content": {"parts": [{"text": text}], "role": "model"}, "index": 0}
+    if finish:
+        candidate["finishReason"] = "STOP"
+    return {"candidates": [candidate]}
+
+
+def gemini_prompt(body: dict) -> str:
+    return "\n".join(
+        part.get("text", "")
+        for content in body.get("contents", [])
+        for part in content.get("parts", [])
+    )
+
+
+def groq_tool_call(messages: list[dict]) -> tuple[str, dict] | None:
+    """Pick a tool the way the orchestrator would: by the link or audio reference in the prompt."""
+    if not messages or messages[-1].get("role") != "user":
+        return None
+    text = str(messages[-1].get("content") or "")
+    audio = re.search(r"located at:\s*(\S+)", text)
+    if audio:
+        return "audio_tool", {"file_path": audio.group(1)}
+    url = re.search(r"https?://[^\s\"'<>]+", text)
+    if not url:
+        return None
+    tool = "youtube_tool" if re.search(r"(youtube\.com|youtu\.be)/", url.group(0)) else "article_tool"
+    return tool, {"url": url.group(0)}
+
+
+def groq_completion(body: dict) -> dict:
+    messages = body.get("messages") or []
+    prompt_tokens = sum(len(str(m.get("content") or "")) for m in messages) // 4
+    call = groq_tool_call(messages) if body.get("tools") else None
+    if call:
+        name, arguments = call
+        message = {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{
+                "id": f"call_{zlib.crc32(json.dumps(arguments).encode()):08x}",
+                "type": "function",
+                "function": {"name": name, "arguments": json.dumps(arguments)},
+            }],
+        }
+        finish = "tool_calls"
+    else:
+        message = {"role": "assistant", "content": "The summary is ready and shown above."}
+        finish = "stop"
+    return {
+        "id": f"chatcmpl-standin-{time.monotonic_ns()}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "standin"),
+        "choices": [{"index": 0, "message": message, "finish_reason": finish, "logprobs": None}],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": 12, "total_tokens": prompt_tokens + 12},
+    }
+
+
+def multipart_field(body: bytes, name: str) -> str | None:
+    """Value of a small text field in a multipart body (enough for Whisper parameters)."""
+    match = re.search(rb'name="' + name.encode() + rb'"\r\n\r\n([^\r]*)\r\n', body)
+    return match.group(1).decode() if match else None
+
+
+# ═════════════════════════════════════════════════════════
+#  REQUEST HANDLER
+# ═════════════════════════════════════════════════════════
+GEMINI_ROUTE = re.compile(r"^/v1(?:beta)?/models/(?P<model>[^:/]+)(?::(?P<method>\w+))?$")
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """Answers provider API calls according to the server's StandinConfig."""
+
+    server_version = f"OmegaStandin/{APP_VERSION}"
+    protocol_version = "HTTP/1.1"  # Keep-alive, as the real APIs allow
+
+    # ── Helpers ──
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length > 0 else b""
+
+    def send_bytes(self, status: int, body: bytes, content_type: str, headers: dict | None = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, status: int, payload, headers: dict | None = None) -> None:
+        self.send_bytes(status, json.dumps(payload).encode("utf-8"), "application/json", headers)
+
+    def send_stream(self, pieces: list[bytes], content_type: str) -> None:
+        """Chunked response, pausing stream_delay_ms between pieces."""
+        delay = self.server.config.stream_delay_ms / 1000
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for index, piece in enumerate(pieces):
+                if index and delay:
+                    time.sleep(delay)
+                self.wfile.write(f"{len(piece):x}\r\n".encode() + piece + b"\r\n")
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    # ── Routes ──
+    def do_GET(self) -> None:
+        path = urlparse(self.path).path
+        if path == "/_standin/stats":
+            self.send_json(200, self.server.snapshot())
+        elif path in ("/v1beta/models", "/v1/models"):
+            self.dispatch("gemini", self.gemini_models)
+        elif GEMINI_ROUTE.match(path):
+            self.dispatch("gemini", lambda: self.gemini_model(GEMINI_ROUTE.match(path)["model"]))
+        else:
+            self.send_json(404, {"error": "Not found"})
+
+    def do_POST(self) -> None:
+        parsed = urlparse(self.path)
+        path, query = parsed.path, parse_qs(parsed.query)
+        body = self.read_body()
+        gemini = GEMINI_ROUTE.match(path)
+
+        if path == "/_standin/config":
+            try:
+                with self.server.lock:
+                    self.server.config.update(json.loads(body or b"{}"))
+            except (ValueError, TypeError, AttributeError) as e:
+                self.send_json(400, {"error": str(e)})
+                return
+            self.send_json(200, self.server.config.describe())
+        elif path == "/_standin/reset":
+            self.server.reset_stats()
+            self.send_json(200, {"status": "ok"})
+        elif gemini and gemini["method"] in ("generateContent", "streamGenerateContent"):
+            stream = gemini["method"] == "streamGenerateContent"
+            sse = query.get("alt", [""])[0] == "sse"
+            self.dispatch("gemini", lambda: self.gemini_generate(json.loads(body or b"{}"), stream, sse))
+        elif path == "/openai/v1/chat/completions":
+            self.dispatch("groq", lambda: self.groq_chat(json.loads(body or b"{}")))
+        elif path == "/openai/v1/audio/transcriptions":
+            self.dispatch("whisper", lambda: self.whisper(body))
+        elif path in ("/v0/scrape", "/v1/scrape", "/v2/scrape"):
+            self.dispatch("firecrawl", lambda: self.firecrawl(json.loads(body or b"{}")))
+        else:
+            self.send_json(404, {"error": "Not found"})
+
+    def dispatch(self, provider: str, respond) -> None:
+        """Count the request, apply the provider's latency and maybe an injected failure, then respond."""
+        self.server.enter(provider)
+        status = self.server.draw(provider)
+        try:
+            if status != 200:
+                headers = {"Retry-After": str(self.server.config.retry_after_seconds)} if status == 429 else None
+                self.send_json(status, error_body(provider, status), headers)
+                return
+            respond()
+        except ValueError as e:
+            status = 400
+            self.send_json(400, error_body(provider, 400) | {"detail": str(e)})
+        finally:
+            self.server.leave(provider, status)
+
+    # ── Gemini ──
+    def gemini_models(self) -> None:
+        self.send_json(200, {"models": [self.gemini_model_info(name) for name in GEMINI_MODEL_PRIORITIES]})
+
+    def gemini_model(self, name: str) -> None:
+        self.send_json(200, self.gemini_model_info(name))
+
+    @staticmethod
+    def gemini_model_info(name: str) -> dict:
+        return {
+            "name": f"models/{name}",
+            "baseModelId": name,
+            "version": "standin",
+            "displayName": f"{name} (stand-in)",
+            "inputTokenLimit": 1_048_576,
+            "outputTokenLimit": 8192,
+            "supportedGenerationMethods": ["generateContent", "countTokens"],
+        }
+
+    def gemini_generate(self, body: dict, stream: bool, sse: bool) -> None:
+        prompt = gemini_prompt(body)
+        text = synthetic_summary(prompt, self.server.config.summary_chars)
+        usage = {"promptTokenCount": len(prompt) // 4, "candidatesTokenCount": len(text) // 4,
+                 "totalTokenCount": (len(prompt) + len(text)) // 4}
+        if not stream:
+            self.send_json(200, gemini_candidate(text, finish=True) | {"usageMetadata": usage})
+            return
+
+        parts = split_evenly(text, self.server.config.stream_chunks)
+        events = [gemini_candidate(part, finish=index == len(parts) - 1) for index, part in enumerate(parts)]
+        events[-1]["usageMetadata"] = usage
+        if sse:
+            self.send_stream([f"data: {json.dumps(event)}\r\n\r\n".encode() for event in events], "text/event-stream")
+        else:
+            # The REST transport reads a JSON array incrementally
+            pieces = [("[" if index == 0 else ",\r\n") + json.dumps(event) for index, event in enumerate(events)]
+            self.send_stream([piece.encode() for piece in pieces] + [b"]"], "application/json")
+
+    # ── Groq ──
+    def groq_chat(self, body: dict) -> None:
+        completion = groq_completion(body)
+        if not body.get("stream"):
+            self.send_json(200, completion)
+            return
+
+        message = completion["choices"][0]["message"]
+        base = {key: completion[key] for key in ("id", "created", "model")} | {"object": "chat.completion.chunk"}
+        deltas = [{"role": "assistant", "content": ""}]
+        if message.get("tool_calls"):
+            deltas.append({"tool_calls": [dict(call, index=0) for call in message["tool_calls"]]})
+        else:
+            deltas += [{"content": part} for part in split_evenly(message["content"], self.server.config.stream_chunks)]
+        chunks = [base | {"choices": [{"index": 0, "delta": delta, "finish_reason": None}]} for delta in deltas]
+        chunks.append(base | {"choices": [{"index": 0, "delta": {}, "finish_reason": completion["choices"][0]["finish_reason"]}]})
+        self.send_stream(
+            [f"data: {json.dumps(chunk)}\n\n".encode() for chunk in chunks] + [b"data: [DONE]\n\n"],
+            "text/event-stream",
+        )
+
+    def whisper(self, body: bytes) -> None:
+        response_format = multipart_field(body, "response_format") or "json"
+        text = synthetic_text(f"audio:{zlib.crc32(body)}", self.server.config.transcript_chars)
+        if response_format == "text":
+            self.send_bytes(200, text.encode("utf-8"), "text/plain; charset=utf-8")
+        elif response_format == "verbose_json":
+            self.send_json(200, {"task": "transcribe", "language": "english", "duration": len(text) / 15,
+                                 "text": text, "segments": []})
+        else:
+            self.send_json(200, {"text": text})
+
+    # ── Firecrawl ──
+    def firecrawl(self, body: dict) -> None:
+        url = body.get("url")
+        if not url:
+            raise ValueError("`url` is required")
+        markdown = synthetic_markdown(url, self.server.config.markdown_chars)
+        metadata = {"sourceURL": url, "url": url, "statusCode": 200, "title": synthetic_text(url + "#title", 60)}
+        self.send_json(200, {"success": True, "data": {"markdown": markdown, "metadata": metadata}})
+
+
+# ═════════════════════════════════════════════════════════
+#  SERVER
+# ═════════════════════════════════════════════════════════
+class StandinServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the stand-in behavior and request statistics."""
+
+    daemon_threads = True
+
+    def __init__(self, server_address, config: StandinConfig | None = None, seed: int | None = None):
+        super().__init__(server_address, StandinHandler)
+        self.config = config or StandinConfig()
+        self.lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self.reset_stats()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def draw(self, provider: str) -> int:
+        """Sleep for a latency sample, then return 200 or an injected status."""
+        with self.lock:
+            profile = self.config.profile(provider)
+            delay_ms = profile.latency.sample_ms(self._rng)
+            roll = self._rng.random()
+            faults = list(profile.faults.items())
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+        for status, probability in faults:
+            if roll < probability:
+                return status
+            roll -= probability
+        return 200
+
+    def enter(self, provider: str) -> None:
+        with self.lock:
+            self._in_flight[provider] += 1
+            self._peak[provider] = max(self._peak[provider], self._in_flight[provider])
+
+    def leave(self, provider: str, status: int) -> None:
+        with self.lock:
+            self._in_flight[provider] -= 1
+            self._requests[(provider, status)] += 1
+
+    def reset_stats(self) -> None:
+        with self.lock:
+            self._requests: Counter = Counter()
+            self._in_flight: Counter = Counter()
+            self._peak: Counter = Counter()
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            requests: dict[str, dict[str, int]] = {}
+            for (provider, status), count in sorted(self._requests.items()):
+                if count:
+                    requests.setdefault(provider, {})[str(status)] = count
+            return {
+                "requests": requests,
+                "in_flight": {name: count for name, count in self._in_flight.items() if count},
+                "peak_in_flight": dict(self._peak),
+                "config": self.config.describe(),
+            }
+
+
+def start_standin(
+    host: str = STANDIN_HOST,
+    port: int = 0,
+    config: StandinConfig | None = None,
+    seed: int | None = None,
+) -> StandinServer:
+    """Start a stand-in server on a background thread (port 0 picks a free port)."""
+    server = StandinServer((host, port), config, seed)
+    threading.Thread(target=server.serve_forever, name="omega-standin", daemon=True).start()
+    return server
+
+
+# ═════════════════════════════════════════════════════════
+#  CLI
+# ═════════════════════════════════════════════════════════
+def parse_assignment(value: str) -> tuple[str, str]:
+    name, separator, setting = value.partition("=")
+    if not separator:
+        raise argparse.ArgumentTypeError(f"Expected NAME=VALUE, got {value!r}")
+    return name.strip(), setting.strip()
+
+
+def build_config(args: argparse.Namespace) -> StandinConfig:
+    config = StandinConfig(
+        summary_chars=args.summary_chars,
+        markdown_chars=args.markdown_chars,
+        transcript_chars=args.transcript_chars,
+        stream_chunks=args.stream_chunks,
+        stream_delay_ms=args.stream_delay_ms,
+        retry_after_seconds=args.retry_after,
+    )
+    latency = {}
+    faults: dict[str, dict[str, float]] = {}
+    for provider, spec in args.latency:
+        latency[provider] = spec
+    for target, probability in args.fault:
+        provider, _, status = target.partition(":")
+        faults.setdefault(provider, {})[status] = float(probability)
+    config.update({"latency": latency, "faults": faults})
+    return config
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the Gemini, Groq and Firecrawl APIs.")
+    parser.add_argument("--host", default=STANDIN_HOST)
+    parser.add_argument("--port", type=int, default=STANDIN_PORT)
+    parser.add_argument("--latency", type=parse_assignment, action="append", default=[], metavar="PROVIDER=SPEC",
+                        help="e.g. gemini=lognormal:800:0.4, groq=uniform:50:300, firecrawl=fixed:250")
+    parser.add_argument("--fault", type=parse_assignment, action="append", default=[], metavar="PROVIDER:STATUS=P",
+                        help="Inject a status with probability P, e.g. gemini:429=0.1")
+    parser.add_argument("--summary-chars", type=int, default=STANDIN_SUMMARY_CHARS)
+    parser.add_argument("--markdown-chars", type=int, default=STANDIN_MARKDOWN_CHARS)
+    parser.add_argument("--transcript-chars", type=int, default=STANDIN_TRANSCRIPT_CHARS)
+    parser.add_argument("--stream-chunks", type=int, default=STANDIN_STREAM_CHUNKS)
+    parser.add_argument("--stream-delay-ms", type=float, default=0.0, help="Pause between streamed chunks")
+    parser.add_argument("--retry-after", type=int, default=STANDIN_RETRY_AFTER_SECONDS, help="Retry-After on 429s")
+    parser.add_argument("--seed", type=int, help="Seed latency and fault draws for repeatable runs")
+    args = parser.parse_args(argv)
+
+    try:
+        config = build_config(args)
+    except ValueError as e:
+        parser.error(str(e))
+
+    server = StandinServer((args.host, args.port), config, args.seed)
+    print(f"⚡ Provider stand-in listening on {server.base_url}")
+    for name, profile in config.profiles.items():
+        faults = ", ".join(f"{status}: {p:.0%}" for status, p in profile.faults.items()) or "none"
+        print(f"   {name:<10} latency {str(profile.latency):<22} faults {faults}")
+    print(f"   export OMEGA_GEMINI_BASE_URL={server.base_url} OMEGA_GROQ_BASE_URL={server.base_url} "
+          f"OMEGA_FIRECRAWL_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
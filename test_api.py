@@ -7,9 +7,23 @@ Usage:
     python test_api.py --quick   # Run only offline tests (no API calls)
 """
 
+import asyncio
+import contextlib
+import io
+import json
+import math
+import random
 import os
+import struct
+import subprocess
 import sys
+import threading
 import time
+import types
+import tempfile
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -18,14 +32,15 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from utils import (
     is_valid_url,
-    is_youtube_url,
-    extract_video_id,
     truncate_text,
     truncate_display_title,
+    estimate_tokens,
+    split_into_chunks,
     validate_audio_file,
     is_error_response,
     format_file_size,
     sanitize_filename,
+    percentile,
 )
 from constants import (
     APP_NAME,
@@ -33,7 +48,53 @@ from constants import (
     MAX_ARTICLE_LENGTH,
     SUPPORTED_AUDIO_FORMATS,
 )
-from config import AppConfig
+from config import AppConfig, CacheConfig, DedupConfig, HistoryConfig, ProcessingConfig
+from canonical import (
+    is_youtube_url,
+    extract_video_id,
+    canonicalize_url,
+    canonical_url_key,
+    source_identity,
+)
+from cache import (
+    SummaryCache,
+    make_cache_key,
+    discovery_fingerprint,
+    load_discovered_model,
+    save_discovered_model,
+)
+from omega_summarizer.router import route_input
+from omega_summarizer.history import HistoryStore
+from batch import BatchItem, BatchRunner, build_report, load_batch_items, parse_batch_line, main as batch_main
+from server import create_server, format_sse, parse_multipart, upload_buffer
+from standin import Latency, start_standin
+from audio import split_audio, parse_mp3_frames, stitch_transcripts, register_audio, get_audio_handle, release_audio
+import salience
+from cleanup import clean_markdown, clean_captions, CleanupStats
+from dedup import NearDuplicateIndex, dedup_scope, estimate_jaccard
+from coalesce import SingleFlight
+from clients import ClientRegistry
+import ratelimit
+from ratelimit import RateLimiter
+import async_tools
+from tracing import StageMetrics, get_metrics, sanitize_request_id, serve_metrics, span, start_trace, traced
+from omega_summarizer.utils import log_sink, add_log
+from config import ClientPoolConfig, LoggingConfig, ProviderQuota, RateLimitConfig, parse_quotas
+import logger as omega_logger
+import logging
+from retry import (
+    CircuitBreaker,
+    async_retry_with_backoff,
+    get_breaker,
+    is_retryable,
+    request_deadline,
+    retry_after_seconds,
+    retry_with_backoff,
+)
+from exceptions import APIKeyMissingError, CircuitOpenError, DeadlineExceededError, RateLimitError, RequestCancelledError
+import tools
+import urllib.error
+import urllib.request
 
 
 class TestRunner:
@@ -86,10 +147,31 @@ class TestRunner:
         self.test_url_validation()
         self.test_youtube_url_detection()
         self.test_video_id_extraction()
+        self.test_canonicalization()
         self.test_text_processing()
+        self.test_chunked_summarization()
         self.test_file_validation()
         self.test_response_helpers()
         self.test_config_loading()
+        self.test_summary_cache()
+        self.test_input_routing()
+        self.test_batch_runner()
+        self.test_http_service()
+        self.test_hedged_extraction()
+        self.test_retry_policy()
+        self.test_lazy_startup()
+        self.test_audio_segmentation()
+        self.test_audio_handles()
+        self.test_history_store()
+        self.test_near_duplicates()
+        self.test_salience()
+        self.test_cleanup()
+        self.test_provider_standin()
+        self.test_tracing()
+        self.test_json_logging()
+        self.test_request_coalescing()
+        self.test_rate_limiting()
+        self.test_provider_clients()
 
         # Online tests (require API keys)
         if "--quick" not in sys.argv:
@@ -127,6 +209,44 @@ class TestRunner:
         self.assert_equal(extract_video_id("https://www.youtube.com/shorts/dQw4w9WgXcQ"), "dQw4w9WgXcQ", "Extract from shorts URL")
         self.assert_equal(extract_video_id("https://example.com/not-a-video"), None, "Returns None for non-YouTube")
 
+    # ── Canonicalization Tests ──
+    def test_canonicalization(self):
+        self.section("Canonicalization")
+        video_urls = [
+            "https://youtu.be/dQw4w9WgXcQ",
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=30",
+            "https://m.youtube.com/watch?feature=share&v=dQw4w9WgXcQ",
+            "https://youtube.com/shorts/dQw4w9WgXcQ",
+            "https://www.youtube.com/live/dQw4w9WgXcQ?si=abc",
+        ]
+        self.assert_equal({canonical_url_key(url) for url in video_urls}, {"youtube:dQw4w9WgXcQ"}, "Every YouTube link form maps to one key")
+
+        article_urls = [
+            "https://example.com/news/story",
+            "http://www.Example.com/news/story/",
+            "https://example.com:443/news//story?utm_source=x&utm_medium=y",
+            "https://example.com/news/story#comments",
+            "https://example.com/news/story?fbclid=abc",
+        ]
+        self.assert_equal(
+            {canonical_url_key(url) for url in article_urls}, {"url:https://example.com/news/story"},
+            "Tracking parameters, fragments, www and trailing slashes are ignored",
+        )
+        self.assert_equal(
+            canonicalize_url("https://example.com/search?q=b&page=2"),
+            canonicalize_url("https://example.com/search?page=2&q=b"),
+            "Query parameter order is normalized",
+        )
+        self.assert_true(
+            canonicalize_url("https://example.com/?id=1") != canonicalize_url("https://example.com/?id=2"),
+            "Content-bearing parameters are kept",
+        )
+        self.assert_equal(
+            source_identity("article_tool", {"url": "https://youtu.be/dQw4w9WgXcQ"}),
+            source_identity("youtube_tool", {"url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ"}),
+            "Article and YouTube tools share the key of the same video",
+        )
+
     # ── Text Processing Tests ──
     def test_text_processing(self):
         self.section("Text Processing")
@@ -137,6 +257,16 @@ class TestRunner:
         self.assert_true(len(truncated) <= 600, "truncate_text respects max length")
         self.assert_true(truncate_text("short", 500) == "short", "truncate_text preserves short text")
 
+        # split_into_chunks
+        paragraphs = "\n\n".join(f"Paragraph {i}. " + "word " * 50 for i in range(40))
+        chunks = split_into_chunks(paragraphs, 500)
+        self.assert_true(len(chunks) > 1, "split_into_chunks splits long text")
+        self.assert_true(all(estimate_tokens(c) <= 501 for c in chunks), "Chunks respect the token budget")
+        self.assert_true(all(c.startswith("Paragraph") for c in chunks), "Chunks start on paragraph boundaries")
+        self.assert_equal(" ".join(" ".join(chunks).split()), " ".join(paragraphs.split()), "Chunks cover all content in order")
+        run_on = "caption " * 5000
+        self.assert_true(all(len(c) <= 2000 for c in split_into_chunks(run_on, 500)), "Unpunctuated text is split on words")
+
         # truncate_display_title
         self.assert_equal(truncate_display_title("Short Title"), "Short Title", "Short title unchanged")
         self.assert_true(truncate_display_title("A Very Long Title That Should Be Truncated").endswith("..."), "Long title has ellipsis")
@@ -150,6 +280,65 @@ class TestRunner:
         self.assert_equal(sanitize_filename("hello:world?test"), "hello_world_test", "Sanitize special chars")
         self.assert_equal(sanitize_filename("normal_file"), "normal_file", "Leave clean names")
 
+    # ── Chunked Summarization Tests ──
+    def test_chunked_summarization(self):
+        self.section("Chunked Summarization")
+
+        class StubResponse:
+            def __init__(self, text):
+                self.text = text
+
+        class StubGemini:
+            model_name = "stub-model"
+
+            def __init__(self):
+                self.prompts = []
+
+            def generate_content(self, prompt, stream=False):
+                self.prompts.append(prompt)
+                if "You will receive part" in prompt:
+                    return StubResponse(f"note {len(self.prompts)}")
+                return StubResponse("final summary")
+
+        config = tools.get_config()
+        processing = config.processing
+        text = "\n\n".join(f"Paragraph {i}. " + "word " * 50 for i in range(40))
+        had_model = "gemini_model" in vars(tools)
+        saved_model = vars(tools).get("gemini_model")
+        saved = (
+            processing.chunking_threshold_tokens, processing.chunk_size_tokens, processing.max_chunks,
+            processing.salience_enabled, config.dedup.enabled, config.rate_limits.enabled,
+        )
+        try:
+            processing.chunking_threshold_tokens, processing.chunk_size_tokens = 300, 200
+            processing.salience_enabled, config.dedup.enabled, config.rate_limits.enabled = False, False, False
+
+            for max_chunks in (100, 4):
+                processing.max_chunks = max_chunks
+                stub = tools.gemini_model = StubGemini()
+                entries = []
+                with log_sink(entries.append):
+                    summary = tools.summarize_with_gemini(text, source_type="web article")
+                partial = [e for e in entries if "summary is partial" in e["message"]]
+                chunk_calls = [p for p in stub.prompts if "You will receive part" in p]
+                self.assert_equal(summary, "final summary", f"Map-reduce returns the reduced summary (max_chunks={max_chunks})")
+                self.assert_equal(len(stub.prompts), len(chunk_calls) + 1, "Every chunk is condensed, then reduced once")
+                self.assert_true("### Part 1 of" in stub.prompts[-1], "The reduce prompt carries the chunk notes")
+                if max_chunks == 100:
+                    self.assert_true(len(chunk_calls) > 4 and not partial, "Long input is condensed in several chunks")
+                else:
+                    self.assert_equal(len(chunk_calls), 4, "Chunk count is capped at max_chunks")
+                    self.assert_true(partial and partial[0]["status"] == "error", "Capped input is reported as a partial summary")
+        finally:
+            (
+                processing.chunking_threshold_tokens, processing.chunk_size_tokens, processing.max_chunks,
+                processing.salience_enabled, config.dedup.enabled, config.rate_limits.enabled,
+            ) = saved
+            if had_model:
+                tools.gemini_model = saved_model
+            else:
+                del tools.gemini_model
+
     # ── File Validation Tests ──
     def test_file_validation(self):
         self.section("File Validation")
@@ -173,6 +362,1265 @@ class TestRunner:
         self.assert_true(len(config.models.available_models) > 0, "Available models list is not empty")
         self.assert_equal(config.models.orchestrator_model, "llama-3.3-70b-versatile", "Default model is set")
 
+    # ── Summary Cache Tests ──
+    def test_summary_cache(self):
+        self.section("Summary Cache")
+        self.assert_equal(
+            source_identity("youtube_tool", {"url": "https://youtu.be/dQw4w9WgXcQ"}),
+            "youtube:dQw4w9WgXcQ",
+            "YouTube source keyed by video ID",
+        )
+        self.assert_equal(source_identity("audio_tool", {"file_path": "missing.mp3"}), None, "Missing audio file is not cached")
+        self.assert_true(
+            make_cache_key("url:https://a.com", "gemini-1.5-flash") != make_cache_key("url:https://a.com", "gemini-1.5-pro"),
+            "Cache key depends on the Gemini model",
+        )
+        defaults = ProcessingConfig()
+        base_key = make_cache_key("url:https://a.com", "gemini-1.5-flash", defaults)
+        for changed in (
+            ProcessingConfig(cleanup_enabled=False),
+            ProcessingConfig(salience_enabled=True),
+            ProcessingConfig(max_chunks=defaults.max_chunks + 1),
+        ):
+            self.assert_true(
+                make_cache_key("url:https://a.com", "gemini-1.5-flash", changed) != base_key,
+                "Cache key depends on the processing settings",
+            )
+        self.assert_equal(
+            make_cache_key("url:https://a.com", "gemini-1.5-flash", ProcessingConfig(max_chunk_workers=1)),
+            base_key,
+            "Worker counts do not split the cache",
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = SummaryCache(CacheConfig(path=os.path.join(tmp, "cache.db"), max_entries=2))
+            self.assert_equal(cache.get("k1"), None, "Miss on empty cache")
+            cache.put("k1", "summary one")
+            self.assert_equal(cache.get("k1"), "summary one", "Hit returns stored summary")
+            cache.put("err", "❌ failure")
+            self.assert_equal(cache.get("err"), None, "Error responses are not cached")
+            cache.put("k2", "summary two")
+            cache.get("k1")
+            cache.put("k3", "summary three")
+            self.assert_equal(cache.get("k2"), None, "Least-recently-used entry is evicted")
+            self.assert_equal(cache.get("k1"), "summary one", "Recently used entry survives eviction")
+            stats = cache.stats()
+            self.assert_equal(stats["entries"], 2, "Entry cap is enforced")
+            self.assert_true(stats["hits"] == 3 and stats["misses"] == 3, "Hit/miss counters are tracked")
+            cache.close()
+
+            expiring = SummaryCache(CacheConfig(path=os.path.join(tmp, "ttl.db"), ttl_seconds=-1))
+            expiring.put("k", "stale")
+            self.assert_equal(expiring.get("k"), None, "Expired entries are not served")
+            expiring.close()
+
+    # ── Input Routing Tests ──
+    def test_input_routing(self):
+        self.section("Input Routing")
+        self.assert_equal(
+            route_input("Please summarize: https://youtu.be/dQw4w9WgXcQ"),
+            ("youtube_tool", {"url": "https://youtu.be/dQw4w9WgXcQ"}),
+            "YouTube URL routes to youtube_tool",
+        )
+        self.assert_equal(
+            route_input("Please summarize: https://example.com/post."),
+            ("article_tool", {"url": "https://example.com/post"}),
+            "Article URL routes to article_tool",
+        )
+        self.assert_equal(route_input("What is a monad?"), None, "Plain text is ambiguous")
+        self.assert_equal(
+            route_input("Compare https://a.com and https://b.com"), None, "Multiple URLs are ambiguous"
+        )
+        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
+            tmp.write(b"RIFF")
+        try:
+            self.assert_equal(
+                route_input(f"Please summarize this audio input from Voice Recording located at: {tmp.name}"),
+                ("audio_tool", {"file_path": tmp.name}),
+                "Existing audio path routes to audio_tool",
+            )
+        finally:
+            os.unlink(tmp.name)
+
+    # ── Batch Runner Tests ──
+    def test_batch_runner(self):
+        self.section("Batch Runner")
+        self.assert_equal(parse_batch_line("  # comment", 1), None, "Comments are skipped")
+        item = parse_batch_line("https://example.com/a", 1)
+        self.assert_true(item.id == item.source == "https://example.com/a", "Plain-text line becomes an item")
+        item = parse_batch_line('{"request_id": "r-7", "body": "see https://example.com"}', 2)
+        self.assert_true(item.id == "r-7" and "https://example.com" in item.source, "JSONL line keeps its request ID")
+        broken = parse_batch_line('{"url": "https://example.com/b",', 3)
+        self.assert_true(broken.id == "line-3" and "line 3" in broken.error, "Malformed JSONL line reports its line number")
+        record = BatchRunner().process(broken)
+        self.assert_true(record["status"] == "error" and record["tool"] is None, "Malformed line becomes a failed record")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "items.jsonl")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write('{"url": "https://example.com/a"}\n{not json\n{"url": "https://example.com/c"}\n')
+            with contextlib.redirect_stderr(io.StringIO()):
+                items = load_batch_items(path)
+            self.assert_equal(
+                [i.id for i in items], ["https://example.com/a", "line-2", "https://example.com/c"],
+                "One malformed line does not abort loading",
+            )
+            try:
+                with contextlib.redirect_stderr(io.StringIO()):
+                    batch_main([path, "--workers", "0"])
+                rejected = False
+            except SystemExit as e:
+                rejected = e.code == 2
+            self.assert_true(rejected, "--workers 0 is rejected")
+
+        def logging_tool(tool_name, arguments):
+            add_log("Cleanup", "Cleaned article", "success")
+            return "summary"
+
+        saved_execute = tools.execute_tool
+        tools.execute_tool = logging_tool
+        try:
+            record = BatchRunner().process(BatchItem("a", "https://example.com/a"))
+        finally:
+            tools.execute_tool = saved_execute
+        self.assert_equal(
+            record["log"], [{"tool": "Cleanup", "message": "Cleaned article", "status": "success"}],
+            "Batch items collect their execution log instead of touching session state",
+        )
+
+        import _thread
+
+        class SlowRunner(BatchRunner):
+            calls = 0
+
+            def process(self, item):
+                SlowRunner.calls += 1
+                time.sleep(0.1)
+                return {"id": item.id, "status": "ok", "latency_s": 0.1}
+
+        output = io.StringIO()
+        threading.Timer(0.25, _thread.interrupt_main).start()
+        try:
+            SlowRunner(max_workers=2).run([BatchItem(str(i), "x") for i in range(40)], output)
+            interrupted = False
+        except KeyboardInterrupt:
+            interrupted = True
+        time.sleep(0.15)  # Let the items in flight finish
+        written = output.getvalue().count("\n")
+        self.assert_true(interrupted and SlowRunner.calls <= 10, "Ctrl-C stops submitting new batch items")
+        self.assert_true(written >= SlowRunner.calls - 2, "Finished records are written before the interrupt propagates")
+        self.assert_equal(percentile([1.0, 2.0, 3.0, 4.0], 50), 2.5, "Median is interpolated")
+        report = build_report(
+            [{"latency_s": 1.0, "status": "ok"}, {"latency_s": 3.0, "status": "error"}], skipped=1, elapsed=2.0
+        )
+        self.assert_true(report["succeeded"] == 1 and report["failed"] == 1, "Report counts outcomes")
+        self.assert_equal(report["throughput_per_min"], 60.0, "Report computes throughput")
+
+    # ── HTTP Service Tests ──
+    def test_http_service(self):
+        self.section("HTTP Service")
+        self.assert_equal(
+            format_sse("summary", {"status": "ok"}),
+            b'event: summary\ndata: {"status": "ok"}\n\n',
+            "Server-sent event encoding",
+        )
+        body = (
+            b"--XyZ\r\n"
+            b'Content-Disposition: form-data; name="url"\r\n\r\n'
+            b"https://example.com\r\n"
+            b"--XyZ\r\n"
+            b'Content-Disposition: form-data; name="file"; filename="note.wav"\r\n'
+            b"Content-Type: audio/wav\r\n\r\n"
+            b"RIFF\x00\x01\r\n"
+            b"--XyZ--\r\n"
+        )
+        class TrickleStream(io.BytesIO):
+            def read(self, size=-1):
+                return super().read(min(size, 7))  # Delimiters straddle reads
+
+        for stream, label in ((io.BytesIO(body), ""), (TrickleStream(body), " (in small reads)")):
+            fields, files = parse_multipart("multipart/form-data; boundary=XyZ", stream, len(body))
+            filename, spooled = files["file"]
+            spooled.seek(0)
+            self.assert_equal(fields, {"url": "https://example.com"}, f"Multipart form fields are parsed{label}")
+            self.assert_equal((filename, spooled.read()), ("note.wav", b"RIFF\x00\x01"), f"Multipart audio upload is streamed to a file{label}")
+            spooled.close()
+        for broken in (body[:-20], body.replace(b"--XyZ--", b"--XyZ!!")):
+            try:
+                parse_multipart("multipart/form-data; boundary=XyZ", io.BytesIO(broken), len(broken))
+                rejected = False
+            except ValueError:
+                rejected = True
+            self.assert_true(rejected, "Truncated or malformed multipart bodies are rejected")
+        with tempfile.SpooledTemporaryFile(max_size=10) as spooled:
+            spooled.write(b"0123456789" * 10)
+            with upload_buffer(spooled, spool_bytes=10) as data:
+                self.assert_equal((type(data).__name__, bytes(data[:12])), ("mmap", b"012345678901"), "Spilled uploads are memory-mapped")
+
+        import http.client
+        import socket
+        server = create_server("127.0.0.1", 0, max_workers=1, idle_timeout=0.5)
+        port = server.server_address[1]
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        idle = []
+        try:
+            for _ in range(2):  # Keep-alive clients that never send another request
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+                conn.request("GET", "/health")
+                conn.getresponse().read()
+                idle.append(conn)
+            with server.summary_slot():  # Every summary slot is busy
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+                conn.request("GET", "/metrics")
+                self.assert_equal(conn.getresponse().status, 200, "/metrics is served while idle clients and summaries hold the slots")
+                conn.close()
+
+                upload = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+                upload.request("POST", "/summarize", b'{"url": "not a url"}', {"Content-Type": "application/json"})
+                time.sleep(0.2)
+                self.assert_true(server.in_flight == 1, "Request bodies wait for a summary slot before they are read")
+            self.assert_equal(upload.getresponse().status, 400, "A queued request is served once a slot frees up")
+            upload.close()
+
+            time.sleep(1.0)
+            try:
+                closed = idle[0].sock.recv(1) == b""
+            except OSError:
+                closed = True
+            self.assert_true(closed, "Idle keep-alive connections are closed after the idle timeout")
+
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            conn.request("POST", "/summarize", b"{}", {"Content-Length": "lots"})
+            self.assert_equal(conn.getresponse().status, 400, "A non-numeric Content-Length is rejected")
+            conn.close()
+
+            for field, value in (("model", "not-a-model"), ("policy", "yolo")):
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+                conn.request("POST", "/summarize", json.dumps({"url": "https://example.com", field: value}),
+                             {"Content-Type": "application/json"})
+                self.assert_equal(conn.getresponse().status, 400, f"Unknown `{field}` is rejected")
+                conn.close()
+        except (OSError, socket.timeout) as e:
+            self.assert_true(False, f"HTTP service responds ({e})")
+        finally:
+            for conn in idle:
+                conn.close()
+            server.shutdown()
+            server.server_close()
+
+    # ── Hedged Extraction Tests ──
+    def test_hedged_extraction(self):
+        self.section("Hedged Extraction")
+
+        class StubFirecrawl:
+            def __init__(self, delay, markdown):
+                self.delay, self.markdown = delay, markdown
+
+            def scrape(self, url, formats=None):
+                time.sleep(self.delay)
+                return types.SimpleNamespace(markdown=self.markdown)
+
+        class StubTrafilatura:
+            @staticmethod
+            def fetch_url(url):
+                time.sleep(0.05)
+                return "<html></html>"
+
+            @staticmethod
+            def extract(downloaded):
+                return "T" * 600
+
+        original = (tools.firecrawl, tools.trafilatura)
+        tools.trafilatura = StubTrafilatura
+        try:
+            tools.firecrawl = StubFirecrawl(0.01, "F" * 800)
+            _, method = tools.extract_article_hedged("https://example.com", 0.2, 500)
+            self.assert_equal(method, "Firecrawl", "Fast Firecrawl wins before the hedge starts")
+
+            tools.firecrawl = StubFirecrawl(1.0, "F" * 800)
+            started = time.time()
+            _, method = tools.extract_article_hedged("https://example.com", 0.1, 500)
+            self.assert_equal(method, "Trafilatura", "Slow Firecrawl loses to the hedge")
+            self.assert_true(time.time() - started < 0.5, "Hedge does not wait for the slow extractor")
+
+            tools.firecrawl = StubFirecrawl(0.01, "too short")
+            content, method = tools.extract_article_hedged("https://example.com", 0.1, 500)
+            self.assert_equal(method, "Trafilatura", "Results below the quality threshold do not win")
+
+            # The loser may hold its provider's half-open trial when it is cancelled
+            breaker = get_breaker("firecrawl")
+            saved_breaker = (breaker.failures, breaker.opened_at, breaker.reset_seconds)
+
+            def trip_firecrawl():
+                breaker.release_trial()
+                breaker.failures, breaker.opened_at, breaker.reset_seconds = 1, time.monotonic() - 1, 0.5
+
+            def firecrawl_allowed():
+                try:
+                    breaker.before_call()
+                    return True
+                except CircuitOpenError:
+                    return False
+
+            try:
+                trip_firecrawl()
+                cancelled = threading.Event()
+                cancelled.set()
+                try:
+                    tools.fetch_with_firecrawl("https://example.com", cancelled=cancelled)
+                except RequestCancelledError:
+                    pass
+                self.assert_true(firecrawl_allowed(), "A cancelled hedge loser leaves its breaker usable")
+
+                trip_firecrawl()
+                tools.firecrawl = StubFirecrawl(1.0, "F" * 800)
+
+                async def race():
+                    result = await async_tools.extract_article_hedged_async("https://example.com", 0.05, 500)
+                    await asyncio.sleep(0.05)  # Let the cancelled loser unwind
+                    return result
+
+                _, method = asyncio.run(race())
+                self.assert_true(
+                    method == "Trafilatura" and firecrawl_allowed(),
+                    "A cancelled async hedge loser leaves its breaker usable",
+                )
+            finally:
+                breaker.release_trial()
+                breaker.failures, breaker.opened_at, breaker.reset_seconds = saved_breaker
+        finally:
+            tools.firecrawl, tools.trafilatura = original
+
+    # ── Retry & Circuit Breaker Tests ──
+    def test_retry_policy(self):
+        self.section("Retry & Circuit Breakers")
+
+        class StatusError(Exception):
+            def __init__(self, status_code):
+                super().__init__(f"HTTP {status_code}")
+                self.status_code = status_code
+
+        self.assert_true(is_retryable(StatusError(503)), "5xx responses are retryable")
+        self.assert_true(is_retryable(StatusError(429)), "429 responses are retryable")
+        self.assert_true(not is_retryable(StatusError(401)), "401 responses are fatal")
+        self.assert_true(not is_retryable(APIKeyMissingError("GROQ_API_KEY")), "Missing keys are fatal")
+        self.assert_true(is_retryable(TimeoutError()), "Timeouts are retryable")
+        self.assert_equal(retry_after_seconds(RateLimitError("Groq", retry_after=7)), 7.0, "RateLimitError.retry_after is honored")
+
+        calls = []
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise TimeoutError("slow")
+            return "ok"
+        self.assert_equal(retry_with_backoff(flaky, max_retries=3, base_delay=0.01), "ok", "Transient failures are retried")
+
+        calls.clear()
+        def unauthorized():
+            calls.append(1)
+            raise StatusError(403)
+        try:
+            retry_with_backoff(unauthorized, max_retries=3, base_delay=0.01)
+        except StatusError:
+            pass
+        self.assert_equal(len(calls), 1, "Fatal errors are not retried")
+
+        calls.clear()
+        def throttled():
+            calls.append(1)
+            raise RateLimitError("Gemini", retry_after=5)
+        started = time.time()
+        with request_deadline(0.2):
+            try:
+                retry_with_backoff(throttled, max_retries=3)
+            except RateLimitError:
+                pass
+        self.assert_true(len(calls) == 1 and time.time() - started < 0.5, "Retries never sleep past the request deadline")
+
+        breaker = CircuitBreaker("test", failure_threshold=2, reset_seconds=0.1)
+        breaker.record_failure()
+        breaker.record_failure()
+        try:
+            breaker.before_call()
+            tripped = False
+        except CircuitOpenError:
+            tripped = True
+        self.assert_true(tripped, "Breaker opens after consecutive failures")
+        time.sleep(0.12)
+        breaker.before_call()
+        self.assert_equal(breaker.state, "half_open", "Breaker lets a trial call through after the reset window")
+        breaker.record_success()
+        self.assert_equal(breaker.state, "closed", "A successful trial closes the breaker")
+
+        def half_open_breaker(provider):
+            breaker = get_breaker(provider)
+            breaker.failure_threshold, breaker.reset_seconds = 1, 0.05
+            breaker.record_failure()
+            time.sleep(0.06)
+            return breaker
+
+        def allows_call(breaker):
+            try:
+                breaker.before_call()
+                return True
+            except CircuitOpenError:
+                return False
+
+        breaker = half_open_breaker("test-trial-fatal")
+        def cancelled():
+            raise RequestCancelledError("hedge lost")
+        try:
+            retry_with_backoff(cancelled, max_retries=2, base_delay=0.01, provider="test-trial-fatal")
+        except RequestCancelledError:
+            pass
+        self.assert_true(
+            breaker.failures == 1 and allows_call(breaker),
+            "An app-level fatal error releases the half-open trial without counting a failure",
+        )
+
+        breaker = half_open_breaker("test-trial-cancel")
+        async def cancel_trial():
+            started = asyncio.Event()
+            async def hang():
+                started.set()
+                await asyncio.sleep(10)
+            task = asyncio.create_task(async_retry_with_backoff(hang, provider="test-trial-cancel"))
+            await started.wait()
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        asyncio.run(cancel_trial())
+        self.assert_true(
+            breaker.failures == 1 and allows_call(breaker),
+            "A cancelled half-open trial leaves the next call allowed",
+        )
+
+    # ── Lazy Startup Tests ──
+    def test_lazy_startup(self):
+        self.section("Lazy Startup")
+
+        sdks = ["google.generativeai", "firecrawl", "groq", "youtube_transcript_api", "trafilatura", "streamlit"]
+        probe = f"import sys, server; print([m for m in {sdks!r} if m in sys.modules])"
+        result = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", probe],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+        )
+        self.assert_equal(result.stdout.strip(), "[]", "Importing the service loads no provider SDKs")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            config = CacheConfig(model_discovery_path=os.path.join(tmp, "model.json"), model_discovery_ttl_seconds=60)
+            fingerprint = discovery_fingerprint("key", ["gemini-1.5-flash"])
+            self.assert_equal(load_discovered_model(fingerprint, config), None, "Discovery cache starts empty")
+            save_discovered_model(fingerprint, "models/gemini-1.5-flash", config)
+            self.assert_equal(load_discovered_model(fingerprint, config), "models/gemini-1.5-flash", "Discovered model is persisted")
+            other = discovery_fingerprint("other-key", ["gemini-1.5-flash"])
+            self.assert_equal(load_discovered_model(other, config), None, "Discovery cache is scoped to the API key")
+            config.model_discovery_ttl_seconds = -1
+            self.assert_equal(load_discovered_model(fingerprint, config), None, "Stale discovery results are ignored")
+
+        self.assert_equal(
+            tools.choose_gemini_model(["models/gemini-1.0-pro", "models/gemini-1.5-flash"]),
+            "models/gemini-1.5-flash",
+            "Model discovery follows GEMINI_MODEL_PRIORITIES",
+        )
+
+        resolved_on = []
+        had_model = "gemini_model" in vars(tools)
+        saved_model, saved_factory = vars(tools).get("gemini_model"), tools._LAZY_ATTRIBUTES["gemini_model"]
+        tools._LAZY_ATTRIBUTES["gemini_model"] = lambda: resolved_on.append(threading.current_thread()) or "stub-model"
+        vars(tools).pop("gemini_model", None)
+        try:
+            async def resolve():
+                first = await async_tools.lazy_attribute_async("gemini_model")
+                return first, await async_tools.lazy_attribute_async("gemini_model")
+
+            self.assert_equal(asyncio.run(resolve()), ("stub-model", "stub-model"), "Async callers resolve the Gemini model once")
+            self.assert_true(
+                len(resolved_on) == 1 and resolved_on[0] is not threading.main_thread(),
+                "Gemini setup and discovery run off the event loop",
+            )
+        finally:
+            tools._LAZY_ATTRIBUTES["gemini_model"] = saved_factory
+            vars(tools).pop("gemini_model", None)
+            if had_model:
+                tools.gemini_model = saved_model
+
+    # ── Audio Segmentation Tests ──
+    def test_audio_segmentation(self):
+        self.section("Audio Segmentation")
+
+        rate = 8000
+        samples = [
+            0 if 8.0 <= i / rate < 8.3 else int(8000 * math.sin(2 * math.pi * 440 * i / rate))
+            for i in range(rate * 25)
+        ]
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as writer:
+            writer.setnchannels(1)
+            writer.setsampwidth(2)
+            writer.setframerate(rate)
+            writer.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+
+        segments = split_audio(buffer.getvalue(), "talk.wav", segment_seconds=10, overlap_seconds=0.5)
+        self.assert_equal(len(segments), 3, "Long WAV is split into segments")
+        self.assert_true(8.0 <= segments[0].end_seconds <= 8.3, "WAV cut lands in the silent gap")
+        self.assert_true(segments[1].start_seconds < segments[0].end_seconds, "Consecutive segments overlap")
+        with wave.open(segments[1].open(), "rb") as reader:
+            self.assert_equal(reader.getframerate(), rate, "Segments are valid WAV files")
+
+        frame = bytes([0xFF, 0xFB, 0x90, 0x00]) + bytes(413)  # MPEG-1 Layer III, 128 kbps, 44.1 kHz
+        mp3 = b"ID3\x03\x00\x00\x00\x00\x00\x0a" + bytes(10) + frame * 2000
+        self.assert_equal(len(parse_mp3_frames(mp3)), 2000, "MP3 frames are parsed past the ID3 tag")
+        segments = split_audio(mp3, "talk.mp3", segment_seconds=20, overlap_seconds=1)
+        self.assert_true(
+            len(segments) == 3 and all(len(s.data) % len(frame) == 0 for s in segments),
+            "MP3 is cut at frame boundaries",
+        )
+        self.assert_equal(len(split_audio(b"RIFF", "short.wav")), 1, "Unparseable audio stays whole")
+
+        self.assert_equal(
+            stitch_transcripts(["so the quick brown fox jumps over the la", "fox jumps over the lazy dog."]),
+            "so the quick brown fox jumps over the lazy dog.",
+            "Overlapping words are de-duplicated when stitching",
+        )
+
+        class StubWhisper:
+            def create(self, file, model, response_format):
+                time.sleep(0.1)
+                return file[0]
+
+        class StubGroq:
+            audio = type("Audio", (), {"transcriptions": StubWhisper()})()
+
+        rate_limits = tools.get_config().rate_limits
+        saved, rate_limits.enabled = rate_limits.enabled, False  # Stub calls must not spend the host's quota
+        try:
+            started = time.time()
+            transcript = tools.transcribe_segments(StubGroq(), segments + segments[:1], max_workers=4)
+        finally:
+            rate_limits.enabled = saved
+        self.assert_true(time.time() - started < 0.25, "Segments are transcribed in parallel")
+        self.assert_true(transcript.startswith("talk.part000.mp3 talk.part001.mp3"), "Transcripts are stitched in order")
+
+    # ── In-Memory Audio Handle Tests ──
+    def test_audio_handles(self):
+        self.section("In-Memory Audio Handles")
+
+        payload = bytearray(b"ID3\x03\x00\x00\x00\x00\x00\x00" + bytes(2048))
+        with register_audio(memoryview(payload), "voice note.mp3") as handle:
+            self.assert_true(handle.ref.startswith("audio://") and handle.ref.endswith("voice_note.mp3"), "Handle has an audio:// reference")
+            self.assert_true(get_audio_handle(handle.ref) is handle, "Reference resolves to the registered handle")
+            self.assert_equal(validate_audio_file(handle.ref), (True, ""), "validate_audio_file accepts a handle reference")
+            self.assert_equal(
+                route_input(f"Please summarize this audio input located at: {handle.ref}"),
+                ("audio_tool", {"file_path": handle.ref}),
+                "Router recognises handle references",
+            )
+            payload[-1] = 7
+            self.assert_equal(handle.getbuffer()[-1], 7, "Small payloads are held without copying")
+            with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmp:
+                tmp.write(payload)
+            try:
+                self.assert_equal(
+                    source_identity("audio_tool", {"file_path": handle.ref}),
+                    source_identity("audio_tool", {"file_path": tmp.name}),
+                    "Handles and files with the same bytes share a cache identity",
+                )
+            finally:
+                os.unlink(tmp.name)
+        self.assert_equal(get_audio_handle(handle.ref), None, "Leaving the context releases the handle")
+
+        big = register_audio(bytes(4096), "long.wav", spool_threshold_mb=0.001)
+        spool_path = big.spool_path
+        self.assert_true(spool_path is not None and os.path.getsize(spool_path) == 4096, "Large payloads are spooled to disk")
+        self.assert_equal(bytes(big.open().read(4)), bytes(4), "Spooled payloads are readable through the handle")
+        release_audio(big.ref)
+        self.assert_true(not os.path.exists(spool_path), "Releasing a spooled handle removes its file")
+
+    # ── History Store Tests ──
+    def test_history_store(self):
+        self.section("History Store")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            legacy_path = os.path.join(tmp, "summary_history.json")
+            with open(legacy_path, "w", encoding="utf-8") as f:
+                json.dump([{"title": "🔗 old.com", "summary": "old summary"}], f)
+
+            config = HistoryConfig(path=os.path.join(tmp, "history.db"), legacy_path=legacy_path, max_items=3)
+            store = HistoryStore(config)
+            self.assert_equal([e.title for e in store.list_titles()], ["🔗 old.com"], "Legacy JSON history is imported")
+            self.assert_true(not os.path.exists(legacy_path), "Legacy JSON file is retired after import")
+
+            ids = [store.append(f"title {i}", f"summary {i}") for i in range(4)]
+            self.assert_equal(store.count(), 3, "Retention caps the number of entries")
+            page = store.list_titles(limit=2, offset=1)
+            self.assert_equal([e.title for e in page], ["title 2", "title 1"], "Titles are paginated newest first")
+            self.assert_true(not hasattr(page[0], "summary"), "Title listing omits summary bodies")
+            self.assert_equal(store.get_summary(ids[-1]), "summary 3", "Summary body is loaded by id")
+            self.assert_equal(store.get_summary(ids[0]), None, "Evicted entries are gone")
+
+            config.max_items = 1000
+            other = HistoryStore(config)  # A second connection, as another process would open
+            writers = [
+                threading.Thread(target=lambda s=s, n=n: [s.append(f"{n}-{i}", "body") for i in range(25)])
+                for n, s in enumerate((store, store, other, other))
+            ]
+            for writer in writers:
+                writer.start()
+            for writer in writers:
+                writer.join()
+            self.assert_equal(store.count(), 103, "Concurrent writers on two connections lose no entries")
+
+            store.append("🔗 a.com", "first", source="url:https://a.com")
+            store.append("🔗 a.com/", "second", source="url:https://a.com")
+            self.assert_equal(
+                [store.get_summary(e.id) for e in store.list_titles(limit=2)], ["second", "body"],
+                "Re-summarizing a source replaces its earlier entry",
+            )
+
+            store.clear()
+            self.assert_equal(other.count(), 0, "Clear is visible to every connection")
+            store.close()
+            other.close()
+
+            search = HistoryStore(HistoryConfig(path=os.path.join(tmp, "search.db"), legacy_path="", max_items=2))
+            search.append("🔗 cooking.com", "A guide to sourdough fermentation")
+            search.append("🎤 standup", "Quarterly roadmap and hiring plans")
+            search.append("🔗 bakery.org", "Sourdough starters need daily feeding")
+            self.assert_true(search.fts_enabled, "FTS5 search index is available")
+            self.assert_equal([e.title for e in search.search("sourdough")], ["🔗 bakery.org"], "Search matches summary bodies and skips evicted entries")
+            self.assert_equal([e.title for e in search.search("road")], ["🎤 standup"], "Search terms match as prefixes")
+            self.assert_equal(search.count("standup"), 1, "Matching entries are counted for pagination")
+            self.assert_equal([e.title for e in search.search('"roadmap* (hiring:')], ["🎤 standup"], "FTS5 syntax in queries is neutralised")
+            search.fts_enabled = False
+            self.assert_equal(search.count("feeding"), 1, "LIKE fallback finds entries without FTS5")
+            search.close()
+
+            unlimited = HistoryStore(HistoryConfig(path=os.path.join(tmp, "unlimited.db"), legacy_path="", max_items=0))
+            for i in range(3):
+                unlimited.append(f"title {i}", f"summary {i}")
+            self.assert_equal(unlimited.count(), 3, "max_items <= 0 keeps every entry")
+            unlimited.close()
+
+    # ── Near-Duplicate Detection Tests ──
+    def test_near_duplicates(self):
+        self.section("Near-Duplicate Detection")
+        import dedup
+
+        rng = random.Random(7)
+        vocabulary = [f"term{i}" for i in range(600)]
+        words = [rng.choice(vocabulary) for _ in range(400)]
+        original_text = " ".join(words)
+        mirrored = list(words)
+        for position in (40, 160, 280):
+            mirrored[position] = "edited"
+        mirrored_text = "Syndicated from Example Wire. " + " ".join(mirrored)
+        unrelated_text = " ".join(rng.choice(vocabulary) for _ in range(400))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            index = NearDuplicateIndex(DedupConfig(path=os.path.join(tmp, "dedup.db"), max_entries=2))
+            scope = dedup_scope("web article", "gemini-1.5-flash")
+            signature = index.signature(original_text)
+            self.assert_equal(len(signature), index.config.num_permutations, "Signature has one value per permutation")
+            self.assert_equal(index.signature("too short to fingerprint"), None, "Short texts are not fingerprinted")
+            self.assert_true(
+                estimate_jaccard(signature, index.signature(mirrored_text)) >= 0.8,
+                "Lightly edited mirror is estimated as highly similar",
+            )
+
+            index.add(signature, scope, "original summary")
+            match = index.lookup(index.signature(mirrored_text), scope)
+            self.assert_true(match is not None and match.summary == "original summary", "Near-duplicate reuses the stored summary")
+            self.assert_equal(index.lookup(index.signature(unrelated_text), scope), None, "Unrelated text finds no match")
+            self.assert_equal(
+                index.lookup(signature, dedup_scope("web article", "gemini-1.5-pro")), None,
+                "Matches are scoped to the Gemini model",
+            )
+
+            for i in range(4):
+                index.add(index.signature(f"filler{i} " + unrelated_text), scope, f"filler {i}")
+            self.assert_equal(index.lookup(signature, scope), None, "Oldest fingerprints are evicted beyond the cap")
+
+            class StubResponse:
+                text = "fresh summary"
+
+            class StubGemini:
+                model_name = "stub-model"
+                calls = 0
+
+                def generate_content(self, prompt):
+                    StubGemini.calls += 1
+                    return StubResponse()
+
+            had_model = "gemini_model" in vars(tools)
+            rate_limits = tools.get_config().rate_limits
+            saved = (vars(tools).get("gemini_model"), dedup._index, rate_limits.enabled)
+            tools.gemini_model, dedup._index, rate_limits.enabled = StubGemini(), index, False
+            try:
+                index.clear()
+                tools.summarize_with_gemini(original_text, source_type="web article")
+                reused = tools.summarize_with_gemini(mirrored_text, source_type="web article")
+                self.assert_equal((reused, StubGemini.calls), ("fresh summary", 1), "summarize_with_gemini skips Gemini for near-duplicates")
+            finally:
+                dedup._index, rate_limits.enabled = saved[1], saved[2]
+                if had_model:
+                    tools.gemini_model = saved[0]
+                else:
+                    del tools.gemini_model
+                index.close()
+
+    # ── Salience Pre-Compression Tests ──
+    def test_salience(self):
+        self.section("Salience Pre-Compression")
+        sentences, _ = salience.split_sentences("caption " * 150, max_words=60)
+        self.assert_equal([len(s.split()) for s in sentences], [60, 60, 30], "Unpunctuated captions are split into word windows")
+        self.assert_equal(tools.compress_for_prompt("word " * 50_000), "word " * 50_000, "Pre-compression is off by default")
+        if not salience.is_available():
+            print("  ⏭️  Skipping scoring tests (NumPy not installed)")
+            return
+
+        on_topic = [
+            f"Solar panels feed the battery and the grid stores energy for night {i}." for i in range(12)
+        ] + [f"The grid and battery storage keep solar energy flowing {i}." for i in range(12)]
+        off_topic = ["My cat prefers tuna.", "Pianos have eighty-eight keys.", "Rain fell in Lisbon yesterday."]
+        ordered = on_topic[:8] + off_topic[:1] + on_topic[8:16] + off_topic[1:] + on_topic[16:]
+        text = " ".join(ordered)
+        scores = salience.textrank_scores(salience.sentence_vectors(ordered))
+        lowest = {ordered[i] for i in scores.argsort()[:len(off_topic)]}
+        self.assert_equal(lowest, set(off_topic), "Off-topic sentences score lowest")
+
+        budget = estimate_tokens(text) // 2
+        reduced = salience.salient_extract(text, budget)
+        self.assert_true(len(reduced) <= budget * 4, "Output fits the token budget")
+        kept = [s for s in ordered if s in reduced]
+        self.assert_equal(sorted(kept, key=reduced.index), kept, "Kept sentences stay in original order")
+        self.assert_equal(salience.salient_extract(text, estimate_tokens(text)), text, "Text within budget is unchanged")
+
+    # ── Content Cleanup Tests ──
+    def test_cleanup(self):
+        self.section("Content Cleanup")
+        markdown = "\n".join([
+            "- [Home](/)",
+            "[News](/news) | [Sport](/sport) | [Weather](/weather)",
+            "![logo](/logo.png)",
+            "# Solar storage doubles",
+            "",
+            "Grid batteries [grew fast](https://example.com/report) in 2024.",
+            "We use cookies to improve your experience.",
+            "| Year | GWh |",
+            "|------|-----|",
+            "| 2023 | 10 |",
+            "",
+            "Ana Ruiz covers energy storage.",
+            "[Follow her](https://example.com/ana) for updates.",
+            "",
+            "Ana Ruiz covers energy storage.",
+            "[Follow her](https://example.com/ana) for updates.",
+            "© 2024 Example Media. All rights reserved.",
+        ])
+        text, stats = clean_markdown(markdown)
+        self.assert_true("Home" not in text and "Weather" not in text, "Navigation links are dropped")
+        self.assert_true("logo" not in text and "https://" not in text, "Image and link markup is stripped")
+        self.assert_true("grew fast in 2024." in text, "Link text is kept")
+        self.assert_true("cookies" not in text and "rights reserved" not in text, "Cookie banners and footers are dropped")
+        self.assert_equal(text.count("Ana Ruiz covers"), 1, "Repeated blocks are collapsed")
+        self.assert_true("|------|-----|" in text and "| 2023 | 10 |" in text, "Tables are kept")
+        self.assert_equal((stats.chars_in, stats.chars_out), (len(markdown), len(text)), "Article stats count chars in and out")
+
+        recipe = "\n".join([
+            "# Chocolate chip cookies",
+            "",
+            "Is it worth chilling the dough?",
+            "",
+            "Yes.",
+            "",
+            "Bake the cookies for 12 minutes.",
+            "",
+            "Does the pan matter?",
+            "",
+            "Yes.",
+            "",
+            "```python",
+            "total = 0",
+            "total = 0",
+            "```",
+            "",
+            "```python",
+            "total = 0",
+            "total = 0",
+            "```",
+            "Share this: [Twitter](https://x.com) [Email](mailto:a@b.c)",
+        ])
+        text, _ = clean_markdown(recipe)
+        self.assert_true(
+            "# Chocolate chip cookies" in text and "Bake the cookies for 12 minutes." in text,
+            "Cookie recipes are not mistaken for cookie banners",
+        )
+        self.assert_equal(text.count("Yes."), 2, "Repeated prose lines are kept")
+        self.assert_equal(text.count("```python\ntotal = 0\ntotal = 0\n```"), 2, "Fenced code is never deduplicated")
+        self.assert_true("Share this" not in text, "Link-built share banners are dropped")
+
+        captions = [
+            "[Music]",
+            "um so today we're going to",
+            "so today we're going to talk about",
+            "going to talk about the the battery",
+            "going to talk about the the battery",
+            "one of the",
+            "of the best ideas",
+        ]
+        transcript, stats = clean_captions(captions)
+        self.assert_equal(
+            transcript,
+            "so today we're going to talk about the battery one of the of the best ideas",
+            "Captions lose tags, filler, stutters, repeats and roll-over",
+        )
+        self.assert_equal(stats.chars_in, len(" ".join(captions)), "Caption stats count the joined input")
+        self.assert_true(stats.tokens_saved > 0, "Caption cleanup reports tokens saved")
+        self.assert_equal(
+            CleanupStats("article", 1000, 600).describe(),
+            "Cleaned article: removed 400 chars (~100 tokens, 40%)",
+            "Cleanup report is human readable",
+        )
+        self.assert_equal(clean_captions([])[0], "", "Empty captions give an empty transcript")
+
+        cleaned_on = []
+        saved = tools.clean_article, async_tools.extract_article_sequential_async
+
+        async def extract_stub(url):
+            return "Some article text.", "Stub"
+
+        tools.clean_article = lambda text: cleaned_on.append(threading.current_thread()) or ""
+        async_tools.extract_article_sequential_async = extract_stub
+        try:
+            result = asyncio.run(async_tools.scrape_article_async("https://example.com"))
+            self.assert_true(result.startswith("❌"), "Articles with nothing left after cleanup are rejected")
+            self.assert_true(
+                len(cleaned_on) == 1 and cleaned_on[0] is not threading.main_thread(),
+                "Async article cleanup runs off the event loop",
+            )
+        finally:
+            tools.clean_article, async_tools.extract_article_sequential_async = saved
+
+    # ── Provider Stand-in Tests ──
+    def test_provider_standin(self):
+        self.section("Provider Stand-in")
+        self.assert_equal(str(Latency.parse("lognormal:800:0.4")), "lognormal:800:0.4", "Latency specs round-trip")
+        self.assert_equal(Latency.parse("250").sample_ms(random.Random(0)), 250.0, "A bare number is a fixed latency")
+
+        server = start_standin(seed=0)
+        base = server.base_url
+
+        def call(path, payload=None, headers=None):
+            data = payload if isinstance(payload, bytes) or payload is None else json.dumps(payload).encode()
+            request = urllib.request.Request(base + path, data=data, headers=headers or {"Content-Type": "application/json"})
+            try:
+                with urllib.request.urlopen(request, timeout=5) as response:
+                    return response.status, dict(response.headers), response.read()
+            except urllib.error.HTTPError as e:
+                return e.code, dict(e.headers), e.read()
+
+        try:
+            prompt = {"contents": [{"parts": [{"text": "Summarize this"}], "role": "user"}]}
+            status, _, body = call("/v1beta/models/gemini-1.5-flash:generateContent", prompt)
+            text = json.loads(body)["candidates"][0]["content"]["parts"][0]["text"]
+            self.assert_true(status == 200 and "Quick Take" in text, "Gemini generateContent answers in summary format")
+
+            call("/_standin/config", {"stream_chunks": 4, "stream_delay_ms": 50})
+            started = time.time()
+            status, headers, body = call("/v1beta/models/gemini-1.5-flash:streamGenerateContent", prompt)
+            self.assert_equal(len(json.loads(body)), 4, "Gemini streams a JSON array of chunks")
+            self.assert_true(time.time() - started >= 0.15 and headers.get("Transfer-Encoding") == "chunked", "Streamed chunks are paced")
+
+            chat = {"model": "m", "tools": [{}], "messages": [{"role": "user", "content": "Summarize https://youtu.be/dQw4w9WgXcQ"}]}
+            message = json.loads(call("/openai/v1/chat/completions", chat)[2])["choices"][0]["message"]
+            self.assert_equal(message["tool_calls"][0]["function"]["name"], "youtube_tool", "Groq chat calls the matching tool")
+
+            whisper = b'--b\r\nContent-Disposition: form-data; name="response_format"\r\n\r\ntext\r\n--b--\r\n'
+            status, headers, body = call("/openai/v1/audio/transcriptions", whisper, {"Content-Type": "multipart/form-data; boundary=b"})
+            self.assert_true(headers["Content-Type"].startswith("text/plain") and len(body) > 1000, "Whisper honors response_format=text")
+
+            status, _, body = call("/v1/scrape", {"url": "https://example.com/a", "formats": ["markdown"]})
+            self.assert_true(json.loads(body)["data"]["markdown"].startswith("- [Home]"), "Firecrawl scrape returns markdown")
+
+            call("/_standin/config", {"faults": {"gemini": {"429": 1.0}, "firecrawl": {"500": 1.0}}})
+            status, headers, body = call("/v1beta/models/gemini-1.5-flash:generateContent", prompt)
+            self.assert_equal((status, headers.get("Retry-After"), json.loads(body)["error"]["status"]),
+                              (429, "1", "RESOURCE_EXHAUSTED"), "Injected 429s carry Retry-After and Gemini's error body")
+            self.assert_equal(call("/v1/scrape", {"url": "https://example.com/a"})[0], 500, "Injected 500s are returned")
+
+            stats = json.loads(call("/_standin/stats")[2])["requests"]
+            self.assert_equal(stats["gemini"], {"200": 2, "429": 1}, "Stats count requests by provider and status")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        config = tools.get_config()
+        saved = config.endpoints.groq_base_url, os.environ.get("GROQ_API_KEY")
+        config.endpoints.groq_base_url = base
+        os.environ["GROQ_API_KEY"] = "standin"
+        try:
+            client = tools.get_groq_client()
+            self.assert_equal(str(client.base_url).rstrip("/"), base, "Groq client honors OMEGA_GROQ_BASE_URL")
+        except ImportError:
+            print("  ⏭️  Skipping client override check (groq not installed)")
+        finally:
+            config.endpoints.groq_base_url = saved[0]
+            if saved[1] is None:
+                del os.environ["GROQ_API_KEY"]
+            else:
+                os.environ["GROQ_API_KEY"] = saved[1]
+
+    # ── Tracing Tests ──
+    def test_tracing(self):
+        self.section("Tracing & Metrics")
+
+        @traced("stub.tool")
+        def failing_tool():
+            return "❌ stub failure"
+
+        @traced("stub.async")
+        async def async_stage():
+            await asyncio.sleep(0.01)
+            return "ok"
+
+        entries = []
+        with log_sink(entries.append), start_trace("req-42") as trace:
+            with span("request") as root:
+                with span("extract"):
+                    time.sleep(0.02)
+                worker = traced("worker", log=False)(time.sleep)
+                with ThreadPoolExecutor(max_workers=2) as pool:
+                    list(pool.map(lambda ctx: ctx.run(worker, 0.01), [copy_context(), copy_context()]))
+                failing_tool()
+                asyncio.run(async_stage())
+            with start_trace("ignored") as nested:
+                self.assert_true(nested is trace, "Nested start_trace reuses the active trace")
+
+        rows = {row["stage"]: row for row in trace.timings()}
+        self.assert_true(rows["extract"]["total_ms"] >= 20 and rows["extract"]["depth"] == 1, "Spans are timed and nested")
+        self.assert_equal(rows["worker"]["calls"], 2, "Spans from worker threads join the request's trace")
+        self.assert_equal(rows["stub.tool"]["errors"], 1, "Error responses mark the span as failed")
+        self.assert_equal(rows["stub.async"]["calls"], 1, "Async functions are traced")
+        self.assert_true(root.status == "ok" and rows["request"]["offset_ms"] < 5, "Root span starts with the trace")
+        logged = {entry["tool"]: entry for entry in entries}
+        self.assert_true("worker" not in logged and "duration_ms" in logged["extract"], "Only logged spans reach the execution log")
+        self.assert_true(all(entry.get("request_id") == "req-42" for entry in entries), "Log entries carry the correlation ID")
+        self.assert_equal(sanitize_request_id(' abc-123\n"x" '), "abc-123x", "Caller-supplied request IDs are sanitized")
+
+        metrics = StageMetrics(buckets=(0.1, 1.0))
+        for seconds in (0.05, 0.5, 2.0):
+            metrics.observe("scrape", "ok", seconds)
+        text = metrics.render()
+        self.assert_true('omega_stage_duration_seconds_bucket{stage="scrape",status="ok",le="0.1"} 1' in text, "Buckets are cumulative")
+        self.assert_true('le="+Inf"} 3' in text and "omega_stage_duration_seconds_sum{stage=\"scrape\",status=\"ok\"} 2.550000" in text,
+                         "Histogram exports +Inf, sum and count")
+
+        server = serve_metrics("127.0.0.1", 0)
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics", timeout=5) as response:
+            body = response.read().decode()
+        self.assert_true(response.headers["Content-Type"].startswith("text/plain; version=0.0.4") and 'stage="extract"' in body,
+                         "Metrics endpoint serves the process-wide histograms")
+        self.assert_true(get_metrics().snapshot()[("stub.tool", "error")]["count"] >= 1, "Failed spans are counted by status")
+
+    # ── Structured Logging Tests ──
+    def test_json_logging(self):
+        self.section("Structured Logging")
+        app_logger = logging.getLogger(APP_NAME)
+
+        def with_json_log(settings, emit):
+            """Run emit() with JSON logging on the app logger, then restore its console handlers."""
+            saved = app_logger.handlers[:], app_logger.level, app_logger.propagate
+            app_logger.handlers.clear()
+            omega_logger.setup_json_logging(app_logger, settings)
+            try:
+                return emit()
+            finally:
+                omega_logger.shutdown_json_logging()
+                app_logger.handlers[:], app_logger.propagate = saved[0], saved[2]
+                app_logger.setLevel(saved[1])
+
+        def read_lines(*paths):
+            lines = []
+            for path in paths:
+                with open(path, encoding="utf-8") as f:
+                    lines += [json.loads(line) for line in f]
+            return lines
+
+        def request():
+            with log_sink(lambda entry: None), start_trace("req-json"):
+                add_log("router", "Routed to article_tool", "success")
+                with span("extract"):
+                    time.sleep(0.005)
+                with span("firecrawl", log=False):
+                    pass
+                app_logger.info("Cache %s for %s", "miss", "yt:abc")
+
+        def hot_path(calls=2000):
+            started = time.perf_counter()
+            for i in range(calls):
+                app_logger.info("hot path %d", i)
+            return (time.perf_counter() - started) / calls * 1e6
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "omega.jsonl")
+            with_json_log(LoggingConfig(json_lines=True, path=path), request)
+            records = read_lines(path)
+
+            rotated = os.path.join(tmp, "logs", "omega.jsonl")
+            per_call_us = with_json_log(LoggingConfig(json_lines=True, path=rotated, max_bytes=4096, backup_count=2), hot_path)
+            files = sorted(os.listdir(os.path.dirname(rotated)))
+            lines = read_lines(rotated + ".2", rotated + ".1", rotated)
+
+        by_tool = {record.get("tool"): record for record in records}
+        self.assert_true(all({"ts", "level", "logger", "msg"} <= r.keys() for r in records + lines), "Every line is a JSON object")
+        self.assert_true(all(record.get("request_id") == "req-json" for record in records), "Records carry the request ID")
+        self.assert_true(by_tool["extract"]["duration_ms"] >= 5 and by_tool["extract"]["status"] == "success",
+                         "Stage timings are structured fields")
+        self.assert_true("firecrawl" in by_tool, "Worker-thread spans reach the JSON log")
+        self.assert_equal(records[-1]["msg"], "Cache miss for yt:abc", "Plain logger calls are formatted")
+        self.assert_equal(files, ["omega.jsonl", "omega.jsonl.1", "omega.jsonl.2"], "JSON log rotates by size and keeps backups")
+        self.assert_equal(lines[-1]["msg"], "hot path 1999", "Shutdown flushes queued records")
+        self.assert_true(per_call_us < 200, f"Queued log calls stay cheap ({per_call_us:.1f} µs each)")
+
+    # ── Request Coalescing Tests ──
+    def test_request_coalescing(self):
+        self.section("Request Coalescing")
+        flight = SingleFlight()
+        calls, release = [], threading.Event()
+
+        def work():
+            calls.append(1)
+            release.wait(2)
+            return "summary"
+
+        joined = []
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = [pool.submit(flight.do, "k", work, lambda: joined.append(1)) for _ in range(8)]
+            while len(joined) < 7 and futures:
+                time.sleep(0.005)
+            release.set()
+            outcomes = [future.result() for future in futures]
+        self.assert_equal(len(calls), 1, "Concurrent calls for one key run the work once")
+        self.assert_true(all(result == "summary" for result, _ in outcomes) and sum(shared for _, shared in outcomes) == 7,
+                         "Every waiter receives the leader's result")
+        self.assert_equal(flight.in_flight(), 0, "Keys are released once the call settles")
+
+        def boom():
+            release.wait(2)
+            raise ConnectionError("provider down")
+
+        release.clear()
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [pool.submit(flight.do, "err", boom) for _ in range(3)]
+            while flight.stats()["followers"] < 9:
+                time.sleep(0.005)
+            release.set()
+            errors = [type(future.exception()).__name__ for future in futures]
+        self.assert_equal(errors, ["ConnectionError"] * 3, "Exceptions propagate to every waiter")
+        self.assert_equal(flight.do("err", lambda: "recovered"), ("recovered", False), "Failures are not cached")
+
+        # execute_tool: threads and coroutines share one registry, keyed by canonical source
+        config = tools.get_config()
+        saved = config.cache.enabled, tools.TOOL_DISPATCH["article_tool"], async_tools.ASYNC_TOOL_DISPATCH["article_tool"]
+        runs = []
+
+        def slow_tool(args):
+            runs.append(args["url"])
+            time.sleep(0.2)
+            return f"summary of {args['url']}"
+
+        async def slow_tool_async(args):
+            runs.append(args["url"])
+            await asyncio.sleep(0.2)
+            return f"summary of {args['url']}"
+
+        config.cache.enabled = False
+        tools.TOOL_DISPATCH["article_tool"] = slow_tool
+        async_tools.ASYNC_TOOL_DISPATCH["article_tool"] = slow_tool_async
+        urls = [f"https://example.com/shared?utm_source={i}" for i in range(6)]
+
+        def summarize(url):
+            with log_sink(lambda entry: None):
+                return tools.execute_tool("article_tool", {"url": url})
+
+        try:
+            with log_sink(lambda entry: None), ThreadPoolExecutor(max_workers=6) as pool:
+                results = list(pool.map(summarize, urls))
+
+                async def mixed():
+                    first = pool.submit(summarize, urls[0])
+                    await asyncio.sleep(0.05)
+                    joined = await asyncio.gather(*(async_tools.execute_tool_async("article_tool", {"url": url}) for url in urls))
+                    return [first.result(), *joined]
+
+                mixed_results = asyncio.run(mixed())
+        finally:
+            config.cache.enabled = saved[0]
+            tools.TOOL_DISPATCH["article_tool"] = saved[1]
+            async_tools.ASYNC_TOOL_DISPATCH["article_tool"] = saved[2]
+        self.assert_equal(len(runs), 2, "URL variants of one source reach the provider once per burst")
+        self.assert_true(len(set(results)) == 1 and len(set(mixed_results)) == 1, "Sync and async callers share the result")
+
+    # ── Rate Limiting Tests ──
+    def test_rate_limiting(self):
+        self.section("Rate Limiting")
+        self.assert_equal(
+            parse_quotas("gemini:*=2000/4000000, groq:whisper-large-v3-turbo=20,bad=1,groq:x=fast"),
+            {"gemini:*": ProviderQuota(2000, 4000000), "groq:whisper-large-v3-turbo": ProviderQuota(20)},
+            "Quota overrides are parsed and malformed entries skipped",
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            config = RateLimitConfig(
+                path=os.path.join(tmp, "rate_limits.db"),
+                quotas={"p:*": ProviderQuota(rpm=60), "p:free": ProviderQuota(0), "fast:*": ProviderQuota(rpm=0, tpm=600)},
+            )
+            limiter = RateLimiter(config)
+            waits = [limiter.acquire("p", "m") for _ in range(60)]
+            self.assert_true(all(wait == 0 for wait in waits), "A full bucket allows one minute's burst")
+            self.assert_true(0.9 < limiter.acquire("p", "m") < 1.1, "The RPM budget queues the next request")
+            self.assert_equal(limiter.acquire("p", "free"), 0.0, "A zero budget is unlimited")
+            self.assert_equal(limiter.acquire("other", "m"), 0.0, "Providers without a quota are not limited")
+
+            other_process = RateLimiter(config)
+            wait = other_process.acquire("p", "models/m")
+            self.assert_true(1.9 < wait < 2.1, "Instances sharing the database share the budget (queued after earlier callers)")
+
+            tpm = RateLimiter(RateLimitConfig(path=config.path, quotas={"t:*": ProviderQuota(rpm=0, tpm=600, completion_tokens=50)}))
+            tpm.acquire("t", "m", tokens=550)
+            self.assert_true(9.5 < tpm.acquire("t", "m", tokens=50) < 10.5, "Estimated prompt and completion tokens are charged to the TPM budget")
+
+            before = limiter.snapshot()["buckets"]
+            with request_deadline(0.05):
+                try:
+                    limiter.acquire("p", "m")
+                    failed = False
+                except DeadlineExceededError:
+                    failed = True
+            self.assert_true(failed, "A wait past the request deadline fails fast")
+            self.assert_equal(limiter.snapshot()["buckets"], before, "A refused reservation takes nothing")
+
+            saved = ratelimit._limiter
+            ratelimit._limiter = limiter
+            try:
+                limiter.acquire("fast", "m", tokens=600)
+                started = time.perf_counter()
+                result = retry_with_backoff(lambda: "ok", provider="fast", quota=("m", 1))
+                elapsed = time.perf_counter() - started
+
+                reserved_on = []
+                acquire = limiter.acquire
+                limiter.acquire = lambda *args: reserved_on.append(threading.current_thread()) or acquire(*args)
+
+                async def throttled():
+                    await ratelimit.throttle_async("fast", "m", 1)
+                    with request_deadline(0.05):
+                        try:
+                            await ratelimit.throttle_async("p", "m")
+                        except DeadlineExceededError:
+                            return True
+                    return False
+
+                deadline_honored = asyncio.run(throttled())
+                del limiter.acquire
+
+                down = get_breaker("down")
+                down.failure_threshold, down.reset_seconds = 1, 60
+                down.record_failure()
+                limiter.config.quotas["down:*"] = ProviderQuota(rpm=60)
+                before = limiter.snapshot()["buckets"]
+                refused = []
+                for call in (
+                    lambda: retry_with_backoff(lambda: "ok", provider="down", quota=("m", 1)),
+                    lambda: asyncio.run(async_retry_with_backoff(asyncio.sleep, provider="down", quota=("m", 1))),
+                ):
+                    try:
+                        call()
+                    except CircuitOpenError:
+                        refused.append(True)
+                open_breaker_spent = limiter.snapshot()["buckets"] != before
+                down.record_success()
+            finally:
+                ratelimit._limiter = saved
+                for instance in (limiter, other_process, tpm):
+                    instance.close()
+            self.assert_true(result == "ok" and elapsed >= 0.08, "retry_with_backoff waits for quota instead of failing")
+            self.assert_true(
+                len(reserved_on) == 2 and threading.main_thread() not in reserved_on,
+                "Async reservations run off the event loop",
+            )
+            self.assert_true(deadline_honored, "Async reservations see the request deadline")
+            self.assert_true(
+                refused == [True, True] and not open_breaker_spent,
+                "An open circuit fails fast without spending quota",
+            )
+
+    # ── Provider Client Registry Tests ──
+    def test_provider_clients(self):
+        self.section("Provider Clients")
+        try:
+            import groq  # noqa: F401
+        except ImportError:
+            print("  ⏭️  Skipping client registry tests (groq not installed)")
+            return
+
+        server = start_standin(seed=0)
+        config = tools.get_config()
+        saved = (config.endpoints.groq_base_url, config.endpoints.firecrawl_base_url,
+                 os.environ.get("GROQ_API_KEY"), os.environ.get("FIRE_CRAWL_KEY"))
+        config.endpoints.groq_base_url = config.endpoints.firecrawl_base_url = server.base_url
+        os.environ["GROQ_API_KEY"] = os.environ["FIRE_CRAWL_KEY"] = "standin"
+        registry = ClientRegistry(ClientPoolConfig())
+        messages = [{"role": "user", "content": "Summarize https://example.com/a"}]
+
+        try:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                clients = list(pool.map(lambda _: registry.groq(), range(8)))
+            self.assert_true(all(client is clients[0] for client in clients), "Concurrent sessions share one Groq client")
+
+            for _ in range(3):
+                clients[0].chat.completions.create(model="llama-3.3-70b-versatile", messages=messages)
+            markdown = tools.scrape_markdown(registry.firecrawl(), "https://example.com/a")
+            stats = registry.stats()
+            self.assert_true(markdown.startswith("- [Home]"), "Firecrawl scrapes through the shared pool")
+            self.assert_equal(
+                (stats["sync"]["requests"], stats["sync"]["connections_opened"]), (4, 1),
+                "Warm Groq and Firecrawl requests reuse one pooled connection",
+            )
+            self.assert_equal((stats["sync"]["open"], stats["sync"]["idle"]), (1, 1), "The connection is kept alive between requests")
+            self.assert_equal((stats["clients"]["groq"], stats["clients"]["firecrawl"]), (1, 1), "Each client is built once")
+
+            async def orchestrate_twice():
+                client = registry.async_groq()
+                for _ in range(2):
+                    await client.chat.completions.create(model="llama-3.3-70b-versatile", messages=messages)
+                return client is registry.async_groq()
+
+            self.assert_true(asyncio.run(orchestrate_twice()), "The event loop reuses its AsyncGroq client")
+            self.assert_equal(registry.stats()["async"]["connections_opened"], 1, "Async calls reuse their loop's pool")
+
+            server.config.update({"faults": {"firecrawl": {"503": 1.0}}})
+            try:
+                tools.scrape_markdown(registry.firecrawl(), "https://example.com/a")
+                error = None
+            except Exception as e:
+                error = e
+            self.assert_true(error is not None and is_retryable(error), "Firecrawl HTTP errors are classified by status code")
+        finally:
+            registry.close()
+            server.shutdown()
+            server.server_close()
+            config.endpoints.groq_base_url, config.endpoints.firecrawl_base_url = saved[0], saved[1]
+            for name, value in (("GROQ_API_KEY", saved[2]), ("FIRE_CRAWL_KEY", saved[3])):
+                if value is None:
+                    del os.environ[name]
+                else:
+                    os.environ[name] = value
+
     # ── API Connectivity Tests ──
     def test_api_connectivity(self):
         self.section("API Connectivity")
@@ -7,33 +7,70 @@ Features:
 - Custom exception handling for granular error reporting
 - Content-type-specific prompt selection via build_summarize_prompt()
 - Audio file validation before processing
+- Persistent summary cache consulted before dispatching a tool
+- Near-duplicate texts (syndicated or mirrored pages) reuse an earlier summary
+- Map-reduce summarization of long inputs on a bounded thread pool
+- Optional salience-based pre-compression of long inputs (NumPy TextRank)
+- Markup, page chrome and caption noise stripped before summarization
+- Hedged article extraction that races Firecrawl against Trafilatura
+- Optional token streaming of the final Gemini summary to a caller-supplied sink
 """
 
+import importlib
 import os
-import re
-import time
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
 from dotenv import load_dotenv
 
 load_dotenv()
 
-# ── SDK imports ──────────────────────────────────────────
-import google.generativeai as genai
-from firecrawl import FirecrawlApp
-from youtube_transcript_api import YouTubeTranscriptApi
-from groq import Groq
-import trafilatura
+# Provider SDKs (google.generativeai, firecrawl, groq, youtube_transcript_api,
+# trafilatura) are imported on first use — see API CLIENT INITIALIZATION.
 
-from prompts import SUMMARIZE_PROMPT, build_summarize_prompt
+from prompts import (
+    SUMMARIZE_PROMPT,
+    YOUTUBE_ANALYSIS_PROMPT,
+    build_summarize_prompt,
+    build_chunk_prompt,
+)
+from config import get_config
 from constants import (
     GEMINI_MODEL_PRIORITIES,
     GEMINI_FALLBACK_MODEL,
     MAX_ARTICLE_LENGTH,
+    CHARS_PER_TOKEN,
+    EXTRACTION_POOL_WORKERS,
     WHISPER_MODEL,
     WHISPER_RESPONSE_FORMAT,
-    YOUTUBE_VIDEO_ID_PATTERNS,
+    MAX_AUDIO_FILE_SIZE_MB,
+)
+from utils import (
+    validate_audio_file,
+    truncate_text,
+    is_error_response,
+    estimate_tokens,
+    split_into_chunks,
 )
-from utils import validate_audio_file, truncate_text
+from canonical import source_identity, extract_video_id
+from cache import (
+    get_summary_cache,
+    make_cache_key,
+    discovery_fingerprint,
+    load_discovered_model,
+    save_discovered_model,
+)
+from dedup import get_near_duplicate_index, dedup_scope
+from coalesce import SingleFlight
+from clients import get_clients
+from salience import salient_extract, is_available as salience_available
+from cleanup import CleanupStats, clean_markdown, clean_captions
+from omega_summarizer.utils import add_log
+from retry import retry_with_backoff, request_deadline
+from tracing import span, traced
+from audio import AudioHandle, AudioSegment, get_audio_handle, split_audio, stitch_transcripts
 from exceptions import (
     APIKeyMissingError,
     APICallError,
@@ -43,96 +80,320 @@ from exceptions import (
     AudioProcessingError,
     EmptyTranscriptionError,
     SummarizationError,
+    RequestCancelledError,
 )
 
 
 # ═════════════════════════════════════════════════════════
-#  RETRY DECORATOR — Exponential backoff for API calls
+#  API CLIENT INITIALIZATION
 # ═════════════════════════════════════════════════════════
-def retry_with_backoff(func, max_retries: int = 3, base_delay: float = 1.0):
-    """
-    Retry a function call with exponential backoff.
-    
-    Args:
-        func: Callable to retry.
-        max_retries: Maximum number of retry attempts.
-        base_delay: Initial delay in seconds (doubles each retry).
-    
-    Returns:
-        The result of the function call.
-    
-    Raises:
-        The last exception if all retries fail.
-    """
-    last_exception = None
-    for attempt in range(max_retries + 1):
-        try:
-            return func()
-        except Exception as e:
-            last_exception = e
-            if attempt < max_retries:
-                delay = base_delay * (2 ** attempt)
-                time.sleep(delay)
-    raise last_exception
+def choose_gemini_model(available_models: list[str]) -> str | None:
+    """Pick the first model from GEMINI_MODEL_PRIORITIES that the key can use."""
+    for p in GEMINI_MODEL_PRIORITIES:
+        for m in available_models:
+            if m.endswith(p):
+                return m
+    return available_models[0] if available_models else None
 
 
-# ═════════════════════════════════════════════════════════
-#  API CLIENT INITIALIZATION
-# ═════════════════════════════════════════════════════════
 def get_gemini_model():
-    key = os.getenv("GOOGLE_API_KEY")
-    if not key or key.startswith("your_"):
+    genai = get_clients().gemini()
+    if genai is None:
         return None
+
+    # Overridden endpoints (e.g. standin.py) are reached over REST and are
+    # not recorded in the discovery cache, which belongs to the real API.
+    key = os.getenv("GOOGLE_API_KEY")
+    base_url = get_config().endpoints.gemini_base_url
+    cache_config = get_config().cache
+    fingerprint = discovery_fingerprint(key, GEMINI_MODEL_PRIORITIES)
+    cached = load_discovered_model(fingerprint, cache_config) if not base_url else None
+    if cached:
+        return genai.GenerativeModel(cached)
+
     try:
-        genai.configure(api_key=key)
         available_models = [
             m.name for m in genai.list_models()
             if 'generateContent' in m.supported_generation_methods
         ]
-        
-        for p in GEMINI_MODEL_PRIORITIES:
-            for m in available_models:
-                if m.endswith(p):
-                    return genai.GenerativeModel(m)
-        
-        if available_models:
-            return genai.GenerativeModel(available_models[0])
-            
     except Exception:
         return genai.GenerativeModel(GEMINI_FALLBACK_MODEL)
-    
-    return None
 
-def get_firecrawl_app():
-    key = os.getenv("FIRE_CRAWL_KEY")
-    if not key or key.startswith("your_"):
-        return None
-    try:
-        return FirecrawlApp(api_key=key)
-    except Exception:
+    model_name = choose_gemini_model(available_models)
+    if model_name is None:
         return None
+    if not base_url:
+        save_discovered_model(fingerprint, model_name, cache_config)
+    return genai.GenerativeModel(model_name)
+
+def get_firecrawl_app():
+    return get_clients().firecrawl()
 
 def get_groq_client():
-    key = os.getenv("GROQ_API_KEY")
-    if not key or key.startswith("your_"):
+    return get_clients().groq()
+
+
+# Initialize lazily: module attributes are built on first access (PEP 562),
+# so importing this module costs no SDK imports and no network calls.
+_LAZY_ATTRIBUTES = {
+    "gemini_model": get_gemini_model,
+    "firecrawl": get_firecrawl_app,
+    "groq_client": get_groq_client,
+    "trafilatura": lambda: importlib.import_module("trafilatura"),
+}
+_lazy_lock = threading.Lock()
+
+
+def __getattr__(name: str):
+    factory = _LAZY_ATTRIBUTES.get(name)
+    if factory is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with _lazy_lock:
+        if name not in globals():
+            globals()[name] = factory()
+    return globals()[name]
+
+
+def _lazy(name: str):
+    """Return a lazily initialized module attribute (or its test override)."""
+    return globals()[name] if name in globals() else __getattr__(name)
+
+
+# ═════════════════════════════════════════════════════════
+#  TOKEN STREAMING — Pipe Gemini output to the caller as it arrives
+# ═════════════════════════════════════════════════════════
+_token_sink: ContextVar = ContextVar("omega_token_sink", default=None)
+
+
+@contextmanager
+def stream_tokens(callback):
+    """Stream the final summary in the current context to callback(text_chunk)."""
+    token = _token_sink.set(callback)
+    try:
+        yield
+    finally:
+        _token_sink.reset(token)
+
+
+def current_token_sink():
+    """Return the token callback active in this context, or None when not streaming."""
+    if not get_config().models.stream_summaries:
         return None
-    return Groq(api_key=key)
+    return _token_sink.get()
+
+
+def gemini_quota(gemini_model, prompt: str) -> tuple[str, int]:
+    """The `quota` argument of retry_with_backoff for one Gemini call."""
+    return gemini_model.model_name, estimate_tokens(prompt)
+
+
+@traced("gemini")
+def generate_final_summary(prompt: str) -> str:
+    """
+    Generate the final summary, streaming chunks to the active token sink if any.
+    Only opening the stream is retried — once chunks have been delivered a
+    failure is reported instead of re-sending text the caller already showed.
+    """
+    gemini_model = _lazy("gemini_model")
+    sink = current_token_sink()
+    if sink is None:
+        response = retry_with_backoff(
+            lambda: gemini_model.generate_content(prompt),
+            max_retries=2,
+            base_delay=1.0,
+            provider="gemini",
+            quota=gemini_quota(gemini_model, prompt),
+        )
+        return response.text
+
+    stream = retry_with_backoff(
+        lambda: gemini_model.generate_content(prompt, stream=True),
+        max_retries=2,
+        base_delay=1.0,
+        provider="gemini",
+        quota=gemini_quota(gemini_model, prompt),
+    )
+    parts = []
+    for chunk in stream:
+        text = chunk.text
+        if text:
+            parts.append(text)
+            sink(text)
+    return "".join(parts)
+
+
+# ═════════════════════════════════════════════════════════
+#  HELPER — Map step for long inputs
+# ═════════════════════════════════════════════════════════
+@traced("map")
+def condense_in_chunks(
+    text: str, source_type: str, chunk_size_tokens: int, max_workers: int, max_chunks: int | None = None
+) -> str:
+    """
+    Map step of chunked summarization: split the text on paragraph/sentence
+    boundaries and condense every chunk concurrently into notes.
+    At most `max_chunks` chunks are condensed (callers fit the text first, so
+    this only trims packing overflow, and reports it). Returns the notes joined in original
+    order. Raises if any chunk fails.
+    """
+    gemini_model = _lazy("gemini_model")
+    chunks = split_into_chunks(text, chunk_size_tokens)
+    if max_chunks is not None and len(chunks) > max_chunks:
+        report_partial_input(f"dropping the last {len(chunks) - max_chunks} of {len(chunks)} chunks", max_chunks)
+        chunks = chunks[:max_chunks]
+    total = len(chunks)
+
+    @traced("gemini.chunk", log=False)
+    def condense(indexed_chunk: tuple[int, str]) -> str:
+        index, chunk = indexed_chunk
+        prompt = build_chunk_prompt(chunk, index + 1, total, source_type)
+        response = retry_with_backoff(
+            lambda: gemini_model.generate_content(prompt),
+            max_retries=2,
+            base_delay=1.0,
+            provider="gemini",
+            quota=gemini_quota(gemini_model, prompt),
+        )
+        return response.text.strip()
+
+    # Each worker runs in a copy of the caller's context so the request deadline applies
+    contexts = [copy_context() for _ in chunks]
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, total))) as pool:
+        notes = list(pool.map(lambda ctx, item: ctx.run(condense, item), contexts, enumerate(chunks)))
+
+    return "\n\n".join(
+        f"### Part {index + 1} of {total}\n{note}" for index, note in enumerate(notes)
+    )
+
+
+# ═════════════════════════════════════════════════════════
+#  HELPER — Content cleanup
+# ═════════════════════════════════════════════════════════
+def report_cleanup(stats: CleanupStats) -> None:
+    """Log how much a cleanup pass saved, if anything."""
+    if stats.chars_saved:
+        add_log("cleanup", stats.describe(), "success")
+
+
+def clean_article(content: str) -> str:
+    """Strip markup, navigation and boilerplate from an extracted article."""
+    if not get_config().processing.cleanup_enabled:
+        return content
+    cleaned, stats = clean_markdown(content)
+    report_cleanup(stats)
+    return cleaned
 
 
-# Initialize lazily
-gemini_model = get_gemini_model()
-firecrawl = get_firecrawl_app()
-groq_client = get_groq_client()
+def join_captions(entries: list[str]) -> str:
+    """Join caption entries into a transcript, de-noised unless cleanup is off."""
+    if not get_config().processing.cleanup_enabled:
+        return " ".join(entries)
+    text, stats = clean_captions(entries)
+    report_cleanup(stats)
+    return text
+
+
+# ═════════════════════════════════════════════════════════
+#  HELPER — Salience pre-compression
+# ═════════════════════════════════════════════════════════
+def compress_for_prompt(text: str) -> str:
+    """
+    Keep the most salient sentences of a long input, shrinking it to the
+    configured keep ratio. A no-op when disabled, for short inputs, or
+    when NumPy is not installed.
+    """
+    processing = get_config().processing
+    tokens = estimate_tokens(text)
+    if not processing.salience_enabled or tokens <= processing.salience_min_tokens:
+        return text
+    if not salience_available():
+        return text
+    budget = max(processing.salience_min_tokens, int(tokens * processing.salience_keep_ratio))
+    return salient_extract(text, budget)
+
+
+def fit_article_length(content: str) -> str:
+    """Bring an article within MAX_ARTICLE_LENGTH: by salience when enabled, else by truncation."""
+    if (
+        len(content) > MAX_ARTICLE_LENGTH
+        and get_config().processing.salience_enabled
+        and salience_available()
+    ):
+        return salient_extract(content, MAX_ARTICLE_LENGTH // CHARS_PER_TOKEN)
+    return truncate_text(content, MAX_ARTICLE_LENGTH)
+
+
+def fit_chunked_input(text: str) -> str:
+    """
+    Bound the map step: text longer than max_chunks chunks is fitted to that
+    budget (by salience when enabled, else by truncation) before it is split,
+    so a huge page cannot fan out into an unbounded number of Gemini calls.
+    The execution log says so, since the summary then covers only part of the input.
+    """
+    processing = get_config().processing
+    budget = max(1, processing.max_chunks) * processing.chunk_size_tokens
+    tokens = estimate_tokens(text)
+    if tokens <= budget:
+        return text
+    if processing.salience_enabled and salience_available():
+        fitted, kept = salient_extract(text, budget), "the most salient"
+    else:
+        fitted, kept = truncate_text(text, budget * CHARS_PER_TOKEN), "the first"
+    report_partial_input(f"summarizing {kept} ~{budget:,} of ~{tokens:,} tokens", processing.max_chunks)
+    return fitted
+
+
+def report_partial_input(detail: str, max_chunks: int) -> None:
+    """Warn in the execution log that the summary will not cover the whole input."""
+    add_log(
+        "summarizer",
+        f"Input exceeds {max_chunks} chunks (OMEGA_MAX_CHUNKS): {detail} — the summary is partial",
+        "error",
+    )
 
 
 # ═════════════════════════════════════════════════════════
 #  HELPER — Gemini summarization with retry
 # ═════════════════════════════════════════════════════════
 def summarize_with_gemini(text: str, source_type: str = "content", extraction_method: str | None = None) -> str:
-    """Send extracted text to Gemini and return a structured summary with retry support."""
+    """
+    Send extracted text to Gemini and return a structured summary with retry support.
+    Inputs above the chunking threshold are condensed chunk-by-chunk first (map)
+    and the combined notes are summarized into the final format (reduce).
+    Text that nearly duplicates an already summarized text reuses that summary.
+    """
+    gemini_model = _lazy("gemini_model")
     if not gemini_model:
         return APIKeyMissingError("GOOGLE_API_KEY").to_display()
-    
+
+    index = get_near_duplicate_index()
+    signature = index.signature(text) if index else None
+    scope = dedup_scope(source_type, gemini_model.model_name)
+    if signature is not None:
+        match = index.lookup(signature, scope)
+        if match is not None:
+            return match.summary
+
+    text = compress_for_prompt(text)
+    processing = get_config().processing
+    if processing.chunking_enabled:
+        text = fit_chunked_input(text)
+        try:
+            # Reduce repeatedly in case the notes themselves are still too long
+            while estimate_tokens(text) > processing.chunking_threshold_tokens:
+                condensed = condense_in_chunks(
+                    text,
+                    source_type,
+                    processing.chunk_size_tokens,
+                    processing.max_chunk_workers,
+                    processing.max_chunks,
+                )
+                if len(condensed) >= len(text):
+                    break
+                text = condensed
+        except Exception as e:
+            return SummarizationError(str(e)).to_display()
+
     # Use the smart prompt builder for content-specific prompts
     prompt = build_summarize_prompt(
         content=text,
@@ -141,62 +402,172 @@ def summarize_with_gemini(text: str, source_type: str = "content", extraction_me
     )
     
     try:
-        response = retry_with_backoff(
-            lambda: gemini_model.generate_content(prompt),
-            max_retries=2,
-            base_delay=1.0,
-        )
-        return response.text
+        summary = generate_final_summary(prompt)
     except Exception as e:
         return SummarizationError(str(e)).to_display()
 
+    if signature is not None and not is_error_response(summary):
+        index.add(signature, scope, summary)
+    return summary
+
 
 # ═════════════════════════════════════════════════════════
 #  TOOL 1 — Article Scraper (with retry)
 # ═════════════════════════════════════════════════════════
-def scrape_article(url: str) -> str:
+def scrape_markdown(firecrawl, url: str) -> str | None:
+    """One Firecrawl scrape to markdown (see clients.FirecrawlClient)."""
+    return firecrawl.scrape(url, formats=["markdown"]).markdown
+
+
+@traced("firecrawl", log=False)
+def fetch_with_firecrawl(url: str, max_retries: int = 2, cancelled: threading.Event | None = None) -> str | None:
+    """Scrape a URL to markdown with Firecrawl. Returns None when nothing was extracted."""
+    firecrawl = _lazy("firecrawl")
+
+    def attempt():
+        if cancelled is not None and cancelled.is_set():
+            raise RequestCancelledError("Firecrawl extraction")
+        return scrape_markdown(firecrawl, url)
+
+    return retry_with_backoff(attempt, max_retries=max_retries, base_delay=1.5, provider="firecrawl") or None
+
+
+@traced("trafilatura", log=False)
+def fetch_with_trafilatura(url: str, max_retries: int = 2, cancelled: threading.Event | None = None) -> str | None:
+    """Download a URL and extract its main text with Trafilatura."""
+    trafilatura = _lazy("trafilatura")
+
+    def attempt():
+        if cancelled is not None and cancelled.is_set():
+            raise RequestCancelledError("Trafilatura extraction")
+        return trafilatura.fetch_url(url)
+
+    downloaded = retry_with_backoff(attempt, max_retries=max_retries, base_delay=1.0, provider="trafilatura")
+    if downloaded:
+        return trafilatura.extract(downloaded)
+    return None
+
+
+@traced("extract")
+def extract_article_sequential(url: str) -> tuple[str | None, str]:
     """
-    Uses Firecrawl to scrape a web article URL. 
-    Falls back to Trafilatura if Firecrawl is unavailable or fails.
-    Includes retry logic for transient network failures.
+    Try Firecrawl first and fall back to Trafilatura.
+    Returns (content, extraction_method); raises ScrapingError if both fail.
     """
     content = None
-    method = "Firecrawl"
-
-    # Attempt 1: Firecrawl with retry
-    if firecrawl:
+    if _lazy("firecrawl"):
         try:
-            result = retry_with_backoff(
-                lambda: firecrawl.scrape_url(url, params={"formats": ["markdown"]}),
-                max_retries=2,
-                base_delay=1.5,
-            )
-            if result and result.get("markdown"):
-                content = result["markdown"]
+            content = fetch_with_firecrawl(url)
         except Exception:
             pass  # Fall through to Trafilatura
+    if content:
+        return content, "Firecrawl"
 
-    # Attempt 2: Trafilatura (Fallback) with retry
-    if not content:
-        method = "Trafilatura"
-        try:
-            downloaded = retry_with_backoff(
-                lambda: trafilatura.fetch_url(url),
-                max_retries=2,
-                base_delay=1.0,
+    try:
+        return fetch_with_trafilatura(url), "Trafilatura"
+    except Exception as e:
+        raise ScrapingError(url, f"Both Firecrawl and Trafilatura failed: {str(e)}")
+
+
+_extraction_pool: ThreadPoolExecutor | None = None
+
+
+def get_extraction_pool() -> ThreadPoolExecutor:
+    """Return the shared pool that runs hedged extractors."""
+    global _extraction_pool
+    if _extraction_pool is None:
+        _extraction_pool = ThreadPoolExecutor(
+            max_workers=EXTRACTION_POOL_WORKERS, thread_name_prefix="omega-extract"
+        )
+    return _extraction_pool
+
+
+@traced("extract")
+def extract_article_hedged(url: str, hedge_delay: float, min_chars: int) -> tuple[str | None, str]:
+    """
+    Race the extractors instead of chaining them.
+    Firecrawl (if configured) starts first; Trafilatura starts after `hedge_delay`
+    seconds, or immediately once Firecrawl fails. The first result with at least
+    `min_chars` characters wins and the loser is cancelled. If none passes the
+    threshold, the longest non-empty result is used. Each extractor keeps its
+    usual retries; a cancelled loser stops at its next attempt and leaves its
+    circuit breaker as it found it.
+    Returns (content, extraction_method); raises ScrapingError if every extractor fails.
+    """
+    queue = []
+    if _lazy("firecrawl"):
+        queue.append(("Firecrawl", fetch_with_firecrawl))
+    queue.append(("Trafilatura", fetch_with_trafilatura))
+
+    pool = get_extraction_pool()
+    cancelled = threading.Event()
+    names = {}
+    pending = set()
+    best_content, best_method = None, queue[-1][0]
+    last_error = None
+
+    def launch():
+        name, fetch = queue.pop(0)
+        future = pool.submit(copy_context().run, fetch, url, cancelled=cancelled)
+        names[future] = name
+        pending.add(future)
+
+    while pending or queue:
+        if queue and not pending:
+            launch()
+            continue
+
+        done, pending = wait(pending, timeout=hedge_delay if queue else None, return_when=FIRST_COMPLETED)
+        if not done:
+            launch()  # Hedge delay elapsed without a result
+            continue
+
+        for future in done:
+            try:
+                content = future.result()
+            except Exception as e:
+                last_error = e
+                continue
+            if content and len(content) >= min_chars:
+                cancelled.set()
+                for loser in pending:
+                    loser.cancel()
+                return content, names[future]
+            if content and len(content) > len(best_content or ""):
+                best_content, best_method = content, names[future]
+
+    if best_content or last_error is None:
+        return best_content, best_method
+    raise ScrapingError(url, f"Both Firecrawl and Trafilatura failed: {str(last_error)}")
+
+
+def scrape_article(url: str) -> str:
+    """
+    Uses Firecrawl to scrape a web article URL. 
+    Falls back to (or, in hedged mode, races) Trafilatura if Firecrawl is
+    unavailable, slow or fails.
+    Includes retry logic for transient network failures.
+    """
+    processing = get_config().processing
+    try:
+        if processing.extraction_mode == "hedged":
+            content, method = extract_article_hedged(
+                url, processing.hedge_delay_seconds, processing.min_content_chars
             )
-            if downloaded:
-                content = trafilatura.extract(downloaded)
-        except Exception as e:
-            return ScrapingError(url, f"Both Firecrawl and Trafilatura failed: {str(e)}").to_display()
+        else:
+            content, method = extract_article_sequential(url)
+    except ScrapingError as e:
+        return e.to_display()
 
+    content = clean_article(content) if content else content
     if not content:
         return ContentExtractionError(
             url, "The page might be protected or have no readable text."
         ).to_display()
 
-    # Truncate if extremely long
-    content = truncate_text(content, MAX_ARTICLE_LENGTH)
+    # Shorten if extremely long — unless long inputs are summarized in chunks
+    if not processing.chunking_enabled:
+        content = fit_article_length(content)
     
     summary = summarize_with_gemini(
         content,
@@ -209,15 +580,6 @@ def scrape_article(url: str) -> str:
 # ═════════════════════════════════════════════════════════
 #  TOOL 2 — YouTube Transcript Extractor
 # ═════════════════════════════════════════════════════════
-def extract_video_id(url: str) -> str | None:
-    """Extract the video ID from various YouTube URL formats."""
-    for pattern in YOUTUBE_VIDEO_ID_PATTERNS:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
-    return None
-
-
 def get_youtube_transcript(url: str) -> str:
     """
     Extracts transcript via youtube-transcript-api.
@@ -229,12 +591,16 @@ def get_youtube_transcript(url: str) -> str:
 
     # Attempt 1: Standard transcript API with retry
     try:
-        transcript_list = retry_with_backoff(
-            lambda: YouTubeTranscriptApi.get_transcript(video_id),
-            max_retries=2,
-            base_delay=1.0,
-        )
-        full_text = " ".join([entry["text"] for entry in transcript_list])
+        from youtube_transcript_api import YouTubeTranscriptApi
+
+        with span("transcript"):
+            transcript_list = retry_with_backoff(
+                lambda: YouTubeTranscriptApi.get_transcript(video_id),
+                max_retries=2,
+                base_delay=1.0,
+                provider="youtube",
+            )
+        full_text = join_captions([entry["text"] for entry in transcript_list])
         
         if full_text.strip():
             summary = summarize_with_gemini(full_text, source_type="YouTube video transcript")
@@ -244,19 +610,19 @@ def get_youtube_transcript(url: str) -> str:
 
     # Attempt 2: Gemini native URL analysis (multimodal)
     try:
+        gemini_model = _lazy("gemini_model")
         if not gemini_model:
             return APIKeyMissingError("GOOGLE_API_KEY").to_display()
             
-        prompt = (
-            f"Analyze this YouTube video: {url}\n\n"
-            "Provide a comprehensive summary of the video's content, key topics discussed, "
-            "main arguments, and any important data or conclusions presented."
-        )
-        response = retry_with_backoff(
-            lambda: gemini_model.generate_content(prompt),
-            max_retries=2,
-            base_delay=1.5,
-        )
+        prompt = YOUTUBE_ANALYSIS_PROMPT.format(url=url)
+        with span("gemini.video"):
+            response = retry_with_backoff(
+                lambda: gemini_model.generate_content(prompt),
+                max_retries=2,
+                base_delay=1.5,
+                provider="gemini",
+                quota=gemini_quota(gemini_model, prompt),
+            )
         raw_analysis = response.text
 
         summary = summarize_with_gemini(raw_analysis, source_type="YouTube video (AI-analyzed)")
@@ -272,33 +638,94 @@ def get_youtube_transcript(url: str) -> str:
 # ═════════════════════════════════════════════════════════
 #  TOOL 3 — Audio Transcriber (Groq Whisper) with validation
 # ═════════════════════════════════════════════════════════
-def transcribe_audio(file_path: str) -> str:
+AUDIO_ERROR_SUGGESTIONS = [
+    "Ensure the file is a valid MP3 or WAV.",
+    "Check that the file is under 25 MB.",
+    "Verify your GROQ_API_KEY is set correctly.",
+]
+
+
+def audio_size_limit_mb() -> int:
+    """Largest accepted recording: one Whisper request, or many with segmentation."""
+    processing = get_config().processing
+    if processing.audio_segmentation_enabled:
+        return processing.max_audio_input_size_mb
+    return MAX_AUDIO_FILE_SIZE_MB
+
+
+def load_audio_segments(file_path: "str | AudioHandle") -> list[AudioSegment]:
+    """
+    Split a recording into Whisper-sized segments if enabled.
+    In-memory handles are segmented as views of their buffer; files are read once.
+    """
+    handle = get_audio_handle(file_path)
+    if handle is not None:
+        data, filename = handle.getbuffer(), handle.filename
+    else:
+        with open(file_path, "rb") as audio_file:
+            data, filename = audio_file.read(), os.path.basename(file_path)
+
+    processing = get_config().processing
+    if not processing.audio_segmentation_enabled:
+        return [AudioSegment(0, 0.0, 0.0, data, filename)]
+    return split_audio(data, filename, processing.audio_segment_seconds)
+
+
+@traced("whisper.segment", log=False)
+def transcribe_segment(groq_client, segment: AudioSegment) -> str:
+    """Send one segment to Groq Whisper with retry."""
+    transcription = retry_with_backoff(
+        lambda: groq_client.audio.transcriptions.create(
+            file=(segment.filename, segment.open()),
+            model=WHISPER_MODEL,
+            response_format=WHISPER_RESPONSE_FORMAT,
+        ),
+        max_retries=2,
+        base_delay=1.5,
+        provider="groq",
+        quota=(WHISPER_MODEL, 0),
+    )
+    return str(transcription)
+
+
+@traced("whisper")
+def transcribe_segments(groq_client, segments: list[AudioSegment], max_workers: int) -> str:
+    """Transcribe segments concurrently and stitch the transcripts in order."""
+    if len(segments) == 1:
+        return transcribe_segment(groq_client, segments[0])
+
+    contexts = [copy_context() for _ in segments]
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(segments)))) as pool:
+        transcripts = list(pool.map(
+            lambda ctx, segment: ctx.run(transcribe_segment, groq_client, segment),
+            contexts,
+            segments,
+        ))
+    return stitch_transcripts(transcripts)
+
+
+def transcribe_audio(file_path: "str | AudioHandle") -> str:
     """
     Transcribes an uploaded audio file (MP3/WAV) via Groq's Whisper API,
     then sends the transcript to Gemini for summarization.
-    Validates the audio file before processing.
+    Validates the audio file before processing. Long recordings are split
+    into overlapping segments that are transcribed in parallel.
+    Accepts a file path, an AudioHandle or an `audio://` reference.
     """
+    groq_client = _lazy("groq_client")
     if not groq_client:
         return APIKeyMissingError("GROQ_API_KEY").to_display()
 
     # Validate audio file before sending to API
-    is_valid, error_msg = validate_audio_file(file_path)
+    is_valid, error_msg = validate_audio_file(file_path, audio_size_limit_mb())
     if not is_valid:
         return f"❌ {error_msg}"
 
     try:
-        with open(file_path, "rb") as audio_file:
-            transcription = retry_with_backoff(
-                lambda: groq_client.audio.transcriptions.create(
-                    file=(os.path.basename(file_path), audio_file.read()),
-                    model=WHISPER_MODEL,
-                    response_format=WHISPER_RESPONSE_FORMAT,
-                ),
-                max_retries=2,
-                base_delay=1.5,
-            )
-
-        transcript_text = str(transcription)
+        segments = load_audio_segments(file_path)
+        transcript_text = transcribe_segments(
+            groq_client, segments, get_config().processing.max_transcription_workers
+        )
         if not transcript_text.strip():
             return EmptyTranscriptionError().to_display()
 
@@ -307,11 +734,7 @@ def transcribe_audio(file_path: str) -> str:
     except Exception as e:
         return AudioProcessingError(
             reason=str(e),
-            suggestions=[
-                "Ensure the file is a valid MP3 or WAV.",
-                "Check that the file is under 25 MB.",
-                "Verify your GROQ_API_KEY is set correctly.",
-            ],
+            suggestions=AUDIO_ERROR_SUGGESTIONS,
         ).to_display()
 
 
@@ -354,9 +777,70 @@ TOOL_DISPATCH = {
 }
 
 
+def resolve_cache_entry(tool_name: str, arguments: dict):
+    """
+    Return (cache, key, source) for an identifiable tool call, or None.
+    `cache` is None when the summary cache is disabled but coalescing still
+    needs the key; None is returned when neither applies or the source is unknown.
+    """
+    cache = get_summary_cache()
+    if cache is None and not get_config().processing.coalescing_enabled:
+        return None
+    source = source_identity(tool_name, arguments)
+    if source is None:
+        return None
+    gemini_model = _lazy("gemini_model")
+    model_name = gemini_model.model_name if gemini_model else "unconfigured"
+    return cache, make_cache_key(source, model_name), source
+
+
+# One registry per process: concurrent calls for the same source share one pipeline run
+_single_flight = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    return _single_flight
+
+
+def coalesced(tool_name: str, source: str):
+    """on_join callback that notes in the execution log that this call is waiting on another."""
+    return lambda: add_log(tool_name, f"Joined an in-flight request for {source}", "working")
+
+
+def run_tool(tool_name: str, arguments: dict) -> str:
+    """Run a tool's pipeline inside the configured per-request deadline."""
+    with request_deadline(get_config().retry.request_deadline_seconds), span(tool_name) as current:
+        return current.check(TOOL_DISPATCH[tool_name](arguments))
+
+
 def execute_tool(tool_name: str, arguments: dict) -> str:
-    """Execute a tool by name with the given arguments."""
+    """
+    Execute a tool by name with the given arguments.
+    Successful summaries are served from (and stored in) the summary cache;
+    concurrent calls for the same source share a single run.
+    """
     if tool_name not in TOOL_DISPATCH:
         return f"❌ Unknown tool: {tool_name}"
-    return TOOL_DISPATCH[tool_name](arguments)
+
+    entry = resolve_cache_entry(tool_name, arguments)
+    if entry is None:
+        return run_tool(tool_name, arguments)
+
+    cache, key, source = entry
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    def run_and_store() -> str:
+        result = run_tool(tool_name, arguments)
+        if cache is not None and not is_error_response(result):
+            cache.put(key, result, source=source)
+        return result
+
+    if not get_config().processing.coalescing_enabled:
+        return run_and_store()
+    # Errors reach every waiter but are never stored, so the next call retries
+    result, _ = _single_flight.do(key, run_and_store, on_join=coalesced(tool_name, source))
+    return result
 
@@ -0,0 +1,376 @@
+"""
+tracing.py — Request tracing and stage metrics for the Omega-Summarizer.
+Answers "where did this request's time go?" without an external tracer.
+
+Features:
+- One correlation ID per request, carried in a ContextVar (so it follows
+  copy_context() into worker threads and asyncio tasks)
+- Monotonic, nanosecond-resolution spans around each pipeline stage
+- Per-request span list for the execution log's stage timings
+- Process-wide duration histograms in the Prometheus text format
+- Optional standalone /metrics endpoint for processes without one (Streamlit)
+"""
+
+import bisect
+import functools
+import inspect
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import get_config
+from constants import TRACE_HISTOGRAM_BUCKETS, TRACE_REQUEST_ID_MAX_LENGTH
+from utils import is_error_response
+
+
+# ═════════════════════════════════════════════════════════
+#  SPANS & TRACES
+# ═════════════════════════════════════════════════════════
+class Span:
+    """One timed stage. Durations come from time.perf_counter_ns()."""
+
+    __slots__ = ("name", "depth", "start_ns", "end_ns", "status", "attributes")
+
+    def __init__(self, name: str, depth: int = 0, attributes: dict | None = None):
+        self.name = name
+        self.depth = depth
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns: int | None = None
+        self.status = "ok"
+        self.attributes = attributes or {}
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.perf_counter_ns()
+        return (end - self.start_ns) / 1e6
+
+    def fail(self) -> None:
+        """Mark the stage as failed without raising."""
+        self.status = "error"
+
+    def check(self, result):
+        """Mark the stage as failed if `result` is an error response; returns it unchanged."""
+        if isinstance(result, str) and is_error_response(result):
+            self.fail()
+        return result
+
+
+class Trace:
+    """The spans of one request, collected from every thread it fans out to."""
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.start_ns = time.perf_counter_ns()
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def record(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def timings(self) -> list[dict]:
+        """
+        Aggregate finished spans by (depth, stage) in order of first start.
+        Each row has stage, depth, calls, offset_ms (first start relative to the
+        trace), total_ms, max_ms and errors.
+        """
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start_ns)
+
+        rows: dict[tuple[int, str], dict] = {}
+        for span in spans:
+            row = rows.setdefault((span.depth, span.name), {
+                "stage": span.name,
+                "depth": span.depth,
+                "calls": 0,
+                "offset_ms": round((span.start_ns - self.start_ns) / 1e6, 1),
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "errors": 0,
+            })
+            duration = span.duration_ms
+            row["calls"] += 1
+            row["total_ms"] = round(row["total_ms"] + duration, 1)
+            row["max_ms"] = round(max(row["max_ms"], duration), 1)
+            row["errors"] += span.status != "ok"
+        return list(rows.values())
+
+
+_trace: ContextVar = ContextVar("omega_trace", default=None)
+_current_span: ContextVar = ContextVar("omega_current_span", default=None)
+
+_REQUEST_ID_PATTERN = re.compile(r"[^A-Za-z0-9._:-]")
+
+
+def new_request_id() -> str:
+    """Return a fresh correlation ID."""
+    return uuid.uuid4().hex[:16]
+
+
+def sanitize_request_id(value: str | None) -> str | None:
+    """Accept a caller-supplied correlation ID (e.g. X-Request-ID) if it is safe to echo."""
+    value = _REQUEST_ID_PATTERN.sub("", (value or "").strip())[:TRACE_REQUEST_ID_MAX_LENGTH]
+    return value or None
+
+
+def current_trace() -> Trace | None:
+    return _trace.get()
+
+
+def current_request_id() -> str | None:
+    """Correlation ID of the request being processed in this context, if any."""
+    trace = _trace.get()
+    return trace.request_id if trace else None
+
+
+@contextmanager
+def start_trace(request_id: str | None = None):
+    """
+    Start a trace for one request and yield it.
+    If a trace is already active (the caller started one) it is reused, so
+    entry points can be nested without splitting a request in two.
+    """
+    active = _trace.get()
+    if active is not None:
+        yield active
+        return
+
+    trace = Trace(request_id or new_request_id())
+    token = _trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _trace.reset(token)
+
+
+def format_duration(ms: float) -> str:
+    return f"{ms:,.0f} ms" if ms < 10_000 else f"{ms / 1000:,.1f} s"
+
+
+@contextmanager
+def span(name: str, log: bool = True, **attributes):
+    """
+    Time a pipeline stage.
+    The duration is added to the stage histogram and, inside a trace, to the
+    request's spans. With `log`, the finished stage is also written to the
+    execution log — pass log=False for spans that run on worker threads
+    (they still reach the JSON log when it is enabled).
+    Exceptions mark the span as failed and propagate.
+    """
+    parent = _current_span.get()
+    current = Span(name, parent.depth + 1 if parent else 0, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException:
+        current.fail()
+        raise
+    finally:
+        current.end_ns = time.perf_counter_ns()
+        _current_span.reset(token)
+        _finish(current, log)
+
+
+def _finish(current: Span, log: bool) -> None:
+    if not get_config().telemetry.tracing_enabled:
+        return
+    get_metrics().observe(current.name, current.status, current.duration_ms / 1000)
+
+    trace = _trace.get()
+    if trace is None:
+        return
+    trace.record(current)
+
+    # Deferred: both modules import this one
+    from omega_summarizer.utils import add_log
+    from logger import json_logging_active, log_event
+
+    # Worker-thread spans skip the execution log but still reach the JSON log
+    if not log and not json_logging_active():
+        return
+    duration = current.duration_ms
+    entry = {
+        "tool": current.name,
+        "message": f"Finished in {format_duration(duration)}",
+        "status": "success" if current.status == "ok" else "error",
+        "duration_ms": round(duration, 1),
+    }
+    if log:
+        add_log(**entry)
+    else:
+        log_event({**entry, "request_id": trace.request_id})
+
+
+def traced(name: str, log: bool = True, root: bool = False):
+    """
+    Decorator form of span() for sync and async functions.
+    String results that are error responses mark the span as failed.
+    With `root`, the call also starts a trace if none is active.
+    """
+    def decorate(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with (start_trace() if root else _no_trace()), span(name, log=log) as current:
+                    return current.check(await func(*args, **kwargs))
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with (start_trace() if root else _no_trace()), span(name, log=log) as current:
+                return current.check(func(*args, **kwargs))
+        return wrapper
+
+    return decorate
+
+
+@contextmanager
+def _no_trace():
+    yield None
+
+
+# ═════════════════════════════════════════════════════════
+#  METRICS — Stage duration histograms
+# ═════════════════════════════════════════════════════════
+class Histogram:
+    """
+    Histogram in seconds. Observations land in one bucket (bisect);
+    cumulative counts, as Prometheus expects, are computed when read.
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot: above the largest bound
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """(upper bound, observations <= bound) for every finite bucket."""
+        total, result = 0, []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+class StageMetrics:
+    """Thread-safe registry of stage duration histograms keyed by (stage, status)."""
+
+    METRIC = "omega_stage_duration_seconds"
+
+    def __init__(self, buckets: tuple[float, ...] = TRACE_HISTOGRAM_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._histograms: dict[tuple[str, str], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, status: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get((stage, status))
+            if histogram is None:
+                histogram = self._histograms[(stage, status)] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def snapshot(self) -> dict[tuple[str, str], dict]:
+        """Return {(stage, status): {"count", "sum", "buckets": [(le, cumulative)]}}."""
+        with self._lock:
+            return {
+                key: {
+                    "count": h.count,
+                    "sum": h.sum,
+                    "buckets": h.cumulative(),
+                }
+                for key, h in self._histograms.items()
+            }
+
+    def render(self) -> str:
+        """Render every histogram in the Prometheus text exposition format (0.0.4)."""
+        lines = [
+            f"# HELP {self.METRIC} Duration of traced pipeline stages.",
+            f"# TYPE {self.METRIC} histogram",
+        ]
+        for (stage, status), data in sorted(self.snapshot().items()):
+            labels = f'stage="{_escape_label(stage)}",status="{_escape_label(status)}"'
+            for bound, cumulative in data["buckets"]:
+                lines.append(f'{self.METRIC}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+            lines.append(f'{self.METRIC}_bucket{{{labels},le="+Inf"}} {data["count"]}')
+            lines.append(f"{self.METRIC}_sum{{{labels}}} {data['sum']:.6f}")
+            lines.append(f"{self.METRIC}_count{{{labels}}} {data['count']}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_metrics = StageMetrics()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def get_metrics() -> StageMetrics:
+    return _metrics
+
+
+def render_prometheus() -> str:
+    return _metrics.render()
+
+
+# ═════════════════════════════════════════════════════════
+#  STANDALONE METRICS ENDPOINT
+# ═════════════════════════════════════════════════════════
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Serves GET /metrics only."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        if self.path.split("?", 1)[0] != "/metrics":
+            body, status, content_type = b"Not found\n", 404, "text/plain"
+        else:
+            body, status, content_type = render_prometheus().encode("utf-8"), 200, PROMETHEUS_CONTENT_TYPE
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass  # Scrapes every few seconds would flood stderr
+
+
+_metrics_server: ThreadingHTTPServer | None = None
+_metrics_server_lock = threading.Lock()
+
+
+def serve_metrics(host: str, port: int) -> ThreadingHTTPServer | None:
+    """
+    Start the /metrics endpoint on a daemon thread, once per process.
+    Returns the server, or None if the port is unavailable (e.g. another
+    replica on the same host already serves it).
+    """
+    global _metrics_server
+    with _metrics_server_lock:
+        if _metrics_server is None:
+            try:
+                server = ThreadingHTTPServer((host, port), MetricsHandler)
+            except OSError:
+                return None
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name="omega-metrics", daemon=True).start()
+            _metrics_server = server
+        return _metrics_server
@@ -7,18 +7,19 @@ used across the application.
 import re
 import os
 from urllib.parse import urlparse
+from audio import AudioHandle, get_audio_handle
 from constants import (
     SUPPORTED_AUDIO_FORMATS,
     MAX_AUDIO_FILE_SIZE_MB,
     MAX_ARTICLE_LENGTH,
-    YOUTUBE_VIDEO_ID_PATTERNS,
+    CHARS_PER_TOKEN,
     URL_DISPLAY_MAX_LENGTH,
     SIDEBAR_TITLE_MAX_LENGTH,
 )
 
 
 # ═════════════════════════════════════════════════════════
-#  URL VALIDATION & CLASSIFICATION
+#  URL VALIDATION
 # ═════════════════════════════════════════════════════════
 def is_valid_url(url: str) -> bool:
     """Check if a string is a valid URL with proper scheme and netloc."""
@@ -29,31 +30,6 @@ def is_valid_url(url: str) -> bool:
         return False
 
 
-def is_youtube_url(url: str) -> bool:
-    """Determine if a URL points to a YouTube video."""
-    youtube_domains = [
-        "youtube.com",
-        "www.youtube.com",
-        "m.youtube.com",
-        "youtu.be",
-        "www.youtu.be",
-    ]
-    try:
-        parsed = urlparse(url.strip())
-        return any(parsed.netloc.lower() == domain for domain in youtube_domains)
-    except Exception:
-        return False
-
-
-def extract_video_id(url: str) -> str | None:
-    """Extract a YouTube video ID from various URL formats."""
-    for pattern in YOUTUBE_VIDEO_ID_PATTERNS:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
-    return None
-
-
 # ═════════════════════════════════════════════════════════
 #  TEXT PROCESSING
 # ═════════════════════════════════════════════════════════
@@ -64,6 +40,59 @@ def truncate_text(text: str, max_length: int, suffix: str = "\n\n[... content tr
     return text[:max_length] + suffix
 
 
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheaply estimate how many LLM tokens a text will use."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _split_oversized(piece: str, max_chars: int) -> list[str]:
+    """Split a piece longer than max_chars on sentence, then word, boundaries."""
+    parts = []
+    for sentence in SENTENCE_BREAK.split(piece):
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars)
+            if cut <= 0:
+                cut = max_chars
+            parts.append(sentence[:cut])
+            sentence = sentence[cut:].lstrip()
+        if sentence:
+            parts.append(sentence)
+    return parts
+
+
+def split_into_chunks(text: str, max_tokens: int) -> list[str]:
+    """
+    Split text into chunks of at most ~max_tokens each.
+    Cuts on paragraph boundaries, falling back to sentence and then word
+    boundaries for paragraphs that do not fit in a single chunk.
+    """
+    max_chars = max(1, max_tokens * CHARS_PER_TOKEN)
+    chunks = []
+    current: list[str] = []
+    current_len = 0
+
+    for paragraph in PARAGRAPH_BREAK.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        pieces = [paragraph] if len(paragraph) <= max_chars else _split_oversized(paragraph, max_chars)
+        separator = "\n\n" if len(pieces) == 1 else " "
+        for piece in pieces:
+            if current and current_len + len(piece) + 2 > max_chars:
+                chunks.append("".join(current).strip())
+                current, current_len = [], 0
+            current.append(piece + separator)
+            current_len += len(piece) + len(separator)
+
+    if current:
+        chunks.append("".join(current).strip())
+    return chunks
+
+
 def truncate_display_title(title: str, max_length: int = SIDEBAR_TITLE_MAX_LENGTH) -> str:
     """Truncate a title for sidebar display with ellipsis."""
     if len(title) <= max_length:
@@ -83,27 +112,30 @@ def extract_domain_from_url(url: str, max_length: int = URL_DISPLAY_MAX_LENGTH)
 # ═════════════════════════════════════════════════════════
 #  FILE VALIDATION
 # ═════════════════════════════════════════════════════════
-def validate_audio_file(file_path: str) -> tuple[bool, str]:
+def validate_audio_file(file_path: "str | AudioHandle", max_size_mb: int = MAX_AUDIO_FILE_SIZE_MB) -> tuple[bool, str]:
     """
-    Validate an audio file before processing.
+    Validate an audio file (path, AudioHandle or `audio://` reference) before processing.
     Returns (is_valid, error_message).
     """
-    if not os.path.exists(file_path):
+    handle = get_audio_handle(file_path)
+    if handle is None and not os.path.exists(file_path):
         return False, "File does not exist."
+    name = handle.filename if handle else file_path
+    size = handle.size if handle else os.path.getsize(file_path)
 
     # Check file extension
-    _, ext = os.path.splitext(file_path)
+    _, ext = os.path.splitext(name)
     ext = ext.lstrip(".").lower()
     if ext not in SUPPORTED_AUDIO_FORMATS:
         return False, f"Unsupported format: .{ext}. Supported: {', '.join(SUPPORTED_AUDIO_FORMATS)}"
 
     # Check file size
-    file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
-    if file_size_mb > MAX_AUDIO_FILE_SIZE_MB:
-        return False, f"File too large ({file_size_mb:.1f} MB). Maximum: {MAX_AUDIO_FILE_SIZE_MB} MB."
+    file_size_mb = size / (1024 * 1024)
+    if file_size_mb > max_size_mb:
+        return False, f"File too large ({file_size_mb:.1f} MB). Maximum: {max_size_mb} MB."
 
     # Check file is not empty
-    if os.path.getsize(file_path) == 0:
+    if size == 0:
         return False, "File is empty (0 bytes)."
 
     return True, ""
@@ -117,6 +149,17 @@ def is_error_response(text: str) -> bool:
     return text.startswith("❌") or text.startswith("⚠️")
 
 
+def percentile(values: list[float], pct: float) -> float:
+    """Return the pct-th percentile (0-100) of values using linear interpolation."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
 def format_file_size(size_bytes: int) -> str:
     """Format byte size into human-readable string."""
     if size_bytes < 1024: